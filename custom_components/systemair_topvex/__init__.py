@@ -3,27 +3,69 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
+import time
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.start import async_at_started
 import voluptuous as vol
 
+from .alarms import AlarmHistory
 from .const import (
+    ALARM_HISTORY_SIZE,
     BOOST_DEFAULT_MINUTES,
+    CONF_BAUDRATE,
+    CONF_DIGITAL_IO,
+    CONF_METRICS,
+    CONF_PARITY,
+    CONF_PROXY_BIND,
+    CONF_PROXY_PORT,
+    CONF_PROXY_WRITES,
+    CONF_RECORD_FRAMES,
+    CONF_TRANSPORT,
+    CONF_WATCH_INTERVAL,
+    DEFAULT_BAUDRATE,
+    DEFAULT_PARITY,
     DEFAULT_PORT,
+    DEFAULT_PROXY_BIND,
+    DEFAULT_PROXY_PORT,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_UNIT_ID,
+    DEFAULT_WATCH_INTERVAL,
+    DEFERRED_PLATFORMS,
     DOMAIN,
     PLATFORMS,
+    TRANSPORT_PYMODBUS,
 )
 from .coordinator import TopvexCoordinator
+from .framelog import FrameLogWriter
+from .metrics import TopvexMetricsView
 from .modbus_client import TopvexModbusClient
+from .profiles import ProfileManager
+from .proxy import ModbusProxyServer
+from .schedule import WEEKDAYS, ScheduleEngine
+from .setpoints import SETPOINTS, encode_setpoints, read_back
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
 SERVICE_KITCHEN_BOOST = "kitchen_boost"
 SERVICE_CANCEL_BOOST = "cancel_kitchen_boost"
+SERVICE_SET_SETPOINTS = "set_setpoints"
+SERVICE_SAVE_PROFILE = "save_profile"
+SERVICE_APPLY_PROFILE = "apply_profile"
+SERVICE_DELETE_PROFILE = "delete_profile"
+SERVICE_CANCEL_PROFILE = "cancel_profile"
+SERVICE_SET_SCHEDULE = "set_schedule"
+SERVICE_GET_ALARM_HISTORY = "get_alarm_history"
 
 KITCHEN_BOOST_SCHEMA = vol.Schema({
     vol.Optional("minutes", default=BOOST_DEFAULT_MINUTES): vol.All(
@@ -31,6 +73,64 @@ KITCHEN_BOOST_SCHEMA = vol.Schema({
     ),
 })
 
+SETPOINT_FIELDS = {
+    vol.Optional(name): (
+        vol.In(list(setpoint.options)) if setpoint.options else vol.Coerce(float)
+    )
+    for name, setpoint in SETPOINTS.items()
+}
+
+SET_SETPOINTS_SCHEMA = vol.Schema({
+    vol.Optional("entry_id"): cv.string,
+    vol.Optional("force", default=False): cv.boolean,
+    **SETPOINT_FIELDS,
+})
+
+PROFILE_NAME_SCHEMA = vol.Schema({
+    vol.Optional("entry_id"): cv.string,
+    vol.Required("name"): cv.string,
+})
+
+SAVE_PROFILE_SCHEMA = PROFILE_NAME_SCHEMA.extend({
+    vol.Optional("snapshot"): vol.All(cv.ensure_list, [vol.In(list(SETPOINTS))]),
+    **SETPOINT_FIELDS,
+})
+
+APPLY_PROFILE_SCHEMA = PROFILE_NAME_SCHEMA.extend({
+    vol.Optional("minutes"): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+    vol.Optional("force", default=False): cv.boolean,
+})
+
+SCHEDULE_ENTRY_SCHEMA = vol.Schema({
+    vol.Required("days"): vol.All(cv.ensure_list, [vol.In(WEEKDAYS)]),
+    vol.Required("time"): cv.time,
+    vol.Optional("profile"): cv.string,
+    **SETPOINT_FIELDS,
+})
+
+SET_SCHEDULE_SCHEMA = vol.Schema({
+    vol.Optional("entry_id"): cv.string,
+    vol.Required("entries"): vol.All(cv.ensure_list, [SCHEDULE_ENTRY_SCHEMA]),
+    vol.Optional("enabled", default=True): cv.boolean,
+})
+
+GET_ALARM_HISTORY_SCHEMA = vol.Schema({
+    vol.Optional("entry_id"): cv.string,
+    vol.Optional("alarm_id"): vol.All(vol.Coerce(int), vol.Range(min=0, max=159)),
+    vol.Optional("limit"): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=ALARM_HISTORY_SIZE)
+    ),
+})
+
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Set up the integration-wide websocket API."""
+    async_register_websocket_commands(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Systemair Topvex from a config entry."""
@@ -39,41 +139,216 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     unit_id = entry.data.get("unit_id", DEFAULT_UNIT_ID)
 
-    client = TopvexModbusClient(host, port, unit_id)
+    # Transport and line settings are chosen at setup and can be changed
+    # in the options
+    settings = {**entry.data, **entry.options}
+    client = TopvexModbusClient(
+        host,
+        port,
+        unit_id,
+        settings.get(CONF_TRANSPORT, TRANSPORT_PYMODBUS),
+        settings.get(CONF_BAUDRATE, DEFAULT_BAUDRATE),
+        settings.get(CONF_PARITY, DEFAULT_PARITY),
+    )
+    if entry.options.get(CONF_RECORD_FRAMES, False):
+        client.recorder = FrameLogWriter(
+            hass.config.path(f"{DOMAIN}_{entry.entry_id}.frames")
+        )
     coordinator = TopvexCoordinator(hass, client, scan_interval)
+    coordinator.entry_id = entry.entry_id
+    coordinator.digital_io = entry.options.get(CONF_DIGITAL_IO, False)
+    timings = coordinator.setup_timings
+    setup_start = time.monotonic()
+
+    # Loaded before the first poll so it compares against the statuses
+    # stored before the restart
+    coordinator.alarm_history = AlarmHistory(hass, entry.entry_id)
+    await coordinator.alarm_history.async_load()
 
     await coordinator.async_config_entry_first_refresh()
+    timings["first_refresh_ms"] = _elapsed_ms(setup_start)
+
+    # Loaded after the first poll: a timed profile that ran out during the
+    # restart restores at once, and its writes compare against live values
+    coordinator.profiles = ProfileManager(hass, coordinator, entry.entry_id)
+    await coordinator.profiles.async_load()
+    entry.async_on_unload(coordinator.profiles.async_unload)
+
+    coordinator.schedule = ScheduleEngine(hass, coordinator, entry.entry_id)
+    await coordinator.schedule.async_load()
+    entry.async_on_unload(coordinator.schedule.async_unload)
+
+    proxy_port = entry.options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT)
+    if proxy_port:
+        proxy = ModbusProxyServer(
+            coordinator,
+            proxy_port,
+            entry.options.get(CONF_PROXY_BIND, DEFAULT_PROXY_BIND),
+            entry.options.get(CONF_PROXY_WRITES, False),
+        )
+        if await proxy.async_start():
+            coordinator.proxy = proxy
+            entry.async_on_unload(proxy.close)
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Views cannot be removed, so the view is registered once and only
+    # serves entries that have the option set
+    if entry.options.get(CONF_METRICS, False) and not hass.data.get(
+        f"{DOMAIN}_metrics_view"
+    ):
+        hass.http.register_view(TopvexMetricsView(hass))
+        hass.data[f"{DOMAIN}_metrics_view"] = True
 
-    # Register Lovelace card as static resource
-    card_path = Path(__file__).parent / "systemair-topvex-card.js"
-    card_url = f"/{DOMAIN}/systemair-topvex-card.js"
-    try:
-        from homeassistant.components.http import StaticPathConfig
-        await hass.http.async_register_static_paths([
-            StaticPathConfig(card_url, str(card_path), False)
-        ])
-    except Exception:
-        _LOGGER.debug("Could not register static path %s", card_url)
+    # Critical phase: entities needed to see and control the unit
+    critical = [p for p in PLATFORMS if p not in DEFERRED_PLATFORMS]
+    start = time.monotonic()
+    await hass.config_entries.async_forward_entry_setups(entry, critical)
+    coordinator.loaded_platforms.extend(critical)
+    timings["critical_platforms_ms"] = _elapsed_ms(start)
 
-    # Auto-add as Lovelace resource
-    await _async_register_card_resource(hass, card_url)
+    # Fast mode/alarm watch between full polls
+    coordinator.async_start_watch(
+        entry.options.get(CONF_WATCH_INTERVAL, DEFAULT_WATCH_INTERVAL)
+    )
+    entry.async_on_unload(coordinator.async_stop_watch)
+    entry.async_on_unload(coordinator.async_cancel_block_retry)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    # Deferred phase: alarm sensors, buttons and the Lovelace card
+    async def _async_deferred_setup(_hass: HomeAssistant) -> None:
+        deferred_start = time.monotonic()
+        await hass.config_entries.async_forward_entry_setups(
+            entry, DEFERRED_PLATFORMS
+        )
+        coordinator.loaded_platforms.extend(DEFERRED_PLATFORMS)
+        timings["deferred_platforms_ms"] = _elapsed_ms(deferred_start)
+
+        start = time.monotonic()
+        await _async_register_card(hass)
+        timings["card_ms"] = _elapsed_ms(start)
+        timings["deferred_total_ms"] = _elapsed_ms(deferred_start)
+
+    if hass.is_running:
+        # Reloads and entries added later: finish here, so an unload right
+        # after always finds the platforms it unloads
+        await _async_deferred_setup(hass)
+    else:
+        entry.async_on_unload(async_at_started(hass, _async_deferred_setup))
 
     # Register services
+    def _targets(call: ServiceCall) -> dict[str, TopvexCoordinator]:
+        return {
+            entry_id: coord
+            for entry_id, coord in hass.data[DOMAIN].items()
+            if isinstance(coord, TopvexCoordinator)
+            and call.data.get("entry_id", entry_id) == entry_id
+        }
+
     async def handle_kitchen_boost(call: ServiceCall) -> None:
         minutes = call.data.get("minutes", BOOST_DEFAULT_MINUTES)
-        for coord in hass.data[DOMAIN].values():
-            if isinstance(coord, TopvexCoordinator):
-                await coord.async_start_kitchen_boost(minutes)
+        for coord in _targets(call).values():
+            await coord.async_start_kitchen_boost(minutes)
 
     async def handle_cancel_boost(call: ServiceCall) -> None:
-        for coord in hass.data[DOMAIN].values():
-            if isinstance(coord, TopvexCoordinator):
-                await coord.async_cancel_kitchen_boost()
+        for coord in _targets(call).values():
+            await coord.async_cancel_kitchen_boost()
+
+    async def handle_set_setpoints(call: ServiceCall) -> ServiceResponse:
+        values = {k: v for k, v in call.data.items() if k in SETPOINTS}
+        if not values:
+            raise ServiceValidationError("No setpoints given")
+        targets = _targets(call)
+        # Validate against every target before writing to any
+        writes = {}
+        for entry_id, coord in targets.items():
+            writes[entry_id], errors = encode_setpoints(values, coord.data)
+            if errors:
+                raise ServiceValidationError("; ".join(errors))
+        response = {}
+        for entry_id, coord in targets.items():
+            transactions = await coord.async_write_verified(
+                writes[entry_id], call.data["force"]
+            )
+            response[entry_id] = {
+                "ok": transactions >= 0,
+                "transactions": max(transactions, 0),
+                "values": read_back(values, coord.data),
+            }
+        return response
+
+    async def handle_save_profile(call: ServiceCall) -> None:
+        values = {k: v for k, v in call.data.items() if k in SETPOINTS}
+        snapshot = call.data.get("snapshot", [])
+        if not values and not snapshot:
+            raise ServiceValidationError("Give setpoint values or a snapshot list")
+        for coord in _targets(call).values():
+            registers, errors = encode_setpoints(values, coord.data)
+            if errors:
+                raise ServiceValidationError("; ".join(errors))
+            if snapshot:
+                current = await coord.profiles.async_snapshot(
+                    [SETPOINTS[name].address for name in snapshot]
+                )
+                if current is None:
+                    raise HomeAssistantError("Could not read the current settings")
+                registers = {**current, **registers}
+            coord.profiles.async_save_profile(call.data["name"], registers)
+
+    async def handle_apply_profile(call: ServiceCall) -> None:
+        name = call.data["name"]
+        for coord in _targets(call).values():
+            if name not in coord.profiles.profiles:
+                raise ServiceValidationError(f"Unknown profile {name}")
+            result = await coord.profiles.async_apply(
+                name, call.data.get("minutes"), call.data["force"]
+            )
+            if result < 0:
+                raise HomeAssistantError(f"Could not apply profile {name}")
+
+    async def handle_delete_profile(call: ServiceCall) -> None:
+        for coord in _targets(call).values():
+            coord.profiles.async_delete_profile(call.data["name"])
+
+    async def handle_cancel_profile(call: ServiceCall) -> None:
+        for coord in _targets(call).values():
+            await coord.profiles.async_cancel()
+
+    async def handle_set_schedule(call: ServiceCall) -> None:
+        entries = []
+        for item in call.data["entries"]:
+            values = {k: v for k, v in item.items() if k in SETPOINTS}
+            if ("profile" in item) == bool(values):
+                raise ServiceValidationError(
+                    "Each schedule entry needs either a profile or setpoints"
+                )
+            entry_data = {
+                "days": sorted({WEEKDAYS.index(day) for day in item["days"]}),
+                "time": item["time"].strftime("%H:%M"),
+            }
+            if values:
+                entry_data["values"] = values
+            else:
+                entry_data["profile"] = item["profile"]
+            entries.append(entry_data)
+        for coord in _targets(call).values():
+            for item in entries:
+                if "values" in item:
+                    errors = encode_setpoints(item["values"], coord.data)[1]
+                    if errors:
+                        raise ServiceValidationError("; ".join(errors))
+            coord.schedule.async_set_schedule(entries, call.data["enabled"])
+
+    async def handle_get_alarm_history(call: ServiceCall) -> ServiceResponse:
+        return {
+            entry_id: {
+                "transitions": coord.alarm_history.as_list(
+                    call.data.get("alarm_id"), call.data.get("limit")
+                ),
+            }
+            for entry_id, coord in _targets(call).items()
+        }
 
     hass.services.async_register(
         DOMAIN, SERVICE_KITCHEN_BOOST, handle_kitchen_boost,
@@ -82,25 +357,95 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.services.async_register(
         DOMAIN, SERVICE_CANCEL_BOOST, handle_cancel_boost,
     )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_SETPOINTS, handle_set_setpoints,
+        schema=SET_SETPOINTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SAVE_PROFILE, handle_save_profile,
+        schema=SAVE_PROFILE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_APPLY_PROFILE, handle_apply_profile,
+        schema=APPLY_PROFILE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_DELETE_PROFILE, handle_delete_profile,
+        schema=PROFILE_NAME_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_CANCEL_PROFILE, handle_cancel_profile,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_SCHEDULE, handle_set_schedule,
+        schema=SET_SCHEDULE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_GET_ALARM_HISTORY, handle_get_alarm_history,
+        schema=GET_ALARM_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
+    timings["critical_total_ms"] = _elapsed_ms(setup_start)
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    coordinator: TopvexCoordinator = hass.data[DOMAIN][entry.entry_id]
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, coordinator.loaded_platforms
+    )
     if unload_ok:
-        coordinator: TopvexCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN].pop(entry.entry_id)
+        # Ends websocket subscriptions, which check hass.data on each update
+        coordinator.async_update_listeners()
         await coordinator.client.disconnect()
+        if coordinator.client.recorder is not None:
+            await hass.async_add_executor_job(coordinator.client.recorder.close)
 
     # Remove services if no entries remain
     if not hass.data[DOMAIN]:
         hass.services.async_remove(DOMAIN, SERVICE_KITCHEN_BOOST)
         hass.services.async_remove(DOMAIN, SERVICE_CANCEL_BOOST)
+        hass.services.async_remove(DOMAIN, SERVICE_SET_SETPOINTS)
+        hass.services.async_remove(DOMAIN, SERVICE_SAVE_PROFILE)
+        hass.services.async_remove(DOMAIN, SERVICE_APPLY_PROFILE)
+        hass.services.async_remove(DOMAIN, SERVICE_DELETE_PROFILE)
+        hass.services.async_remove(DOMAIN, SERVICE_CANCEL_PROFILE)
+        hass.services.async_remove(DOMAIN, SERVICE_SET_SCHEDULE)
+        hass.services.async_remove(DOMAIN, SERVICE_GET_ALARM_HISTORY)
 
     return unload_ok
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _elapsed_ms(start: float) -> float:
+    """Return milliseconds since a time.monotonic() start."""
+    return round((time.monotonic() - start) * 1000, 1)
+
+
+async def _async_register_card(hass: HomeAssistant) -> None:
+    """Serve the Lovelace card and add it as a frontend resource."""
+    card_path = Path(__file__).parent / "systemair-topvex-card.js"
+    card_url = f"/{DOMAIN}/systemair-topvex-card.js"
+    try:
+        from homeassistant.components.http import StaticPathConfig
+        await hass.http.async_register_static_paths([
+            StaticPathConfig(card_url, str(card_path), False)
+        ])
+    except Exception:
+        _LOGGER.debug("Could not register static path %s", card_url)
+
+    # Auto-add as Lovelace resource
+    await _async_register_card_resource(hass, card_url)
+
+
 async def _async_register_card_resource(hass: HomeAssistant, url: str) -> None:
     """Register the Lovelace card as a frontend resource."""
     try:
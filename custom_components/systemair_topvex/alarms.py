@@ -0,0 +1,106 @@
+"""Alarm transition history for Systemair Topvex.
+
+Every change of an alarm's status register (IR 0-159) seen in a poll is
+appended to a bounded ring buffer, persisted with the last known statuses so
+transitions that happened while Home Assistant was down are recorded on the
+first poll after a restart.
+"""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timezone
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import ALARM_HISTORY_SIZE, ALARM_NAMES, ALARM_STATUSES, DOMAIN
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+
+def _status_name(status: int) -> str:
+    return ALARM_STATUSES.get(status, f"Ukjent ({status})")
+
+
+class AlarmHistory:
+    """Ring buffer of alarm status transitions for one Topvex."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.alarm_history"
+        )
+        # (time.time(), alarm id, old status, new status), oldest first
+        self.entries: deque[tuple[float, int, int, int]] = deque(
+            maxlen=ALARM_HISTORY_SIZE
+        )
+        # Last seen status per alarm id; empty until the first poll
+        self._statuses: dict[int, int] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored history and last known statuses."""
+        stored = await self._store.async_load() or {}
+        self.entries.extend(tuple(entry) for entry in stored.get("entries", []))
+        self._statuses = {
+            int(alarm_id): status
+            for alarm_id, status in stored.get("statuses", {}).items()
+        }
+
+    @callback
+    def _async_save(self) -> None:
+        self._store.async_delay_save(
+            lambda: {
+                "entries": [list(entry) for entry in self.entries],
+                "statuses": {
+                    str(alarm_id): status
+                    for alarm_id, status in self._statuses.items()
+                },
+            },
+            SAVE_DELAY,
+        )
+
+    @callback
+    def record(self, registers: list[int | None]) -> int:
+        """Compare a fresh alarm block read with the last one.
+
+        Appends a transition for every alarm whose status changed and returns
+        how many were recorded. The first read ever only sets the baseline.
+        """
+        now = time.time()
+        baseline = not self._statuses
+        recorded = 0
+        for alarm_id, status in enumerate(registers):
+            if status is None:
+                continue
+            old = self._statuses.get(alarm_id)
+            if old == status:
+                continue
+            self._statuses[alarm_id] = status
+            if not baseline and old is not None:
+                self.entries.append((now, alarm_id, old, status))
+                recorded += 1
+        if recorded or baseline:
+            self._async_save()
+        return recorded
+
+    def as_list(
+        self, alarm_id: int | None = None, limit: int | None = None
+    ) -> list[dict]:
+        """Return transitions, newest first, with alarm and status names."""
+        result = []
+        for timestamp, alarm, old, new in reversed(self.entries):
+            if alarm_id is not None and alarm != alarm_id:
+                continue
+            result.append({
+                "time": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+                "id": alarm,
+                "name": ALARM_NAMES.get(alarm, f"Alarm {alarm}"),
+                "old": old,
+                "old_name": _status_name(old),
+                "new": new,
+                "new_name": _status_name(new),
+            })
+            if limit is not None and len(result) >= limit:
+                break
+        return result
@@ -1,4 +1,4 @@
-"""Binary sensor entities for Systemair Topvex alarms."""
+"""Binary sensor entities for Systemair Topvex alarms and digital I/O."""
 from __future__ import annotations
 
 from homeassistant.components.binary_sensor import (
@@ -9,7 +9,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import ALARM_NAMES, ALARM_STATUSES, DOMAIN
+from .blocks import BIT_BLOCKS, BitBlock
+from .const import ALARM_NAMES, ALARM_STATUSES, COMMAND_COILS, DOMAIN
 from .coordinator import TopvexCoordinator
 from .entity import TopvexEntity
 
@@ -17,7 +18,7 @@ from .entity import TopvexEntity
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
-    """Set up Topvex alarm binary sensors."""
+    """Set up Topvex alarm and digital I/O binary sensors."""
     coordinator: TopvexCoordinator = hass.data[DOMAIN][entry.entry_id]
 
     # Create sensors for known alarms that are likely to appear
@@ -26,6 +27,14 @@ async def async_setup_entry(
     for alarm_id in known_alarm_ids:
         entities.append(TopvexAlarmSensor(coordinator, alarm_id))
 
+    # One sensor per coil and discrete input, all disabled until enabled
+    if coordinator.digital_io:
+        for block in BIT_BLOCKS:
+            for address in range(block.start, block.start + block.count):
+                if block.table == "coil" and address in COMMAND_COILS:
+                    continue
+                entities.append(TopvexBitSensor(coordinator, block, address))
+
     async_add_entities(entities)
 
 
@@ -33,6 +42,7 @@ class TopvexAlarmSensor(TopvexEntity, BinarySensorEntity):
     """Binary sensor for a Topvex alarm."""
 
     _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _data_fields = ("alarms",)
 
     def __init__(self, coordinator: TopvexCoordinator, alarm_id: int) -> None:
         name = ALARM_NAMES.get(alarm_id, f"Alarm {alarm_id}")
@@ -59,8 +69,9 @@ class TopvexAlarmSensor(TopvexEntity, BinarySensorEntity):
                 return {
                     "status_code": alarm.status,
                     "status_name": alarm.status_name,
+                    **self._stale_attributes(),
                 }
-        return {"status_code": 1, "status_name": "OK"}
+        return {"status_code": 1, "status_name": "OK", **self._stale_attributes()}
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -68,3 +79,27 @@ class TopvexAlarmSensor(TopvexEntity, BinarySensorEntity):
         return self._alarm_id in (
             52, 53, 54, 55, 56, 57, 58, 59, 60, 61, 62, 63, 64, 78, 86,
         )
+
+
+class TopvexBitSensor(TopvexEntity, BinarySensorEntity):
+    """Binary sensor for one coil or discrete input."""
+
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self, coordinator: TopvexCoordinator, block: BitBlock, address: int
+    ) -> None:
+        prefix = "Coil" if block.table == "coil" else "Digital input"
+        super().__init__(coordinator, f"{block.table}_{address}", f"{prefix} {address}")
+        self._data_fields = (block.key,)
+        self._block = block
+        self._address = address
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return the state of the coil or input."""
+        data = self.coordinator.data
+        bits = None if data is None else getattr(data, self._block.key)
+        if bits is None:
+            return None
+        return self._block.bit(bits, self._address)
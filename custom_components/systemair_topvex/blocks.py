@@ -0,0 +1,378 @@
+"""Register blocks and decoding for Systemair Topvex.
+
+Each poll reads the blocks below, one request plan per block. This module
+has no Home Assistant dependency so the decoding can be reused outside it.
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+from .const import (
+    AHU_MODES,
+    ALARM_NAMES,
+    ALARM_STATUSES,
+    DIGITAL_IO_COUNT,
+    FAN_MODES,
+    FAN_TYPES,
+    UNIT_MODES,
+    VENT_CONTROL_TYPES,
+)
+from .modbus_client import signed16
+
+
+def _scaled(raw: int | None) -> float | None:
+    """Return a signed register value / 10, or None for an unreadable one."""
+    return None if raw is None else signed16(raw) / 10
+
+
+def _signed(raw: int | None) -> int | None:
+    """Return a signed register value, or None for an unreadable one."""
+    return None if raw is None else signed16(raw)
+
+
+# Coil or discrete input states as an int: bit n is the block's start + n
+Bitset = int
+
+
+@dataclass
+class AlarmInfo:
+    """Single alarm entry."""
+    id: int
+    name: str
+    status: int
+    status_name: str
+
+
+@dataclass
+class TopvexData:
+    """All data from the Topvex unit."""
+    # Temperatures
+    outdoor_temp: float | None = None
+    intake_temp: float | None = None
+    supply_temp: float | None = None
+    exhaust_temp: float | None = None
+    extract_temp: float | None = None
+    after_recovery_temp: float | None = None
+
+    # Flow (m³/h)
+    saf_flow: float | None = None
+    eaf_flow: float | None = None
+
+    # Fan output (%)
+    saf_output: float | None = None
+    eaf_output: float | None = None
+
+    # Pressure (Pa)
+    exch_pressure: float | None = None
+    filter_pressure_saf: float | None = None
+    filter_pressure_eaf: float | None = None
+
+    # Special sensors
+    recovery_efficiency: float | None = None
+    frost_protection: float | None = None
+    seq_b: float | None = None  # bypass
+
+    # Environment
+    co2: float | None = None
+    humidity_room: float | None = None
+    humidity_duct: float | None = None
+    humidity_outdoor: float | None = None
+
+    # Unit mode
+    unit_mode: int | None = None
+    unit_mode_name: str | None = None
+
+    # Settings
+    ahu_mode: int | None = None
+    ahu_mode_name: str | None = None
+    manual_submode: int | None = None
+    saf_mode: int | None = None
+    saf_mode_name: str | None = None
+    saf_manual_setpoint: float | None = None
+    saf_manual_output: float | None = None
+    eaf_mode: int | None = None
+    eaf_mode_name: str | None = None
+    eaf_manual_setpoint: float | None = None
+    eaf_manual_output: float | None = None
+
+    # Temperature setpoints
+    vent_control: int | None = None
+    vent_control_name: str | None = None
+    fan_type: int | None = None
+    fan_type_name: str | None = None
+    supply_setpoint: float | None = None
+    extract_setpoint: float | None = None
+    supply_setpoint_max: float | None = None
+    supply_setpoint_min: float | None = None
+
+    # Fan flow setpoints (m³/h)
+    saf_flow_low: float | None = None
+    saf_flow_normal: float | None = None
+    saf_flow_high: float | None = None
+    eaf_flow_low: float | None = None
+    eaf_flow_normal: float | None = None
+    eaf_flow_high: float | None = None
+
+    # Fan output setpoints (%)
+    saf_output_low: float | None = None
+    saf_output_normal: float | None = None
+    saf_output_high: float | None = None
+    eaf_output_low: float | None = None
+    eaf_output_normal: float | None = None
+    eaf_output_high: float | None = None
+
+    # Bypass
+    bypass_mode: int | None = None
+    bypass_manual_output: float | None = None
+
+    # Alarms
+    alarms: list[AlarmInfo] = field(default_factory=list)
+
+    # Digital I/O (digital_io option)
+    coils: Bitset | None = None
+    digital_inputs: Bitset | None = None
+
+    # Kitchen boost
+    boost_active: bool = False  # any timed profile is running
+    boost_remaining: int = 0
+    active_profile: str | None = None
+
+    # Fields whose block failed this poll and still hold older values
+    stale_fields: set[str] = field(default_factory=set)
+
+    def as_dict(self) -> dict:
+        """Return a JSON-serialisable snapshot."""
+        result = asdict(self)
+        result["stale_fields"] = sorted(self.stale_fields)
+        return result
+
+
+@dataclass
+class BlockState:
+    """Freshness and quality of one register block."""
+    updated: float | None = None  # time.time() of the last good read
+    ok: bool = False
+    failures: int = 0  # consecutive failed reads
+    registers: list[int | None] | None = None  # last good raw values
+    latency_ms: float | None = None  # duration of the last read
+    # Recent reads as (time.time(), ok, latency_ms)
+    history: deque = field(default_factory=lambda: deque(maxlen=20))
+
+
+@dataclass(frozen=True)
+class RegisterBlock:
+    """A register range read together and decoded into TopvexData."""
+    key: str
+    table: str  # "ir" or "hr"
+    start: int
+    count: int
+    fields: tuple[str, ...]
+    decode: Callable[[TopvexData, list[int | None]], None]
+    every: int = 1  # read every n-th poll cycle
+    critical: bool = False  # read even when the poll is over its time budget
+
+
+@dataclass(frozen=True)
+class BitBlock:
+    """A coil or discrete input range read as one bitset."""
+    key: str  # TopvexData field holding the bitset
+    table: str  # "coil" (FC01) or "di" (FC02)
+    start: int
+    count: int
+
+    def bit(self, bits: Bitset, address: int) -> bool:
+        """Return the state of one address from the bitset."""
+        return bool(bits >> (address - self.start) & 1)
+
+
+def _decode_temperatures(data: TopvexData, regs: list[int | None]) -> None:
+    """IR 290-304: temps, flow, pressure."""
+    raw_outdoor = _scaled(regs[0])
+    data.intake_temp = _scaled(regs[1])
+    data.supply_temp = _scaled(regs[2])
+    data.exhaust_temp = _scaled(regs[3])
+    data.extract_temp = _scaled(regs[4])
+    # Fallback: use intake if outdoor sensor reads 0
+    data.outdoor_temp = data.intake_temp if raw_outdoor == 0 else raw_outdoor
+    data.saf_flow = None if regs[11] is None else regs[11] / 10  # IR 301, raw is 10x
+    data.eaf_flow = None if regs[12] is None else regs[12] / 10  # IR 302, raw is 10x
+    data.exch_pressure = _scaled(regs[14])  # IR 304
+
+
+def _decode_filters(data: TopvexData, regs: list[int | None]) -> None:
+    """IR 323-325: filter pressures and after-recovery temperature."""
+    data.filter_pressure_saf = _scaled(regs[0])
+    data.filter_pressure_eaf = _scaled(regs[1])
+    data.after_recovery_temp = _scaled(regs[2])
+
+
+def _decode_sequences(data: TopvexData, regs: list[int | None]) -> None:
+    """IR 341-342: SEQ-A/B."""
+    data.seq_b = _scaled(regs[1])  # SEQ-B = bypass
+
+
+def _decode_fan_outputs(data: TopvexData, regs: list[int | None]) -> None:
+    """IR 353-354: fan outputs."""
+    data.saf_output = _scaled(regs[0])
+    data.eaf_output = _scaled(regs[1])
+
+
+def _decode_frost(data: TopvexData, regs: list[int | None]) -> None:
+    """IR 374: frost protection."""
+    data.frost_protection = _scaled(regs[0])
+
+
+def _decode_efficiency(data: TopvexData, regs: list[int | None]) -> None:
+    """IR 395-396: efficiency and unit mode."""
+    data.recovery_efficiency = _scaled(regs[0])
+    if regs[1] is not None:
+        data.unit_mode = regs[1]
+        data.unit_mode_name = UNIT_MODES.get(regs[1], f"Ukjent ({regs[1]})")
+
+
+def _decode_environment(data: TopvexData, regs: list[int | None]) -> None:
+    """IR 309-312: CO2, humidity."""
+    data.co2 = _scaled(regs[0])
+    data.humidity_room = _scaled(regs[1])
+    data.humidity_duct = _scaled(regs[2])
+    data.humidity_outdoor = _scaled(regs[3])
+
+
+def _decode_modes(data: TopvexData, regs: list[int | None]) -> None:
+    """HR 565-574: mode settings."""
+    data.ahu_mode = _signed(regs[0])
+    data.ahu_mode_name = AHU_MODES.get(data.ahu_mode, "?")
+    data.manual_submode = _signed(regs[1])
+    data.saf_mode = _signed(regs[2])
+    data.saf_mode_name = FAN_MODES.get(data.saf_mode, "?")
+    data.saf_manual_setpoint = _scaled(regs[3])
+    data.saf_manual_output = _scaled(regs[4])
+    data.eaf_mode = _signed(regs[5])
+    data.eaf_mode_name = FAN_MODES.get(data.eaf_mode, "?")
+    data.eaf_manual_setpoint = _scaled(regs[6])
+    data.eaf_manual_output = _scaled(regs[7])
+
+
+def _decode_temperature_settings(data: TopvexData, regs: list[int | None]) -> None:
+    """HR 585-593: temperature settings."""
+    data.vent_control = _signed(regs[0])
+    data.vent_control_name = VENT_CONTROL_TYPES.get(data.vent_control, "?")
+    data.fan_type = _signed(regs[1])
+    data.fan_type_name = FAN_TYPES.get(data.fan_type, "?")
+    data.supply_setpoint = _scaled(regs[3])
+    data.extract_setpoint = _scaled(regs[4])
+    data.supply_setpoint_max = _scaled(regs[5])
+    data.supply_setpoint_min = _scaled(regs[6])
+
+
+def _decode_fan_setpoints(data: TopvexData, regs: list[int | None]) -> None:
+    """HR 618-629: fan flow and output setpoints."""
+    data.saf_flow_low = _scaled(regs[0])
+    data.saf_flow_normal = _scaled(regs[1])
+    data.saf_flow_high = _scaled(regs[2])
+    data.eaf_flow_low = _scaled(regs[3])
+    data.eaf_flow_normal = _scaled(regs[4])
+    data.eaf_flow_high = _scaled(regs[5])
+    data.saf_output_low = _scaled(regs[6])
+    data.saf_output_normal = _scaled(regs[7])
+    data.saf_output_high = _scaled(regs[8])
+    data.eaf_output_low = _scaled(regs[9])
+    data.eaf_output_normal = _scaled(regs[10])
+    data.eaf_output_high = _scaled(regs[11])
+
+
+def _decode_bypass(data: TopvexData, regs: list[int | None]) -> None:
+    """HR 719-720: bypass control."""
+    data.bypass_mode = _signed(regs[0])
+    data.bypass_manual_output = _scaled(regs[1])
+
+
+def _decode_alarms(data: TopvexData, regs: list[int | None]) -> None:
+    """IR 0-159: alarm statuses."""
+    data.alarms = [
+        AlarmInfo(
+            id=i,
+            name=ALARM_NAMES.get(i, f"Alarm {i}"),
+            status=status,
+            status_name=ALARM_STATUSES.get(status, f"Ukjent ({status})"),
+        )
+        for i, status in enumerate(regs)
+        if status is not None and status not in (0, 1)
+    ]
+
+
+BLOCKS: tuple[RegisterBlock, ...] = (
+    RegisterBlock(
+        "temperatures", "ir", 290, 15,
+        ("outdoor_temp", "intake_temp", "supply_temp", "exhaust_temp",
+         "extract_temp", "saf_flow", "eaf_flow", "exch_pressure"),
+        _decode_temperatures,
+        critical=True,
+    ),
+    RegisterBlock(
+        "filters", "ir", 323, 3,
+        ("filter_pressure_saf", "filter_pressure_eaf", "after_recovery_temp"),
+        _decode_filters,
+    ),
+    RegisterBlock("sequences", "ir", 341, 2, ("seq_b",), _decode_sequences),
+    RegisterBlock(
+        "fan_outputs", "ir", 353, 2, ("saf_output", "eaf_output"),
+        _decode_fan_outputs,
+    ),
+    RegisterBlock("frost", "ir", 374, 1, ("frost_protection",), _decode_frost),
+    RegisterBlock(
+        "efficiency", "ir", 395, 2,
+        ("recovery_efficiency", "unit_mode", "unit_mode_name"),
+        _decode_efficiency,
+        critical=True,
+    ),
+    RegisterBlock(
+        "environment", "ir", 309, 4,
+        ("co2", "humidity_room", "humidity_duct", "humidity_outdoor"),
+        _decode_environment,
+    ),
+    RegisterBlock(
+        "modes", "hr", 565, 10,
+        ("ahu_mode", "ahu_mode_name", "manual_submode", "saf_mode",
+         "saf_mode_name", "saf_manual_setpoint", "saf_manual_output",
+         "eaf_mode", "eaf_mode_name", "eaf_manual_setpoint", "eaf_manual_output"),
+        _decode_modes,
+        critical=True,
+    ),
+    RegisterBlock(
+        "temperature_settings", "hr", 585, 9,
+        ("vent_control", "vent_control_name", "fan_type", "fan_type_name",
+         "supply_setpoint", "extract_setpoint", "supply_setpoint_max",
+         "supply_setpoint_min"),
+        _decode_temperature_settings,
+    ),
+    RegisterBlock(
+        "fan_setpoints", "hr", 618, 12,
+        ("saf_flow_low", "saf_flow_normal", "saf_flow_high",
+         "eaf_flow_low", "eaf_flow_normal", "eaf_flow_high",
+         "saf_output_low", "saf_output_normal", "saf_output_high",
+         "eaf_output_low", "eaf_output_normal", "eaf_output_high"),
+        _decode_fan_setpoints,
+    ),
+    RegisterBlock(
+        "bypass", "hr", 719, 2, ("bypass_mode", "bypass_manual_output"),
+        _decode_bypass,
+    ),
+    # Alarms every 6th cycle (~60s at 10s interval)
+    RegisterBlock("alarms", "ir", 0, 160, ("alarms",), _decode_alarms, every=6),
+)
+
+
+BIT_BLOCKS: tuple[BitBlock, ...] = (
+    BitBlock("coils", "coil", 0, DIGITAL_IO_COUNT),
+    BitBlock("digital_inputs", "di", 0, DIGITAL_IO_COUNT),
+)
+
+
+def derive(data: TopvexData) -> None:
+    """Set values that depend on more than one block."""
+    # Refine unit_mode_name when in manual mode
+    if data.unit_mode == 0 and data.ahu_mode == 1:
+        data.unit_mode_name = "Manuell"
@@ -0,0 +1,316 @@
+"""Command-line poller and register dumper for Systemair Topvex.
+
+Runs the integration's Modbus client and block decoding without Home
+Assistant, for commissioning and benchmarking:
+
+    python custom_components/systemair_topvex/cli.py poll 192.168.1.50
+    python custom_components/systemair_topvex/cli.py poll --format csv \\
+        --interval 5 --count 12 192.168.1.50 > topvex.csv
+    python custom_components/systemair_topvex/cli.py dump --table hr \\
+        --start 500 --count 300 192.168.1.50
+    python custom_components/systemair_topvex/cli.py poll --interval 0 \\
+        --replay systemair_topvex_<entry_id>.frames
+
+Data goes to stdout; per-request latencies (--latency) and the summary go
+to stderr. With --replay, a frame log recorded by the integration stands in
+for the unit, so throughput can be measured without one.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+if not __package__:
+    # Run as a script: drop this directory from the path (select.py would
+    # shadow the standard library) and load the modules below as a package
+    # without its Home Assistant __init__.
+    import importlib.machinery
+    import importlib.util
+
+    _here = os.path.dirname(os.path.abspath(__file__))
+    sys.path[:] = [p for p in sys.path if os.path.abspath(p or ".") != _here]
+    _package = importlib.util.module_from_spec(
+        importlib.machinery.ModuleSpec("systemair_topvex", None, is_package=True)
+    )
+    _package.__path__ = [_here]
+    sys.modules["systemair_topvex"] = _package
+    __package__ = "systemair_topvex"
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import csv  # noqa: E402
+from dataclasses import fields  # noqa: E402
+import json  # noqa: E402
+import statistics  # noqa: E402
+import time  # noqa: E402
+
+from .blocks import BLOCKS, TopvexData, derive  # noqa: E402
+from .const import (  # noqa: E402
+    DEFAULT_BAUDRATE,
+    DEFAULT_PARITY,
+    DEFAULT_PORT,
+    DEFAULT_UNIT_ID,
+    PARITIES,
+    TRANSPORT_BUILTIN,
+    TRANSPORT_RTU,
+    TRANSPORT_RTU_TCP,
+    TRANSPORTS,
+)
+from .framelog import FrameLogReader, ReplayTransport  # noqa: E402
+from .modbus_client import (  # noqa: E402
+    PymodbusTransport,
+    TopvexModbusClient,
+    signed16,
+)
+from .rtu import ModbusRtuTransport, RtuBus  # noqa: E402
+from .transport import ModbusTcpTransport  # noqa: E402
+
+# Transport methods that send a request
+REQUEST_METHODS = {
+    "read_registers",
+    "read_bits",
+    "write_register",
+    "write_registers",
+    "write_coil",
+    "read_write_registers",
+}
+
+# TopvexData fields written as CSV columns
+CSV_FIELDS = [
+    f.name for f in fields(TopvexData) if f.name not in ("alarms", "stale_fields")
+]
+
+
+class TimedTransport:
+    """Wrap a transport and time every request it sends."""
+
+    def __init__(self, transport, verbose: bool) -> None:
+        self.transport = transport
+        self._verbose = verbose
+        self.latencies: list[float] = []
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.transport, name)
+        if name not in REQUEST_METHODS:
+            return attr
+
+        async def timed(*args):
+            start = time.monotonic()
+            try:
+                return await attr(*args)
+            finally:
+                latency = (time.monotonic() - start) * 1000
+                self.latencies.append(latency)
+                if self._verbose:
+                    # args: unit_id, then function/address/count or address
+                    print(
+                        f"{name} {' '.join(map(str, args[1:4]))} {latency:.1f} ms",
+                        file=sys.stderr,
+                    )
+
+        return timed
+
+
+def _client(args) -> tuple[TopvexModbusClient, TimedTransport]:
+    """Create a client whose transport is timed, live or from a frame log."""
+    if args.replay:
+        transport = ReplayTransport(FrameLogReader(args.replay), args.realtime)
+    elif args.transport == TRANSPORT_BUILTIN:
+        transport = ModbusTcpTransport(args.host, args.port, timeout=args.timeout)
+    elif args.transport == TRANSPORT_RTU:
+        bus = RtuBus.serial(args.host, args.baudrate, args.parity)
+        transport = ModbusRtuTransport(bus, timeout=args.timeout)
+    elif args.transport == TRANSPORT_RTU_TCP:
+        bus = RtuBus.tcp(args.host, args.port, args.baudrate)
+        transport = ModbusRtuTransport(bus, timeout=args.timeout)
+    else:
+        transport = PymodbusTransport(args.host, args.port, timeout=args.timeout)
+    timed = TimedTransport(transport, args.latency)
+    client = TopvexModbusClient(
+        args.host or "replay", args.port, args.unit_id, args.transport
+    )
+    client.transport_factory = lambda: timed
+    if args.replay or args.no_limit:
+        client.limiter = None
+    return client, timed
+
+
+async def _poll_once(client: TopvexModbusClient) -> TopvexData | None:
+    """Read and decode every block. Returns None if nothing could be read."""
+    data = TopvexData()
+    read = 0
+    for block in BLOCKS:
+        regs = await client.read_block(block.table, block.start, block.count)
+        if regs is None:
+            data.stale_fields.update(block.fields)
+            continue
+        block.decode(data, regs)
+        read += 1
+    if not read:
+        return None
+    derive(data)
+    return data
+
+
+def _print_summary(timed: TimedTransport, polls: int, elapsed: float) -> None:
+    """Write request and poll statistics to stderr."""
+    latencies = sorted(timed.latencies)
+    lines = []
+    if polls:
+        lines.append(f"polls: {polls} in {elapsed:.2f} s")
+    if polls and elapsed:
+        lines.append(f"polls/s: {polls / elapsed:.1f}")
+    if latencies:
+        lines.append(
+            f"requests: {len(latencies)}, latency ms: "
+            f"mean {statistics.fmean(latencies):.1f}, "
+            f"p50 {latencies[len(latencies) // 2]:.1f}, "
+            f"p95 {latencies[int(len(latencies) * 0.95)]:.1f}, "
+            f"max {latencies[-1]:.1f}"
+        )
+    print("\n".join(lines), file=sys.stderr)
+
+
+async def _async_poll(args) -> int:
+    """Poll at an interval and stream JSON lines or CSV rows."""
+    client, timed = _client(args)
+    if not await client.connect():
+        print(f"Cannot connect to {args.host}:{args.port}", file=sys.stderr)
+        return 1
+    writer = None
+    if args.format == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["time", *CSV_FIELDS])
+    replay = timed.transport if args.replay else None
+    polls = 0
+    start = time.monotonic()
+    try:
+        while args.count is None or polls < args.count:
+            cycle = time.monotonic()
+            served = replay.served if replay is not None else 0
+            data = await _poll_once(client)
+            if data is None:
+                if replay is None:
+                    print("No register blocks could be read", file=sys.stderr)
+                break
+            polls += 1
+            now = time.time()
+            if writer is not None:
+                writer.writerow([
+                    now,
+                    *(
+                        "" if getattr(data, name) is None else getattr(data, name)
+                        for name in CSV_FIELDS
+                    ),
+                ])
+            else:
+                print(json.dumps({"time": now, **data.as_dict()}))
+            sys.stdout.flush()
+            # Stop at the end of a frame log, or when no frames match
+            if replay is not None and (
+                replay.exhausted or replay.served == served
+            ):
+                break
+            await asyncio.sleep(max(0, args.interval - (time.monotonic() - cycle)))
+    finally:
+        elapsed = time.monotonic() - start
+        await client.disconnect()
+        _print_summary(timed, polls, elapsed)
+    return 0
+
+
+async def _async_dump(args) -> int:
+    """Dump a register range as CSV rows of table, address, raw, signed."""
+    client, timed = _client(args)
+    if not await client.connect():
+        print(f"Cannot connect to {args.host}:{args.port}", file=sys.stderr)
+        return 1
+    start = time.monotonic()
+    try:
+        regs = await client.read_block(args.table, args.start, args.count)
+    finally:
+        elapsed = time.monotonic() - start
+        await client.disconnect()
+    if regs is None:
+        print("Device did not answer", file=sys.stderr)
+        return 1
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["table", "address", "raw", "signed"])
+    for offset, raw in enumerate(regs):
+        writer.writerow([
+            args.table,
+            args.start + offset,
+            "" if raw is None else raw,
+            "" if raw is None else signed16(raw),
+        ])
+    _print_summary(timed, 0, elapsed)
+    return 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Poll or dump a Systemair Topvex over Modbus TCP."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "host", nargs="?", help="unit or gateway address, or serial port for rtu"
+    )
+    common.add_argument("--port", type=int, default=DEFAULT_PORT)
+    common.add_argument("--unit-id", type=int, default=DEFAULT_UNIT_ID)
+    common.add_argument(
+        "--transport", choices=TRANSPORTS, default=TRANSPORT_BUILTIN,
+        help="Modbus client (default: builtin, needs no pymodbus)",
+    )
+    common.add_argument("--baudrate", type=int, default=DEFAULT_BAUDRATE)
+    common.add_argument("--parity", choices=PARITIES, default=DEFAULT_PARITY)
+    common.add_argument("--timeout", type=float, default=5)
+    common.add_argument(
+        "--replay", metavar="FRAMES", help="serve reads from a frame log instead"
+    )
+    common.add_argument(
+        "--realtime", action="store_true",
+        help="replay with the recorded timing",
+    )
+    common.add_argument(
+        "--no-limit", action="store_true",
+        help="disable the request rate limits",
+    )
+    common.add_argument(
+        "--latency", action="store_true",
+        help="print each request and its latency to stderr",
+    )
+
+    poll = commands.add_parser(
+        "poll", parents=[common], help="poll all register blocks repeatedly"
+    )
+    poll.add_argument(
+        "--interval", type=float, default=10, help="seconds between polls"
+    )
+    poll.add_argument("--count", type=int, help="stop after this many polls")
+    poll.add_argument("--format", choices=("json", "csv"), default="json")
+
+    dump = commands.add_parser(
+        "dump", parents=[common], help="dump a register range"
+    )
+    dump.add_argument("--table", choices=("ir", "hr"), default="ir")
+    dump.add_argument("--start", type=int, default=0)
+    dump.add_argument("--count", type=int, default=100)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command line interface."""
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if not args.host and not args.replay:
+        parser.error("give a host or --replay")
+    command = _async_poll if args.command == "poll" else _async_dump
+    try:
+        return asyncio.run(command(args))
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -51,6 +51,11 @@ class TopvexClimate(TopvexEntity, ClimateEntity):
     _attr_target_temperature_step = 0.5
     _attr_min_temp = 10
     _attr_max_temp = 30
+    _data_fields = ("supply_temp", "supply_setpoint", "ahu_mode", "manual_submode")
+    # Live readings that have their own sensors
+    _unrecorded_attributes = frozenset({
+        "outdoor_temp", "extract_temp", "recovery_efficiency", "saf_flow", "eaf_flow",
+    })
 
     def __init__(self, coordinator: TopvexCoordinator) -> None:
         super().__init__(coordinator, "climate", "Ventilasjon")
@@ -106,6 +111,7 @@ class TopvexClimate(TopvexEntity, ClimateEntity):
             "recovery_efficiency": d.recovery_efficiency,
             "saf_flow": d.saf_flow,
             "eaf_flow": d.eaf_flow,
+            **self._stale_attributes(),
         }
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
@@ -7,8 +7,32 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
+from homeassistant.core import callback
 
-from .const import DEFAULT_PORT, DEFAULT_SCAN_INTERVAL, DEFAULT_UNIT_ID, DOMAIN
+from .const import (
+    CONF_BAUDRATE,
+    CONF_DIGITAL_IO,
+    CONF_METRICS,
+    CONF_PARITY,
+    CONF_PROXY_BIND,
+    CONF_PROXY_PORT,
+    CONF_PROXY_WRITES,
+    CONF_RECORD_FRAMES,
+    CONF_TRANSPORT,
+    CONF_WATCH_INTERVAL,
+    DEFAULT_BAUDRATE,
+    DEFAULT_PARITY,
+    DEFAULT_PORT,
+    DEFAULT_PROXY_BIND,
+    DEFAULT_PROXY_PORT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_UNIT_ID,
+    DEFAULT_WATCH_INTERVAL,
+    DOMAIN,
+    PARITIES,
+    TRANSPORT_PYMODBUS,
+    TRANSPORTS,
+)
 from .modbus_client import TopvexModbusClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -19,6 +43,12 @@ class TopvexConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow handler."""
+        return TopvexOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors = {}
@@ -29,14 +59,21 @@ class TopvexConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             unit_id = user_input.get("unit_id", DEFAULT_UNIT_ID)
 
             # Test connection by reading unit mode register
-            client = TopvexModbusClient(host, port, unit_id)
+            client = TopvexModbusClient(
+                host,
+                port,
+                unit_id,
+                user_input.get(CONF_TRANSPORT, TRANSPORT_PYMODBUS),
+                user_input.get(CONF_BAUDRATE, DEFAULT_BAUDRATE),
+                user_input.get(CONF_PARITY, DEFAULT_PARITY),
+            )
             try:
                 connected = await client.connect()
                 if connected:
                     result = await client.read_input_registers(396, 1)
                     await client.disconnect()
                     if result is not None:
-                        await self.async_set_unique_id(host)
+                        await self.async_set_unique_id(client.device_key)
                         self._abort_if_unique_id_configured()
                         return self.async_create_entry(
                             title=f"Topvex ({host})",
@@ -60,6 +97,70 @@ class TopvexConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(
                     CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
                 ): vol.All(vol.Coerce(int), vol.Range(min=5, max=60)),
+                vol.Optional(
+                    CONF_TRANSPORT, default=TRANSPORT_PYMODBUS
+                ): vol.In(TRANSPORTS),
+                vol.Optional(CONF_BAUDRATE, default=DEFAULT_BAUDRATE): int,
+                vol.Optional(CONF_PARITY, default=DEFAULT_PARITY): vol.In(PARITIES),
             }),
             errors=errors,
         )
+
+
+class TopvexOptionsFlow(config_entries.OptionsFlow):
+    """Options flow for Systemair Topvex."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = {**self._entry.data, **self._entry.options}
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Optional(
+                    CONF_WATCH_INTERVAL,
+                    default=options.get(CONF_WATCH_INTERVAL, DEFAULT_WATCH_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=30)),
+                vol.Optional(
+                    CONF_TRANSPORT,
+                    default=options.get(CONF_TRANSPORT, TRANSPORT_PYMODBUS),
+                ): vol.In(TRANSPORTS),
+                vol.Optional(
+                    CONF_BAUDRATE,
+                    default=options.get(CONF_BAUDRATE, DEFAULT_BAUDRATE),
+                ): int,
+                vol.Optional(
+                    CONF_PARITY,
+                    default=options.get(CONF_PARITY, DEFAULT_PARITY),
+                ): vol.In(PARITIES),
+                vol.Optional(
+                    CONF_RECORD_FRAMES,
+                    default=options.get(CONF_RECORD_FRAMES, False),
+                ): bool,
+                vol.Optional(
+                    CONF_METRICS,
+                    default=options.get(CONF_METRICS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_PROXY_PORT,
+                    default=options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Optional(
+                    CONF_PROXY_BIND,
+                    default=options.get(CONF_PROXY_BIND, DEFAULT_PROXY_BIND),
+                ): str,
+                vol.Optional(
+                    CONF_PROXY_WRITES,
+                    default=options.get(CONF_PROXY_WRITES, False),
+                ): bool,
+                vol.Optional(
+                    CONF_DIGITAL_IO,
+                    default=options.get(CONF_DIGITAL_IO, False),
+                ): bool,
+            }),
+        )
@@ -5,6 +5,115 @@ DEFAULT_PORT = 502
 DEFAULT_UNIT_ID = 1
 DEFAULT_SCAN_INTERVAL = 10
 MAX_REGISTERS_PER_REQUEST = 47
+MAX_BITS_PER_REQUEST = 2000
+
+# Modbus transport: pymodbus or the built-in asyncio implementation over
+# TCP, or RTU on a serial port (host is the device path) or through an
+# RTU-over-TCP converter, see rtu.py
+CONF_TRANSPORT = "transport"
+TRANSPORT_PYMODBUS = "pymodbus"
+TRANSPORT_BUILTIN = "builtin"
+TRANSPORT_RTU = "rtu"
+TRANSPORT_RTU_TCP = "rtu_over_tcp"
+TRANSPORTS = [TRANSPORT_PYMODBUS, TRANSPORT_BUILTIN, TRANSPORT_RTU, TRANSPORT_RTU_TCP]
+RTU_TRANSPORTS = (TRANSPORT_RTU, TRANSPORT_RTU_TCP)
+
+# RS-485 line settings for the RTU transports
+CONF_BAUDRATE = "baudrate"
+DEFAULT_BAUDRATE = 9600
+CONF_PARITY = "parity"
+DEFAULT_PARITY = "N"
+PARITIES = ["N", "E", "O"]
+# Seconds of bus time one read response may take; sizes reads to the baud rate
+RTU_MAX_READ_TIME = 0.1
+
+# Request budgets as (requests per second, burst), per device and shared by
+# all devices behind one gateway host:port
+RATE_LIMIT_DEVICE = {"read": (10, 20), "write": (2, 5)}
+RATE_LIMIT_GATEWAY = {"read": (20, 40), "write": (4, 10)}
+
+# I/O queue priorities, lowest served first
+PRIORITY_WRITE = 0
+PRIORITY_READBACK = 1  # targeted reads confirming a change
+PRIORITY_POLL = 2
+PRIORITY_BACKGROUND = 3  # diagnostics snapshots
+
+# Read timeouts follow the device's observed round-trip time, see rtt.py:
+# p99 of the last RTT_SAMPLES answers times RTT_TIMEOUT_FACTOR, clamped.
+# RTT_TIMEOUT_MAX is also the timeout for writes and the first requests.
+RTT_SAMPLES = 100
+RTT_MIN_SAMPLES = 10
+RTT_TIMEOUT_FACTOR = 3
+RTT_TIMEOUT_MIN = 0.3
+RTT_TIMEOUT_MAX = 5
+# Reads that time out under an adaptive timeout are retried this many times
+RTT_READ_RETRIES = 1
+
+# Share of the scan interval a poll may spend before non-critical blocks
+# still unread are left for the next poll
+POLL_BUDGET = 0.8
+
+# Unreadable registers found by batch bisection are re-tested after this long
+HOLE_RETEST_INTERVAL = 3600
+
+# Seconds before a failed register block is re-read on its own
+BLOCK_RETRY_DELAY = 2
+
+# Record every register read to a frame log in the config directory
+CONF_RECORD_FRAMES = "record_frames"
+# A full frame log is moved to <log>.1, replacing the previous one
+FRAME_LOG_MAX_BYTES = 64 * 1024 * 1024
+
+# Modbus TCP port for other clients to read and write through the
+# integration, see proxy.py; 0 disables
+CONF_PROXY_PORT = "proxy_port"
+DEFAULT_PROXY_PORT = 0
+# Address the proxy listens on; 0.0.0.0 serves the whole network
+CONF_PROXY_BIND = "proxy_bind"
+DEFAULT_PROXY_BIND = "127.0.0.1"
+# Let proxy clients write the set_setpoints registers and coils
+CONF_PROXY_WRITES = "proxy_writes"
+# Forwarded reads (ranges outside the polled blocks) kept by the proxy
+PROXY_CACHE_SIZE = 64
+
+# Serve readings and I/O statistics in OpenMetrics format, see metrics.py
+CONF_METRICS = "metrics"
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+
+# Rolling in-memory trends for the card, see trends.py: one slot per
+# TREND_STEP seconds for the last day, values stored as int16 tenths
+TREND_STEP = 60
+TREND_SIZE = 24 * 60
+TREND_SCALE = 10
+TREND_FIELDS = (
+    "outdoor_temp",
+    "supply_temp",
+    "extract_temp",
+    "exhaust_temp",
+    "after_recovery_temp",
+    "saf_flow",
+    "eaf_flow",
+    "saf_output",
+    "eaf_output",
+    "recovery_efficiency",
+    "filter_pressure_saf",
+    "filter_pressure_eaf",
+)
+
+# Read coils (FC01) and discrete inputs (FC02) each poll, one request per
+# table, as opt-in binary sensors; changes fire EVENT_DIGITAL_IO
+CONF_DIGITAL_IO = "digital_io"
+DIGITAL_IO_COUNT = 64
+EVENT_DIGITAL_IO = f"{DOMAIN}_digital_io"
+
+# Diagnostics raw register snapshot: (table, first, last) and parallel batches
+DIAGNOSTICS_RANGES = (("ir", 0, 400), ("hr", 500, 800))
+DIAGNOSTICS_CONCURRENCY = 4
+
+# Watch mode: fast single-register polling of mode/alarm state
+CONF_WATCH_INTERVAL = "watch_interval"
+# Off by default: each tick is one more request against the rate limits
+DEFAULT_WATCH_INTERVAL = 0
 
 PLATFORMS = [
     "sensor",
@@ -17,6 +126,9 @@ PLATFORMS = [
     "button",
 ]
 
+# Platforms set up after Home Assistant has started
+DEFERRED_PLATFORMS = ["binary_sensor", "button"]
+
 
 # --- Input Registers (FC 0x04, read-only) ---
 
@@ -68,6 +180,13 @@ class IR:
     HUMIDITY_OUTDOOR = 312
 
 
+# Registers polled by watch mode. A change triggers a full refresh.
+WATCH_REGISTERS = (IR.UNIT_MODE,)
+# Blocks that refresh reads even when not due. There is no alarm summary
+# register, but alarm stops change the unit mode, so alarms are read then.
+WATCH_REFRESH_BLOCKS = ("alarms",)
+
+
 # --- Holding Registers (FC 0x03 read / 0x06 write) ---
 
 class HR:
@@ -123,6 +242,10 @@ class Coil:
     RESET_FILTER_ALARM = 1
 
 
+# Command coils, written to trigger an action; not exposed as state
+COMMAND_COILS = (Coil.ACKNOWLEDGE_ALARMS, Coil.RESET_FILTER_ALARM)
+
+
 # --- Lookup tables ---
 
 UNIT_MODES = {
@@ -158,6 +281,9 @@ FAN_TYPES = {
     6: "EAF trykk + SAF slave", 7: "EAF trykk + SAF flow slave",
 }
 
+# Alarm status transitions kept per unit, see alarms.py
+ALARM_HISTORY_SIZE = 500
+
 ALARM_STATUSES = {
     1: "OK", 2: "Blokkert", 3: "Kvittert", 5: "Returnert", 7: "Aktiv alarm",
 }
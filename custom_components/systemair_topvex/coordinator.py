@@ -2,132 +2,46 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass, field
+import dataclasses
 from datetime import timedelta
 import logging
+import time
 
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.event import async_call_later
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .alarms import AlarmHistory
+from .blocks import (
+    BIT_BLOCKS,
+    BLOCKS,
+    BitBlock,
+    BlockState,
+    RegisterBlock,
+    TopvexData,
+    derive,
+)
 from .const import (
-    ALARM_NAMES,
-    ALARM_STATUSES,
-    AHU_MODES,
-    BOOST_EAF_FLOW,
-    BOOST_SAF_FLOW,
+    BLOCK_RETRY_DELAY,
     DOMAIN,
-    FAN_MODES,
-    FAN_TYPES,
+    EVENT_DIGITAL_IO,
     HR,
     IR,
-    UNIT_MODES,
-    VENT_CONTROL_TYPES,
+    POLL_BUDGET,
+    PRIORITY_READBACK,
+    WATCH_REFRESH_BLOCKS,
+    WATCH_REGISTERS,
 )
-from .modbus_client import TopvexModbusClient, signed16
+from .modbus_client import TopvexModbusClient
+from .profiles import PROFILE_KITCHEN, ProfileManager
+from .proxy import ModbusProxyServer
+from .schedule import ScheduleEngine
+from .trends import TrendBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
 
-@dataclass
-class AlarmInfo:
-    """Single alarm entry."""
-    id: int
-    name: str
-    status: int
-    status_name: str
-
-
-@dataclass
-class TopvexData:
-    """All data from the Topvex unit."""
-    # Temperatures
-    outdoor_temp: float | None = None
-    intake_temp: float | None = None
-    supply_temp: float | None = None
-    exhaust_temp: float | None = None
-    extract_temp: float | None = None
-    after_recovery_temp: float | None = None
-
-    # Flow (m³/h)
-    saf_flow: float | None = None
-    eaf_flow: float | None = None
-
-    # Fan output (%)
-    saf_output: float | None = None
-    eaf_output: float | None = None
-
-    # Pressure (Pa)
-    exch_pressure: float | None = None
-    filter_pressure_saf: float | None = None
-    filter_pressure_eaf: float | None = None
-
-    # Special sensors
-    recovery_efficiency: float | None = None
-    frost_protection: float | None = None
-    seq_b: float | None = None  # bypass
-
-    # Environment
-    co2: float | None = None
-    humidity_room: float | None = None
-    humidity_duct: float | None = None
-    humidity_outdoor: float | None = None
-
-    # Unit mode
-    unit_mode: int | None = None
-    unit_mode_name: str | None = None
-
-    # Settings
-    ahu_mode: int | None = None
-    ahu_mode_name: str | None = None
-    manual_submode: int | None = None
-    saf_mode: int | None = None
-    saf_mode_name: str | None = None
-    saf_manual_setpoint: float | None = None
-    saf_manual_output: float | None = None
-    eaf_mode: int | None = None
-    eaf_mode_name: str | None = None
-    eaf_manual_setpoint: float | None = None
-    eaf_manual_output: float | None = None
-
-    # Temperature setpoints
-    vent_control: int | None = None
-    vent_control_name: str | None = None
-    fan_type: int | None = None
-    fan_type_name: str | None = None
-    supply_setpoint: float | None = None
-    extract_setpoint: float | None = None
-    supply_setpoint_max: float | None = None
-    supply_setpoint_min: float | None = None
-
-    # Fan flow setpoints (m³/h)
-    saf_flow_low: float | None = None
-    saf_flow_normal: float | None = None
-    saf_flow_high: float | None = None
-    eaf_flow_low: float | None = None
-    eaf_flow_normal: float | None = None
-    eaf_flow_high: float | None = None
-
-    # Fan output setpoints (%)
-    saf_output_low: float | None = None
-    saf_output_normal: float | None = None
-    saf_output_high: float | None = None
-    eaf_output_low: float | None = None
-    eaf_output_normal: float | None = None
-    eaf_output_high: float | None = None
-
-    # Bypass
-    bypass_mode: int | None = None
-    bypass_manual_output: float | None = None
-
-    # Alarms
-    alarms: list[AlarmInfo] = field(default_factory=list)
-
-    # Kitchen boost
-    boost_active: bool = False
-    boost_remaining: int = 0
-
-
 class TopvexCoordinator(DataUpdateCoordinator[TopvexData]):
     """Coordinator for polling the Topvex unit."""
 
@@ -145,15 +59,72 @@ class TopvexCoordinator(DataUpdateCoordinator[TopvexData]):
         )
         self.client = client
         self._poll_cycle = 0
+        # Config entry id, set by __init__
+        self.entry_id: str | None = None
+        # Read coils and discrete inputs each poll (digital_io option)
+        self.digital_io = False
+        # Share of the scan interval a poll may take; None disables the
+        # deadline (frame log replay, which paces itself)
+        self.poll_budget: float | None = POLL_BUDGET
+
+        # Setup phase durations and forwarded platforms, filled by __init__
+        self.setup_timings: dict[str, float] = {}
+        self.loaded_platforms: list[str] = []
+
+        # Per-block freshness and quality
+        self.blocks: dict[str, BlockState] = {b.key: BlockState() for b in BLOCKS}
+        self._retry_cancel: callback | None = None
+        # Keys of blocks the last poll left unread, due again in the next
+        self._abandoned: set[str] = set()
+        # Keys of blocks watch mode wants read in the next poll
+        self._due_next: set[str] = set()
+
+        # Register writes requested, skipped as already current, and sent
+        self.write_stats = {"requested": 0, "elided": 0, "written": 0}
+        # Poll cycles run and failed, their total and last duration, and
+        # blocks left unread because a poll ran over its budget
+        self.poll_stats = {
+            "polls": 0, "failures": 0, "seconds": 0.0, "last_ms": None,
+            "abandoned": 0,
+        }
 
-        # Kitchen boost state
-        self._boost_active = False
-        self._boost_ends_at: float = 0
-        self._boost_cancel: callback | None = None
-        self._boost_saved: dict | None = None
+        # Named profiles and week schedule, set up by __init__ once the
+        # entry id is known
+        self.profiles: ProfileManager | None = None
+        self.schedule: ScheduleEngine | None = None
+        # Alarm status transitions, set up by __init__
+        self.alarm_history: AlarmHistory | None = None
+        # Last day of key readings per minute, for the card's sparklines
+        self.trends = TrendBuffer()
+        # Modbus TCP proxy for other clients, if enabled
+        self.proxy: ModbusProxyServer | None = None
+
+        # Watch mode state
+        self._watch_unsub: callback | None = None
+        self._watch_values: dict[int, int] = {}
+        self._watch_busy = False
 
     async def _async_update_data(self) -> TopvexData:
-        """Fetch data from Topvex via Modbus."""
+        """Fetch data from Topvex via Modbus, timing the poll cycle."""
+        start = time.monotonic()
+        try:
+            return await self._async_poll()
+        except UpdateFailed:
+            self.poll_stats["failures"] += 1
+            raise
+        except asyncio.CancelledError:
+            # Reads are shielded, so the cancelled poll's queued read would
+            # still go out; nobody wants it now
+            self.client.cancel_polls()
+            raise
+        finally:
+            elapsed = time.monotonic() - start
+            self.poll_stats["polls"] += 1
+            self.poll_stats["seconds"] += elapsed
+            self.poll_stats["last_ms"] = round(elapsed * 1000, 1)
+
+    async def _async_poll(self) -> TopvexData:
+        """Read the blocks due this cycle into a new TopvexData."""
         if not self.client.connected:
             try:
                 connected = await self.client.connect()
@@ -162,197 +133,380 @@ class TopvexCoordinator(DataUpdateCoordinator[TopvexData]):
             except Exception as err:
                 raise UpdateFailed(f"Connection error: {err}") from err
 
-        data = TopvexData()
+        # Critical blocks first, then the longest unread, so blocks left
+        # over by a poll that ran over budget are read first next time
+        due = sorted(
+            (
+                b for b in BLOCKS
+                if self._poll_cycle % b.every == 0
+                or b.key in self._abandoned
+                or b.key in self._due_next
+            ),
+            key=lambda b: (not b.critical, self.blocks[b.key].updated or 0),
+        )
+        deadline = None
+        if self.poll_budget is not None:
+            deadline = (
+                time.monotonic()
+                + self.poll_budget * self.update_interval.total_seconds()
+            )
         try:
-            await self._read_sensors(data)
-            await self._read_settings(data)
-
-            # Alarms every 6th cycle (~60s at 10s interval)
-            if self._poll_cycle % 6 == 0:
-                await self._read_alarms(data)
-            elif self.data:
-                data.alarms = self.data.alarms
-
-            # Refine unit_mode_name when in manual mode
-            if data.unit_mode == 0 and data.ahu_mode == 1:
-                data.unit_mode_name = "Manuell"
-
+            data = TopvexData()
+            failed, abandoned = await self._read_blocks(data, due, deadline)
+            self._abandoned = {b.key for b in abandoned}
+            self._due_next.clear()
+            if len(failed) + len(abandoned) == len(due):
+                raise UpdateFailed("No register blocks could be read")
+            self._carry_over(data, [b for b in BLOCKS if b not in due])
+            if self.digital_io:
+                await self._read_bits(data, deadline)
+            self._finalize(data)
+            self.trends.add(data)
             self._poll_cycle += 1
-
-            # Boost state
-            if self._boost_active:
-                import time
-                remaining = max(0, int(self._boost_ends_at - time.time()))
-                data.boost_active = True
-                data.boost_remaining = remaining
-                if remaining == 0:
-                    self._boost_active = False
-
+        except UpdateFailed:
+            raise
         except Exception as err:
             raise UpdateFailed(f"Polling error: {err}") from err
 
+        if failed:
+            self._schedule_block_retry()
+        if self.client.recorder is not None:
+            await self.hass.async_add_executor_job(self.client.recorder.flush)
         return data
 
-    async def _read_sensors(self, data: TopvexData) -> None:
-        """Read all sensor input registers."""
-        # Batch 1: IR 290-304 (15 regs) — temps, flow, pressure
-        ir1 = await self.client.read_input_registers(290, 15)
-        if ir1:
-            raw_outdoor = signed16(ir1[0]) / 10
-            data.intake_temp = signed16(ir1[1]) / 10
-            data.supply_temp = signed16(ir1[2]) / 10
-            data.exhaust_temp = signed16(ir1[3]) / 10
-            data.extract_temp = signed16(ir1[4]) / 10
-            # Fallback: use intake if outdoor sensor reads 0
-            data.outdoor_temp = data.intake_temp if raw_outdoor == 0 else raw_outdoor
-            data.saf_flow = ir1[11] / 10  # IR 301, raw is 10x
-            data.eaf_flow = ir1[12] / 10  # IR 302, raw is 10x
-            data.exch_pressure = signed16(ir1[14]) / 10  # IR 304
-
-        # Individual: IR 323-325 (may fail in batch)
-        data.filter_pressure_saf = await self.client.read_input_register_single(IR.FILTER_PRESSURE_SAF)
-        data.filter_pressure_eaf = await self.client.read_input_register_single(IR.FILTER_PRESSURE_EAF)
-        data.after_recovery_temp = await self.client.read_input_register_single(IR.AFTER_RECOVERY_TEMP)
-
-        # Individual: IR 341-342 (SEQ-A/B)
-        ir_seq = await self.client.read_input_registers(341, 2)
-        if ir_seq:
-            data.seq_b = signed16(ir_seq[1]) / 10  # SEQ-B = bypass
-
-        # Batch: IR 353-354 (fan outputs)
-        ir2 = await self.client.read_input_registers(353, 2)
-        if ir2:
-            data.saf_output = signed16(ir2[0]) / 10
-            data.eaf_output = signed16(ir2[1]) / 10
-
-        # Individual: IR 374 (frost protection)
-        data.frost_protection = await self.client.read_input_register_single(IR.FROST_PROTECTION)
-
-        # Individual: IR 395-396 (efficiency + unit mode)
-        ir3 = await self.client.read_input_registers(395, 2)
-        if ir3:
-            data.recovery_efficiency = signed16(ir3[0]) / 10
-            data.unit_mode = ir3[1]
-            data.unit_mode_name = UNIT_MODES.get(ir3[1], f"Ukjent ({ir3[1]})")
-        else:
-            # Fallback: just unit mode
-            ir3f = await self.client.read_input_registers(396, 1)
-            if ir3f:
-                data.unit_mode = ir3f[0]
-                data.unit_mode_name = UNIT_MODES.get(ir3f[0], f"Ukjent ({ir3f[0]})")
-
-        # Batch: IR 309-312 (CO2, humidity)
-        ir4 = await self.client.read_input_registers(309, 4)
-        if ir4:
-            data.co2 = signed16(ir4[0]) / 10
-            data.humidity_room = signed16(ir4[1]) / 10
-            data.humidity_duct = signed16(ir4[2]) / 10
-            data.humidity_outdoor = signed16(ir4[3]) / 10
-
-    async def _read_settings(self, data: TopvexData) -> None:
-        """Read holding registers for settings."""
-        # HR 565-574 (10 regs: mode settings)
-        hr1 = await self.client.read_holding_registers(565, 10)
-        if hr1:
-            data.ahu_mode = signed16(hr1[0])
-            data.ahu_mode_name = AHU_MODES.get(data.ahu_mode, "?")
-            data.manual_submode = signed16(hr1[1])
-            data.saf_mode = signed16(hr1[2])
-            data.saf_mode_name = FAN_MODES.get(data.saf_mode, "?")
-            data.saf_manual_setpoint = signed16(hr1[3]) / 10
-            data.saf_manual_output = signed16(hr1[4]) / 10
-            data.eaf_mode = signed16(hr1[5])
-            data.eaf_mode_name = FAN_MODES.get(data.eaf_mode, "?")
-            data.eaf_manual_setpoint = signed16(hr1[6]) / 10
-            data.eaf_manual_output = signed16(hr1[7]) / 10
-
-        # HR 585-593 (9 regs: temp settings)
-        hr2 = await self.client.read_holding_registers(585, 9)
-        if hr2:
-            data.vent_control = signed16(hr2[0])
-            data.vent_control_name = VENT_CONTROL_TYPES.get(data.vent_control, "?")
-            data.fan_type = signed16(hr2[1])
-            data.fan_type_name = FAN_TYPES.get(data.fan_type, "?")
-            data.supply_setpoint = signed16(hr2[3]) / 10
-            data.extract_setpoint = signed16(hr2[4]) / 10
-            data.supply_setpoint_max = signed16(hr2[5]) / 10
-            data.supply_setpoint_min = signed16(hr2[6]) / 10
-
-        # HR 618-629 (12 regs: fan setpoints)
-        hr3 = await self.client.read_holding_registers(618, 12)
-        if hr3:
-            data.saf_flow_low = signed16(hr3[0]) / 10
-            data.saf_flow_normal = signed16(hr3[1]) / 10
-            data.saf_flow_high = signed16(hr3[2]) / 10
-            data.eaf_flow_low = signed16(hr3[3]) / 10
-            data.eaf_flow_normal = signed16(hr3[4]) / 10
-            data.eaf_flow_high = signed16(hr3[5]) / 10
-            data.saf_output_low = signed16(hr3[6]) / 10
-            data.saf_output_normal = signed16(hr3[7]) / 10
-            data.saf_output_high = signed16(hr3[8]) / 10
-            data.eaf_output_low = signed16(hr3[9]) / 10
-            data.eaf_output_normal = signed16(hr3[10]) / 10
-            data.eaf_output_high = signed16(hr3[11]) / 10
-
-        # HR 719-720 (bypass control)
-        hr4 = await self.client.read_holding_registers(719, 2)
-        if hr4:
-            data.bypass_mode = signed16(hr4[0])
-            data.bypass_manual_output = signed16(hr4[1]) / 10
-
-    async def _read_alarms(self, data: TopvexData) -> None:
-        """Read alarm registers IR 0-159."""
-        alarms = []
-        all_regs: list[int] = []
-
-        for start in (0, 47, 94, 141):
-            count = min(47, 160 - start)
-            regs = await self.client.read_input_registers(start, count)
-            if regs:
-                all_regs.extend(regs)
+    async def _read_blocks(
+        self,
+        data: TopvexData,
+        blocks: list[RegisterBlock],
+        deadline: float | None = None,
+    ) -> tuple[list[RegisterBlock], list[RegisterBlock]]:
+        """Read and decode blocks into data.
+
+        Returns the blocks that failed and those abandoned because
+        `deadline` (time.monotonic()) passed: after it, only critical blocks
+        are started, and only while none has failed. Failed blocks keep
+        their last good values, marked stale; abandoned ones keep them as if
+        not due.
+        """
+        failed = []
+        abandoned = []
+        for block in blocks:
+            if (
+                deadline is not None
+                and (failed or not block.critical)
+                and time.monotonic() > deadline
+            ):
+                abandoned.append(block)
+                continue
+            state = self.blocks[block.key]
+            start = time.monotonic()
+            regs = await self.client.read_block(block.table, block.start, block.count)
+            state.latency_ms = round((time.monotonic() - start) * 1000, 1)
+            state.history.append((time.time(), regs is not None, state.latency_ms))
+            if regs is None:
+                state.ok = False
+                state.failures += 1
+                failed.append(block)
+                continue
+            state.ok = True
+            state.failures = 0
+            state.updated = time.time()
+            state.registers = regs
+            block.decode(data, regs)
+            data.stale_fields.difference_update(block.fields)
+            if block.key == "alarms" and self.alarm_history is not None:
+                self.alarm_history.record(regs)
+
+        for block in failed:
+            _LOGGER.debug(
+                "Block %s (%s %d-%d) failed %d time(s), keeping last values",
+                block.key, block.table.upper(), block.start,
+                block.start + block.count - 1, self.blocks[block.key].failures,
+            )
+            self._carry_over(data, [block])
+            if self.blocks[block.key].updated is not None:
+                data.stale_fields.update(block.fields)
+        if abandoned:
+            _LOGGER.debug(
+                "Poll over budget, leaving %s for the next one",
+                ", ".join(block.key for block in abandoned),
+            )
+            self.poll_stats["abandoned"] += len(abandoned)
+            self._carry_over(data, abandoned)
+        return failed, abandoned
+
+    async def _read_bits(self, data: TopvexData, deadline: float) -> None:
+        """Read the coil and discrete input bitsets, one request each.
+
+        Fires EVENT_DIGITAL_IO for every bit that changed since the last
+        poll. A bitset that cannot be read keeps its last value, marked
+        stale; one skipped because the poll is over budget just keeps it.
+        """
+        for block in BIT_BLOCKS:
+            previous = None if self.data is None else getattr(self.data, block.key)
+            if time.monotonic() > deadline:
+                self.poll_stats["abandoned"] += 1
+                bits = None
+                stale = self.data is not None and block.key in self.data.stale_fields
             else:
-                all_regs.extend([1] * count)  # Assume OK on read failure
+                bits = await self.client.read_bits(
+                    block.table, block.start, block.count
+                )
+                stale = previous is not None
+            if bits is None:
+                setattr(data, block.key, previous)
+                if stale:
+                    data.stale_fields.add(block.key)
+                continue
+            setattr(data, block.key, bits)
+            if previous is not None and bits != previous:
+                self._fire_bit_events(block, previous, bits)
+
+    @callback
+    def _fire_bit_events(self, block: BitBlock, previous: int, bits: int) -> None:
+        """Fire EVENT_DIGITAL_IO for each bit that differs."""
+        changed = previous ^ bits
+        while changed:
+            offset = (changed & -changed).bit_length() - 1
+            changed &= changed - 1
+            self.hass.bus.async_fire(EVENT_DIGITAL_IO, {
+                "entry_id": self.entry_id,
+                "table": block.table,
+                "address": block.start + offset,
+                "state": bool(bits >> offset & 1),
+            })
+
+    def _carry_over(self, data: TopvexData, blocks: list[RegisterBlock]) -> None:
+        """Copy the fields of blocks not read this time from the previous data."""
+        if self.data is None:
+            return
+        for block in blocks:
+            for name in block.fields:
+                setattr(data, name, getattr(self.data, name))
+            if block.fields[0] in self.data.stale_fields:
+                data.stale_fields.update(block.fields)
+
+    def _finalize(self, data: TopvexData) -> None:
+        """Derive values that span blocks and add boost state."""
+        derive(data)
+
+        # Seed watch values so the next watch tick compares against this poll
+        if data.unit_mode is not None:
+            self._watch_values[IR.UNIT_MODE] = data.unit_mode
+
+        # Timed profile (kitchen boost or any other)
+        if self.profiles is not None and self.profiles.active is not None:
+            data.boost_active = True
+            data.boost_remaining = self.profiles.remaining()
+            data.active_profile = self.profiles.active["name"]
+
+    @callback
+    def _schedule_block_retry(self) -> None:
+        """Retry failed blocks on their own shortly, once per poll."""
+        if self._retry_cancel is None:
+            self._retry_cancel = async_call_later(
+                self.hass, BLOCK_RETRY_DELAY, self._async_retry_blocks
+            )
+
+    async def _async_retry_blocks(self, _now=None) -> None:
+        """Re-read only the blocks that failed in the last poll."""
+        self._retry_cancel = None
+        failed = [b for b in BLOCKS if not self.blocks[b.key].ok]
+        if not failed or self.data is None or not self.client.connected:
+            return
+        data = dataclasses.replace(self.data, stale_fields=set(self.data.stale_fields))
+        still_failed, _ = await self._read_blocks(data, failed)
+        if len(still_failed) < len(failed):
+            self._finalize(data)
+            self.async_set_updated_data(data)
+
+    @callback
+    def async_cancel_block_retry(self) -> None:
+        """Cancel a pending block retry."""
+        if self._retry_cancel:
+            self._retry_cancel()
+            self._retry_cancel = None
+
+    # --- Watch mode ---
+
+    @callback
+    def async_start_watch(self, interval: float) -> None:
+        """Poll WATCH_REGISTERS every `interval` seconds (0 disables)."""
+        if interval <= 0 or self._watch_unsub is not None:
+            return
+        self._watch_unsub = async_track_time_interval(
+            self.hass, self._async_watch_tick, timedelta(seconds=interval)
+        )
 
-        for i, status in enumerate(all_regs):
-            if status not in (0, 1):
-                alarms.append(AlarmInfo(
-                    id=i,
-                    name=ALARM_NAMES.get(i, f"Alarm {i}"),
-                    status=status,
-                    status_name=ALARM_STATUSES.get(status, f"Ukjent ({status})"),
-                ))
+    @callback
+    def async_stop_watch(self) -> None:
+        """Stop watch mode polling."""
+        if self._watch_unsub:
+            self._watch_unsub()
+            self._watch_unsub = None
+
+    async def _async_watch_tick(self, _now=None) -> None:
+        """Read watched registers one by one, refresh on any change."""
+        if self._watch_busy or not self.client.connected:
+            return
+        self._watch_busy = True
+        changed = False
+        try:
+            for address in WATCH_REGISTERS:
+                regs = await self.client.read_input_registers(
+                    address, 1, PRIORITY_READBACK
+                )
+                if regs is None:
+                    continue
+                previous = self._watch_values.get(address)
+                self._watch_values[address] = regs[0]
+                if previous is not None and previous != regs[0]:
+                    _LOGGER.debug(
+                        "Watched IR %d changed %d -> %d", address, previous, regs[0]
+                    )
+                    changed = True
+        finally:
+            self._watch_busy = False
 
-        data.alarms = alarms
+        if changed:
+            self._due_next.update(WATCH_REFRESH_BLOCKS)
+            await self.async_request_refresh()
 
     # --- Write commands ---
 
+    def raw_register(self, table: str, address: int) -> int | None:
+        """Return a register's raw value, if its block's last read succeeded.
+
+        After a failed read the block keeps its last good values, but the
+        device may have changed since, so they are not returned.
+        """
+        for block in BLOCKS:
+            if block.table != table:
+                continue
+            offset = address - block.start
+            if 0 <= offset < block.count:
+                state = self.blocks[block.key]
+                if not state.ok or state.registers is None:
+                    return None
+                return state.registers[offset]
+        return None
+
+    async def async_write_verified(
+        self, writes: dict[int, int], force: bool = False
+    ) -> int:
+        """Write holding registers and publish the device's read-back.
+
+        Registers that already hold the value, per their block's last read,
+        are skipped unless `force` is set or that read failed. The rest are
+        grouped per register block into runs of consecutive registers.
+        Earlier runs go out as FC06/FC16; the last run of each block is
+        written with FC23 (or a write plus a read) so the block is read back
+        in the same round-trip, and clamped or rejected values reach
+        entities at once. Registers between runs are never
+        rewritten from cached values, so e.g. the kitchen profile (HR 565,
+        567, 570, 620, 623) takes five transactions. Returns the number of
+        transactions, or -1 if any write failed.
+        """
+        requested = len(writes)
+        if not force:
+            writes = {
+                address: value
+                for address, value in writes.items()
+                if self.raw_register("hr", address) != value & 0xFFFF
+            }
+        self.write_stats["requested"] += requested
+        self.write_stats["elided"] += requested - len(writes)
+        self.write_stats["written"] += len(writes)
+        if not writes:
+            return 0
+
+        groups: dict[RegisterBlock | None, list[int]] = {}
+        for address in sorted(writes):
+            block = next(
+                (
+                    b for b in BLOCKS
+                    if b.table == "hr" and b.start <= address < b.start + b.count
+                ),
+                None,
+            )
+            groups.setdefault(block, []).append(address)
+
+        transactions = 0
+        failed = False
+        data = None
+        if self.data is not None:
+            data = dataclasses.replace(
+                self.data, stale_fields=set(self.data.stale_fields)
+            )
+        for block, addresses in groups.items():
+            runs: list[list[int]] = []
+            for address in addresses:
+                if runs and address == runs[-1][-1] + 1:
+                    runs[-1].append(address)
+                else:
+                    runs.append([address])
+            if block is None or data is None:
+                verify = None
+            else:
+                verify = runs.pop()
+            for run in runs:
+                values = [writes[a] for a in run]
+                if len(run) == 1:
+                    ok = await self.client.write_register(run[0], values[0])
+                else:
+                    ok = await self.client.write_registers(run[0], values)
+                transactions += 1
+                failed |= not ok
+            if verify is None:
+                continue
+            regs = await self.client.write_and_verify(
+                verify[0], [writes[a] for a in verify], block.start, block.count
+            )
+            transactions += 1
+            if regs is None:
+                failed = True
+                continue
+            state = self.blocks[block.key]
+            state.ok = True
+            state.failures = 0
+            state.updated = time.time()
+            state.registers = regs
+            block.decode(data, regs)
+            data.stale_fields.difference_update(block.fields)
+
+        if failed or None in groups or data is None:
+            await self.async_request_refresh()
+        else:
+            self._finalize(data)
+            self.async_set_updated_data(data)
+        return -1 if failed else transactions
+
     async def async_set_ahu_mode(self, mode: int) -> None:
-        """Set AHU operating mode. Auto-sets fans to Auto for modes 2-5."""
-        await self.client.write_register(HR.AHU_MODE, mode)
+        """Set AHU operating mode. Auto-sets fans to Auto for modes 2-5.
+
+        Fan modes that are already Auto are not rewritten.
+        """
+        writes = {HR.AHU_MODE: mode}
         if mode >= 2:
-            await self.client.write_register(HR.SAF_MODE, 2)
-            await self.client.write_register(HR.EAF_MODE, 2)
-        await self.async_request_refresh()
+            writes[HR.SAF_MODE] = 2
+            writes[HR.EAF_MODE] = 2
+        await self.async_write_verified(writes)
 
     async def async_set_manual_submode(self, submode: int) -> None:
         """Set manual submode."""
-        await self.client.write_register(HR.MANUAL_SUBMODE, submode)
-        await self.async_request_refresh()
+        await self.async_write_verified({HR.MANUAL_SUBMODE: submode})
 
     async def async_set_supply_setpoint(self, temp: float) -> None:
         """Set supply air temperature setpoint (°C)."""
-        await self.client.write_register(HR.SUPPLY_SETPOINT, round(temp * 10))
-        await self.async_request_refresh()
+        await self.async_write_verified({HR.SUPPLY_SETPOINT: round(temp * 10)})
 
     async def async_set_saf_mode(self, mode: int) -> None:
         """Set supply air fan mode."""
-        await self.client.write_register(HR.SAF_MODE, mode)
-        await self.async_request_refresh()
+        await self.async_write_verified({HR.SAF_MODE: mode})
 
     async def async_set_eaf_mode(self, mode: int) -> None:
         """Set extract air fan mode."""
-        await self.client.write_register(HR.EAF_MODE, mode)
-        await self.async_request_refresh()
+        await self.async_write_verified({HR.EAF_MODE: mode})
 
     async def async_set_level_flow(self, fan_id: str, level: str, flow: float) -> None:
         """Set flow setpoint (m³/h) for a speed level. Does NOT change AHU mode."""
@@ -367,19 +521,16 @@ class TopvexCoordinator(DataUpdateCoordinator[TopvexData]):
         reg = regs.get((fan_id, level))
         if reg is not None:
             flow = max(50, min(2000, flow))
-            await self.client.write_register(reg, round(flow * 10))
-            await self.async_request_refresh()
+            await self.async_write_verified({reg: round(flow * 10)})
 
     async def async_set_bypass_mode(self, mode: int) -> None:
         """Set bypass mode (0=Auto, 1=Manual)."""
-        await self.client.write_register(HR.BYPASS_MODE, mode)
-        await self.async_request_refresh()
+        await self.async_write_verified({HR.BYPASS_MODE: mode})
 
     async def async_set_bypass_output(self, pct: float) -> None:
         """Set bypass manual output %."""
         pct = max(0, min(100, pct))
-        await self.client.write_register(HR.BYPASS_OUTPUT, round(pct * 10))
-        await self.async_request_refresh()
+        await self.async_write_verified({HR.BYPASS_OUTPUT: round(pct * 10)})
 
     async def async_acknowledge_alarms(self) -> None:
         """Acknowledge all alarms."""
@@ -394,76 +545,10 @@ class TopvexCoordinator(DataUpdateCoordinator[TopvexData]):
     # --- Kitchen boost ---
 
     async def async_start_kitchen_boost(self, minutes: int) -> None:
-        """Start kitchen boost: switch to Høy mode with high SAF, low EAF.
-
-        Uses level setpoints instead of manual mode so the controller
-        keeps regulating temperature, frost protection etc.
-        """
-        import time
-
-        if self._boost_active and self._boost_cancel:
-            self._boost_cancel()
-            self._boost_cancel = None
-
-        # Save current Høy setpoints so we can restore them
-        if not self._boost_active and self.data:
-            self._boost_saved = {
-                "saf_flow_high": self.data.saf_flow_high,
-                "eaf_flow_high": self.data.eaf_flow_high,
-                "ahu_mode": self.data.ahu_mode,
-            }
-
-        # Set Høy level flows for kitchen boost
-        await self.client.write_register(HR.SAF_FLOW_HIGH, round(BOOST_SAF_FLOW * 10))
-        await self.client.write_register(HR.EAF_FLOW_HIGH, round(BOOST_EAF_FLOW * 10))
-
-        # Switch to Høy mode (SAF/EAF stay in Auto)
-        await self.async_set_ahu_mode(5)
-
-        self._boost_active = True
-        self._boost_ends_at = time.time() + minutes * 60
-
-        self._boost_cancel = async_call_later(
-            self.hass, minutes * 60, self._async_boost_expired
-        )
-
-        _LOGGER.info("Kitchen boost started: %d minutes (Høy mode)", minutes)
-        await self.async_request_refresh()
-
-    async def _async_boost_expired(self, _now=None) -> None:
-        """Restore settings after kitchen boost."""
-        await self._async_restore_from_boost()
+        """Apply the built-in kitchen profile for `minutes`."""
+        if await self.profiles.async_apply(PROFILE_KITCHEN, minutes) < 0:
+            raise HomeAssistantError("Could not start kitchen boost")
 
     async def async_cancel_kitchen_boost(self) -> None:
-        """Cancel kitchen boost and restore settings."""
-        if self._boost_cancel:
-            self._boost_cancel()
-            self._boost_cancel = None
-        await self._async_restore_from_boost()
-
-    async def _async_restore_from_boost(self) -> None:
-        """Restore Høy setpoints and switch back to Normal."""
-        if self._boost_saved:
-            saved = self._boost_saved
-            try:
-                # Restore original Høy flow setpoints
-                if saved["saf_flow_high"] is not None:
-                    await self.client.write_register(
-                        HR.SAF_FLOW_HIGH, round(saved["saf_flow_high"] * 10)
-                    )
-                if saved["eaf_flow_high"] is not None:
-                    await self.client.write_register(
-                        HR.EAF_FLOW_HIGH, round(saved["eaf_flow_high"] * 10)
-                    )
-            except Exception:
-                _LOGGER.exception("Error restoring Høy setpoints from kitchen boost")
-
-        # Always return to Normal mode
-        await self.async_set_ahu_mode(4)
-
-        self._boost_active = False
-        self._boost_ends_at = 0
-        self._boost_saved = None
-        self._boost_cancel = None
-        _LOGGER.info("Kitchen boost ended, back to Normal mode")
-        await self.async_request_refresh()
+        """End the running timed profile and restore settings."""
+        await self.profiles.async_cancel()
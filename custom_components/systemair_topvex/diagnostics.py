@@ -0,0 +1,137 @@
+"""Diagnostics support for Systemair Topvex."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+import time
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .blocks import BLOCKS
+from .const import (
+    DIAGNOSTICS_CONCURRENCY,
+    DIAGNOSTICS_RANGES,
+    DOMAIN,
+    PRIORITY_BACKGROUND,
+)
+from .coordinator import TopvexCoordinator
+from .modbus_client import TopvexModbusClient
+
+TO_REDACT = {CONF_HOST}
+
+
+async def _async_snapshot_registers(client: TopvexModbusClient) -> dict:
+    """Read every register in DIAGNOSTICS_RANGES in parallel batches.
+
+    A semaphore caps the batches in flight so the snapshot does not starve
+    the regular poll sharing the connection. Batches are read as they are,
+    without bisection: the ranges span many unmapped addresses, and
+    bisecting them would cost hundreds of rate-limited requests. A rejected
+    batch is reported as a gap in `failed_batches`.
+    """
+    semaphore = asyncio.Semaphore(DIAGNOSTICS_CONCURRENCY)
+    size = client.max_registers
+
+    async def read(table: str, start: int, count: int) -> Sequence[int] | None:
+        async with semaphore:
+            if table == "ir":
+                return await client.read_input_registers(
+                    start, count, PRIORITY_BACKGROUND
+                )
+            return await client.read_holding_registers(
+                start, count, PRIORITY_BACKGROUND
+            )
+
+    batches = [
+        (table, start, min(size, last + 1 - start))
+        for table, first, last in DIAGNOSTICS_RANGES
+        for start in range(first, last + 1, size)
+    ]
+    started = time.monotonic()
+    results = await asyncio.gather(*(read(*batch) for batch in batches))
+
+    snapshot: dict = {}
+    for (table, start, count), regs in zip(batches, results):
+        values = snapshot.setdefault(table, {})
+        for offset in range(count):
+            values[start + offset] = None if regs is None else regs[offset]
+    snapshot["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+    snapshot["failed_batches"] = [
+        f"{table.upper()} {start}-{start + count - 1}"
+        for (table, start, count), regs in zip(batches, results)
+        if regs is None
+    ]
+    return snapshot
+
+
+def _block_diagnostics(coordinator: TopvexCoordinator) -> dict:
+    """Return the read plan, freshness and latency history per block."""
+    result = {}
+    for block in BLOCKS:
+        state = coordinator.blocks[block.key]
+        result[block.key] = {
+            "table": block.table,
+            "start": block.start,
+            "count": block.count,
+            "every": block.every,
+            "requests": coordinator.client.plan_reads(
+                block.table, block.start, block.count
+            ),
+            "updated": state.updated,
+            "ok": state.ok,
+            "failures": state.failures,
+            "latency_ms": state.latency_ms,
+            "history": list(state.history),
+        }
+    return result
+
+
+def _schedule_diagnostics(coordinator: TopvexCoordinator) -> dict | None:
+    """Return the timetable and the next transition."""
+    schedule = coordinator.schedule
+    if schedule is None:
+        return None
+    upcoming = schedule.next_transition
+    return {
+        "enabled": schedule.enabled,
+        "entries": schedule.entries,
+        "next": upcoming[0].isoformat() if upcoming else None,
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Return diagnostics for a config entry."""
+    coordinator: TopvexCoordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.client
+    registers = None
+    if client.connected:
+        registers = await _async_snapshot_registers(client)
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "setup": {
+            "timings": coordinator.setup_timings,
+            "loaded_platforms": coordinator.loaded_platforms,
+        },
+        "data": coordinator.data.as_dict() if coordinator.data else None,
+        "blocks": _block_diagnostics(coordinator),
+        "holes": client.holes,
+        "rate_limit": client.limiter.stats if client.limiter else None,
+        "writes": coordinator.write_stats,
+        "requests": client.request_stats,
+        "rtt": client.rtt.as_dict(),
+        "polls": coordinator.poll_stats,
+        "proxy": coordinator.proxy.stats if coordinator.proxy else None,
+        "schedule": _schedule_diagnostics(coordinator),
+        "alarm_history": (
+            coordinator.alarm_history.as_list() if coordinator.alarm_history else None
+        ),
+        "registers": registers,
+    }
@@ -1,10 +1,11 @@
 """Base entity for Systemair Topvex."""
 from __future__ import annotations
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, TRANSPORT_RTU
 from .coordinator import TopvexCoordinator, TopvexData
 
 
@@ -12,26 +13,78 @@ class TopvexEntity(CoordinatorEntity[TopvexCoordinator]):
     """Base entity for Topvex devices."""
 
     _attr_has_entity_name = True
+    # TopvexData fields this entity is built from
+    _data_fields: tuple[str, ...] = ()
 
     def __init__(self, coordinator: TopvexCoordinator, key: str, name: str) -> None:
         super().__init__(coordinator)
-        self._attr_unique_id = f"{DOMAIN}_{coordinator.client.host}_{key}"
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.client.device_key}_{key}"
         self._attr_translation_key = key
         self._attr_name = name
+        self._last_signature: tuple | None = None
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return device info."""
+        client = self.coordinator.client
         return DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.client.host)},
+            identifiers={(DOMAIN, client.device_key)},
             name="Topvex TC/C03 EL CAV",
             manufacturer="Systemair",
             model="Topvex TC/C03 EL CAV",
             sw_version="Access v4.6-1-00",
-            configuration_url=f"http://{self.coordinator.client.host}",
+            configuration_url=(
+                None if client.transport == TRANSPORT_RTU else f"http://{client.host}"
+            ),
         )
 
     @property
     def topvex_data(self) -> TopvexData:
         """Return current Topvex data."""
         return self.coordinator.data
+
+    @property
+    def stale(self) -> bool:
+        """Return True if any source field holds values from a failed read."""
+        data = self.coordinator.data
+        return data is not None and not data.stale_fields.isdisjoint(self._data_fields)
+
+    def _stale_attributes(self) -> dict:
+        """Return the staleness attribute for entities backed by registers."""
+        if not self._data_fields:
+            return {}
+        return {"stale": self.stale}
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Return staleness of the underlying register data."""
+        return self._stale_attributes() or None
+
+    def _state_signature(self) -> tuple:
+        """Return state and attributes, leaving out unrecorded attributes."""
+        attributes = {
+            **(self.state_attributes or {}),
+            **(self.extra_state_attributes or {}),
+        }
+        return (
+            self.available,
+            self.state,
+            sorted(
+                (key, value) for key, value in attributes.items()
+                if key not in self._unrecorded_attributes
+            ),
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state unless only unrecorded (volatile) attributes changed.
+
+        Volatile values such as live flows have their own sensors; skipping
+        these writes keeps them from producing a state row every poll.
+        """
+        if self._unrecorded_attributes:
+            signature = self._state_signature()
+            if signature == self._last_signature:
+                return
+            self._last_signature = signature
+        super()._handle_coordinator_update()
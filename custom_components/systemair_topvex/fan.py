@@ -31,6 +31,8 @@ class TopvexFan(TopvexEntity, FanEntity):
     _attr_supported_features = FanEntityFeature.PRESET_MODE
     _attr_speed_count = 100
     _attr_preset_modes = SAFE_PRESETS
+    # Live flow has its own sensor
+    _unrecorded_attributes = frozenset({"flow"})
 
     def __init__(
         self, coordinator: TopvexCoordinator, fan_id: str, name: str
@@ -38,6 +40,7 @@ class TopvexFan(TopvexEntity, FanEntity):
         super().__init__(coordinator, f"fan_{fan_id}", name)
         self._fan_id = fan_id
         self._attr_icon = "mdi:fan"
+        self._data_fields = (f"{fan_id}_output", "ahu_mode")
 
     @property
     def is_on(self) -> bool | None:
@@ -75,6 +78,7 @@ class TopvexFan(TopvexEntity, FanEntity):
                 "flow_low": d.saf_flow_low,
                 "flow_normal": d.saf_flow_normal,
                 "flow_high": d.saf_flow_high,
+                **self._stale_attributes(),
             }
         return {
             "flow": d.eaf_flow,
@@ -82,6 +86,7 @@ class TopvexFan(TopvexEntity, FanEntity):
             "flow_low": d.eaf_flow_low,
             "flow_normal": d.eaf_flow_normal,
             "flow_high": d.eaf_flow_high,
+            **self._stale_attributes(),
         }
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
@@ -0,0 +1,294 @@
+"""Register frame recording and replay for Systemair Topvex.
+
+A frame log is an append-only binary file of the register reads the client
+made. After an 8-byte header, each frame is
+
+    float64 timestamp | uint8 function | uint16 address | uint16 count
+    | count x uint16 registers
+
+all little-endian. A function code with 0x80 set records a Modbus exception
+response to a read of `count` registers and carries no registers. Logs are
+read through mmap so a week of polling can be indexed and replayed without
+loading it into memory.
+
+Recording buffers frames in memory; `flush()` does the blocking file write
+and is run in the executor once per poll. A log that would grow past
+FRAME_LOG_MAX_BYTES is rotated to `<path>.1` first, so at most two logs are
+kept.
+"""
+from __future__ import annotations
+
+import asyncio
+from array import array
+from dataclasses import dataclass
+import mmap
+import os
+import struct
+import sys
+import time
+
+from .const import FRAME_LOG_MAX_BYTES
+from .transport import ModbusError, ModbusExceptionResponse
+
+MAGIC = b"TVXF"
+VERSION = 1
+_HEADER = MAGIC + bytes((VERSION, 0, 0, 0))
+_FRAME = struct.Struct("<dBHH")
+_SWAP = sys.byteorder == "big"
+
+
+@dataclass(frozen=True)
+class Frame:
+    """One recorded register read."""
+    timestamp: float
+    function: int
+    address: int
+    count: int
+    registers: array  # array('H'), empty for exception responses
+
+    @property
+    def rejected(self) -> bool:
+        """Return True if the device answered with a Modbus exception."""
+        return bool(self.function & 0x80)
+
+
+class FrameLogWriter:
+    """Buffer register reads and append them to a frame log."""
+
+    def __init__(self, path: str, max_bytes: int = FRAME_LOG_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._buffer = bytearray()
+        self.frames = 0
+
+    def record(
+        self,
+        function: int,
+        address: int,
+        count: int,
+        registers=None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Buffer a frame. Pass registers=None for an exception response."""
+        if registers is None:
+            function |= 0x80
+        self._buffer += _FRAME.pack(
+            time.time() if timestamp is None else timestamp,
+            function,
+            address,
+            count,
+        )
+        if registers is not None:
+            payload = array("H", registers)
+            if _SWAP:
+                payload.byteswap()
+            self._buffer += payload.tobytes()
+        self.frames += 1
+
+    def flush(self) -> None:
+        """Append buffered frames to the file. Blocking."""
+        if not self._buffer:
+            return
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(self._buffer) > self.max_bytes:
+            os.replace(self.path, f"{self.path}.1")
+        with open(self.path, "ab") as file:
+            if file.tell() == 0:
+                file.write(_HEADER)
+            file.write(self._buffer)
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """Write out anything still buffered. Blocking."""
+        self.flush()
+
+
+class FrameLogReader:
+    """Random access to a frame log through mmap. Blocking to open."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:4] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a Topvex frame log")
+        self._offsets = array("Q")
+        offset = len(_HEADER)
+        size = len(self._map)
+        while offset + _FRAME.size <= size:
+            _, function, _, count = _FRAME.unpack_from(self._map, offset)
+            end = offset + _FRAME.size
+            if not function & 0x80:
+                end += 2 * count
+            if end > size:
+                break  # truncated last frame
+            self._offsets.append(offset)
+            offset = end
+
+    def close(self) -> None:
+        """Release the mapping."""
+        self._map.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> Frame:
+        offset = self._offsets[index]
+        timestamp, function, address, count = _FRAME.unpack_from(self._map, offset)
+        registers = array("H")
+        if not function & 0x80:
+            start = offset + _FRAME.size
+            registers.frombytes(self._map[start:start + 2 * count])
+            if _SWAP:
+                registers.byteswap()
+        return Frame(timestamp, function, address, count, registers)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class ReplayTransport:
+    """Serve register reads from a frame log, behind the transport interface.
+
+    Each read returns the next recorded frame for the same function code,
+    address and count. With realtime=True reads are delayed to match the
+    recorded timing; otherwise the log plays back as fast as it is read.
+    Writes are accepted and dropped.
+    """
+
+    # Realtime replay waits out the recorded gaps inside reads, so reads
+    # must not be cut short by the client's RTT-based timeout
+    adaptive_timeout = False
+
+    def __init__(self, reader: FrameLogReader, realtime: bool = False) -> None:
+        self.reader = reader
+        self.realtime = realtime
+        self._queues: dict[tuple[int, int, int], list[int]] = {}
+        for index, frame in enumerate(reader):
+            key = (frame.function & 0x7F, frame.address, frame.count)
+            self._queues.setdefault(key, []).append(index)
+        self._cursors = dict.fromkeys(self._queues, 0)
+        self.served = 0
+        self._connected = False
+        self._origin: tuple[float, float] | None = None
+
+    @property
+    def exhausted(self) -> bool:
+        """Return True once every recorded frame has been served."""
+        return self.served >= len(self.reader)
+
+    async def connect(self) -> bool:
+        """Start serving."""
+        self._connected = True
+        return True
+
+    def close(self) -> None:
+        """Stop serving."""
+        self._connected = False
+
+    @property
+    def connected(self) -> bool:
+        """Return True if connected."""
+        return self._connected
+
+    async def read_registers(
+        self, unit_id: int, function: int, address: int, count: int
+    ) -> array:
+        """Return the next recorded answer for this read."""
+        key = (function, address, count)
+        queue = self._queues.get(key)
+        if queue is None or self._cursors[key] >= len(queue):
+            raise ModbusError(f"No recorded frame for FC{function:02d} {address}")
+        frame = self.reader[queue[self._cursors[key]]]
+        self._cursors[key] += 1
+        self.served += 1
+        if self.realtime:
+            await self._wait_for(frame.timestamp)
+        if frame.rejected:
+            raise ModbusExceptionResponse(function, 2)
+        return frame.registers
+
+    async def read_bits(
+        self, unit_id: int, function: int, address: int, count: int
+    ) -> int:
+        """Bit reads are not recorded."""
+        raise ModbusError(f"No recorded frame for FC{function:02d} {address}")
+
+    async def _wait_for(self, timestamp: float) -> None:
+        """Sleep until the frame's offset from the first replayed frame."""
+        loop = asyncio.get_running_loop()
+        if self._origin is None:
+            self._origin = (timestamp, loop.time())
+        delay = (timestamp - self._origin[0]) - (loop.time() - self._origin[1])
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def write_register(self, unit_id: int, address: int, value: int) -> None:
+        """Drop the write."""
+
+    async def write_coil(self, unit_id: int, address: int, value: bool) -> None:
+        """Drop the write."""
+
+    async def write_registers(
+        self, unit_id: int, address: int, values: list[int]
+    ) -> None:
+        """Drop the write."""
+
+    async def read_write_registers(
+        self, unit_id: int, read_address: int, read_count: int,
+        write_address: int, values: list[int],
+    ) -> array:
+        """Reject FC23 so the client falls back to a write and a read."""
+        raise ModbusExceptionResponse(0x17, 1)
+
+
+async def async_replay(
+    coordinator, reader: FrameLogReader, realtime: bool = False
+) -> dict:
+    """Play a frame log through a coordinator until it is exhausted.
+
+    Swaps the coordinator client's transport for the log and refreshes back
+    to back, then puts the client back as it was (disconnected). While
+    replaying, the poll deadline is off, as realtime replay waits out the
+    recorded gaps inside reads, and the client's recorder is detached so the
+    replay is not recorded again. Returns the number of polls and how long
+    decoding and updates took.
+    """
+    transport = ReplayTransport(reader, realtime)
+    client = coordinator.client
+    saved = (
+        client.transport_factory, client.limiter, client.recorder,
+        coordinator.poll_budget,
+    )
+    await client.disconnect()
+    client.transport_factory = lambda: transport
+    client.limiter = None
+    client.recorder = None
+    coordinator.poll_budget = None
+    polls = 0
+    started = time.monotonic()
+    try:
+        while not transport.exhausted:
+            served = transport.served
+            await coordinator.async_refresh()
+            polls += 1
+            if transport.served == served:
+                break  # remaining frames do not match any current block
+    finally:
+        elapsed = time.monotonic() - started
+        await client.disconnect()
+        (
+            client.transport_factory, client.limiter, client.recorder,
+            coordinator.poll_budget,
+        ) = saved
+    return {
+        "polls": polls,
+        "frames": transport.served,
+        "seconds": round(elapsed, 3),
+        "polls_per_second": round(polls / elapsed, 1) if elapsed else None,
+    }
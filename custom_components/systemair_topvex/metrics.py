@@ -0,0 +1,219 @@
+"""OpenMetrics endpoint for Systemair Topvex.
+
+Serves the current TopvexData of every unit with metrics enabled, plus the
+client's Modbus request counters, block read latencies and poll cycle
+durations, in OpenMetrics text format. The body is built from the
+coordinator snapshots and reused until one of them changes, so scrapes
+between polls only cost sending it.
+"""
+from __future__ import annotations
+
+from dataclasses import fields
+from http import HTTPStatus
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .blocks import BLOCKS, TopvexData
+from .const import CONF_METRICS, DOMAIN, METRICS_URL
+from .coordinator import TopvexCoordinator
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Numeric TopvexData fields, exported as gauges named topvex_<field>
+DATA_FIELDS = [
+    f.name for f in fields(TopvexData)
+    if f.type.split(" |")[0] in ("float", "int", "bool")
+]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+class _Family:
+    """One metric family and its samples across units."""
+
+    def __init__(self, name: str, kind: str, help_text: str) -> None:
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.samples: list[str] = []
+
+    def add(self, labels: dict[str, str], value, suffix: str = "") -> None:
+        """Add a sample. None values are left out."""
+        if value is None:
+            return
+        if isinstance(value, bool):
+            value = int(value)
+        label_text = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+        self.samples.append(f"{self.name}{suffix}{{{label_text}}} {value}")
+
+    def render(self) -> str:
+        return "\n".join([
+            f"# TYPE {self.name} {self.kind}",
+            f"# HELP {self.name} {self.help}",
+            *self.samples,
+        ])
+
+
+def build_metrics(units: dict[str, TopvexCoordinator]) -> str:
+    """Return the OpenMetrics exposition for the given units by entry id."""
+    def gauge(name: str, help_text: str) -> _Family:
+        family = _Family(f"topvex_{name}", "gauge", help_text)
+        families.append(family)
+        return family
+
+    def counter(name: str, help_text: str) -> _Family:
+        family = _Family(f"topvex_{name}", "counter", help_text)
+        families.append(family)
+        return family
+
+    families: list[_Family] = []
+    up = gauge("up", "1 if the last poll succeeded")
+    data_gauges = {name: gauge(name, f"TopvexData.{name}") for name in DATA_FIELDS}
+    alarm = gauge("alarm_status", "Alarm status code (0 = inactive)")
+    block_ok = gauge("block_ok", "1 if the last read of the register block succeeded")
+    block_latency = gauge(
+        "block_latency_seconds", "Duration of the last read of the register block"
+    )
+    block_updated = gauge(
+        "block_updated_timestamp_seconds", "Time of the last good block read"
+    )
+    requests = counter("modbus_requests", "Modbus requests sent")
+    exceptions = counter(
+        "modbus_exceptions", "Modbus requests answered with an exception"
+    )
+    errors = counter("modbus_errors", "Modbus requests that got no valid answer")
+    request_seconds = counter(
+        "modbus_request_seconds", "Time spent on Modbus requests"
+    )
+    read_timeout = gauge(
+        "modbus_read_timeout_seconds", "Current adaptive Modbus read timeout"
+    )
+    rtt_p99 = gauge(
+        "modbus_rtt_p99_seconds", "99th percentile of recent Modbus read round-trips"
+    )
+    timeouts = counter("modbus_timeouts", "Modbus reads that timed out")
+    retries = counter("modbus_retries", "Modbus reads retried after a timeout")
+    throttled = counter("modbus_throttled", "Modbus requests delayed by rate limits")
+    throttle_seconds = counter(
+        "modbus_throttle_wait_seconds", "Time Modbus requests waited on rate limits"
+    )
+    writes = counter("register_writes", "Register writes requested, by result")
+    polls = counter("polls", "Poll cycles run")
+    poll_failures = counter("poll_failures", "Poll cycles that failed")
+    poll_seconds = counter("poll_seconds", "Time spent in poll cycles")
+    poll_duration = gauge("poll_duration_seconds", "Duration of the last poll cycle")
+    abandoned = counter(
+        "blocks_abandoned", "Register blocks left unread by polls over budget"
+    )
+
+    for entry_id, coordinator in units.items():
+        unit = {"entry_id": entry_id, "host": coordinator.client.host}
+        up.add(unit, coordinator.last_update_success)
+
+        data = coordinator.data
+        if data is not None:
+            for name, family in data_gauges.items():
+                family.add(unit, getattr(data, name))
+            for info in data.alarms:
+                alarm.add({**unit, "alarm": info.name}, info.status)
+
+        for block in BLOCKS:
+            state = coordinator.blocks[block.key]
+            labels = {**unit, "block": block.key}
+            block_ok.add(labels, state.ok)
+            if state.latency_ms is not None:
+                block_latency.add(labels, state.latency_ms / 1000)
+            block_updated.add(labels, state.updated)
+
+        client = coordinator.client
+        for kind, stats in client.request_stats.items():
+            labels = {**unit, "kind": kind}
+            requests.add(labels, stats["requests"], "_total")
+            exceptions.add(labels, stats["exceptions"], "_total")
+            errors.add(labels, stats["errors"], "_total")
+            request_seconds.add(labels, round(stats["seconds"], 6), "_total")
+        read_timeout.add(unit, round(client.rtt.timeout, 6))
+        p99 = client.rtt.percentile(0.99)
+        if p99 is not None:
+            rtt_p99.add(unit, round(p99, 6))
+        timeouts.add(unit, client.rtt.timeouts, "_total")
+        retries.add(unit, client.rtt.retries, "_total")
+        if client.limiter is not None:
+            limits = client.limiter.stats
+            for kind in ("read", "write"):
+                throttled.add(
+                    {**unit, "kind": kind}, limits[f"throttled_{kind}s"], "_total"
+                )
+            throttle_seconds.add(unit, limits["throttle_wait_s"], "_total")
+
+        for result in ("elided", "written"):
+            writes.add(
+                {**unit, "result": result}, coordinator.write_stats[result], "_total"
+            )
+
+        stats = coordinator.poll_stats
+        polls.add(unit, stats["polls"], "_total")
+        poll_failures.add(unit, stats["failures"], "_total")
+        poll_seconds.add(unit, round(stats["seconds"], 6), "_total")
+        if stats["last_ms"] is not None:
+            poll_duration.add(unit, stats["last_ms"] / 1000)
+        abandoned.add(unit, stats["abandoned"], "_total")
+
+    return "\n".join(f.render() for f in families) + "\n# EOF\n"
+
+
+class TopvexMetricsView(HomeAssistantView):
+    """Serve Topvex metrics to authenticated scrapers."""
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        # (entry id, data, poll count) per unit the body was built from
+        self._cache: tuple[list, bytes] | None = None
+
+    def _units(self) -> dict[str, TopvexCoordinator]:
+        """Return the coordinators of entries with metrics enabled."""
+        units = {}
+        for entry_id, coord in self.hass.data.get(DOMAIN, {}).items():
+            entry = self.hass.config_entries.async_get_entry(entry_id)
+            if (
+                isinstance(coord, TopvexCoordinator)
+                and entry is not None
+                and entry.options.get(CONF_METRICS, False)
+            ):
+                units[entry_id] = coord
+        return units
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics, rebuilt only after a poll or write."""
+        units = self._units()
+        if not units:
+            return self.json_message(
+                "No Topvex unit exports metrics", HTTPStatus.NOT_FOUND
+            )
+        snapshots = [
+            (entry_id, coord.data, coord.poll_stats["polls"])
+            for entry_id, coord in units.items()
+        ]
+        if self._cache is None or not _same(self._cache[0], snapshots):
+            self._cache = (snapshots, build_metrics(units).encode())
+        return web.Response(
+            body=self._cache[1], headers={"Content-Type": CONTENT_TYPE}
+        )
+
+
+def _same(cached: list, current: list) -> bool:
+    """Return True if no unit was added, removed, polled or written to."""
+    return len(cached) == len(current) and all(
+        a[0] == b[0] and a[1] is b[1] and a[2] == b[2]
+        for a, b in zip(cached, current)
+    )
@@ -1,13 +1,36 @@
 """Low-level Modbus TCP client for Systemair Topvex."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
 import inspect
 import logging
+import time
 
-from pymodbus.client import AsyncModbusTcpClient
-from pymodbus.exceptions import ModbusException
-
-from .const import MAX_REGISTERS_PER_REQUEST
+from .const import (
+    DEFAULT_BAUDRATE,
+    DEFAULT_PARITY,
+    HOLE_RETEST_INTERVAL,
+    MAX_BITS_PER_REQUEST,
+    MAX_REGISTERS_PER_REQUEST,
+    PRIORITY_POLL,
+    PRIORITY_READBACK,
+    PRIORITY_WRITE,
+    RATE_LIMIT_DEVICE,
+    RATE_LIMIT_GATEWAY,
+    RTT_READ_RETRIES,
+    RTT_TIMEOUT_MAX,
+    RTU_TRANSPORTS,
+    TRANSPORT_BUILTIN,
+    TRANSPORT_PYMODBUS,
+    TRANSPORT_RTU,
+    TRANSPORT_RTU_TCP,
+)
+from .framelog import FrameLogWriter
+from .ratelimit import RateLimiter
+from .rtt import RttTracker
+from .rtu import ModbusRtuTransport, RtuBus
+from .transport import ModbusError, ModbusExceptionResponse, ModbusTcpTransport
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,14 +40,14 @@ def signed16(val: int) -> int:
     return val - 65536 if val > 32767 else val
 
 
-def _detect_unit_kwarg() -> str:
+def _detect_unit_kwarg(client_cls: type) -> str:
     """Detect which keyword pymodbus uses for unit ID.
 
     pymodbus 3.6: 'slave'
     pymodbus 3.7+: 'slave' (deprecated) or 'device_id'
     pymodbus 3.12+: 'device_id' only
     """
-    sig = inspect.signature(AsyncModbusTcpClient.read_input_registers)
+    sig = inspect.signature(client_cls.read_input_registers)
     params = sig.parameters
     if "device_id" in params:
         return "device_id"
@@ -35,128 +58,651 @@ def _detect_unit_kwarg() -> str:
     return "slave"
 
 
-_UNIT_KWARG = _detect_unit_kwarg()
+class PymodbusTransport:
+    """pymodbus behind the same interface as ModbusTcpTransport.
+
+    pymodbus is imported here rather than at module level so it is only
+    loaded when this transport is selected.
+    """
+
+    def __init__(
+        self, host: str, port: int, timeout: float = RTT_TIMEOUT_MAX
+    ) -> None:
+        from pymodbus.client import AsyncModbusTcpClient
+        from pymodbus.exceptions import ModbusException
+
+        self._client = AsyncModbusTcpClient(host=host, port=port, timeout=timeout)
+        self._exception = ModbusException
+        self._unit_kwarg = _detect_unit_kwarg(AsyncModbusTcpClient)
+
+    async def connect(self) -> bool:
+        """Open the TCP connection."""
+        return await self._client.connect()
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._client.close()
+
+    @property
+    def connected(self) -> bool:
+        """Return True if connected."""
+        return self._client.connected
+
+    async def _call(self, method, function: int, unit_id: int, **kwargs):
+        """Call a pymodbus request method, raising transport errors."""
+        try:
+            result = await method(**kwargs, **{self._unit_kwarg: unit_id})
+        except self._exception as err:
+            raise ModbusError(str(err)) from err
+        if result.isError():
+            code = getattr(result, "exception_code", None)
+            if code is not None:
+                raise ModbusExceptionResponse(function, code)
+            raise ModbusError(str(result))
+        return result
+
+    async def read_registers(
+        self, unit_id: int, function: int, address: int, count: int
+    ) -> list[int]:
+        """Read holding (FC03) or input (FC04) registers."""
+        if function == 0x04:
+            method = self._client.read_input_registers
+        else:
+            method = self._client.read_holding_registers
+        result = await self._call(
+            method, function, unit_id, address=address, count=count
+        )
+        return result.registers
+
+    async def read_bits(
+        self, unit_id: int, function: int, address: int, count: int
+    ) -> int:
+        """Read coils (FC01) or discrete inputs (FC02) as a bitset."""
+        if function == 0x01:
+            method = self._client.read_coils
+        else:
+            method = self._client.read_discrete_inputs
+        result = await self._call(
+            method, function, unit_id, address=address, count=count
+        )
+        return sum(1 << n for n, bit in enumerate(result.bits[:count]) if bit)
+
+    async def write_register(self, unit_id: int, address: int, value: int) -> None:
+        """Write a single holding register (FC06)."""
+        await self._call(
+            self._client.write_register, 0x06, unit_id, address=address, value=value
+        )
+
+    async def write_coil(self, unit_id: int, address: int, value: bool) -> None:
+        """Write a single coil (FC05)."""
+        await self._call(
+            self._client.write_coil, 0x05, unit_id, address=address, value=value
+        )
+
+    async def write_registers(
+        self, unit_id: int, address: int, values: list[int]
+    ) -> None:
+        """Write consecutive holding registers (FC16)."""
+        await self._call(
+            self._client.write_registers, 0x10, unit_id,
+            address=address, values=values,
+        )
+
+    async def read_write_registers(
+        self,
+        unit_id: int,
+        read_address: int,
+        read_count: int,
+        write_address: int,
+        values: list[int],
+    ) -> list[int]:
+        """Write holding registers, then read holding registers (FC23)."""
+        result = await self._call(
+            self._client.readwrite_registers,
+            0x17,
+            unit_id,
+            read_address=read_address,
+            read_count=read_count,
+            write_address=write_address,
+            values=values,
+        )
+        return result.registers
 
 
 class TopvexModbusClient:
     """Async Modbus TCP client for Topvex Access controller."""
 
-    def __init__(self, host: str, port: int, unit_id: int) -> None:
-        self.host = host
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        unit_id: int,
+        transport: str = TRANSPORT_PYMODBUS,
+        baudrate: int = DEFAULT_BAUDRATE,
+        parity: str = DEFAULT_PARITY,
+    ) -> None:
+        self.host = host  # serial device path for TRANSPORT_RTU
         self.port = port
         self.unit_id = unit_id
-        self._client: AsyncModbusTcpClient | None = None
-
-    def _ukw(self) -> dict:
-        """Return the unit ID keyword argument for pymodbus calls."""
-        return {_UNIT_KWARG: self.unit_id}
+        self.transport = transport
+        self.baudrate = baudrate
+        self.parity = parity
+        self._client: (
+            ModbusTcpTransport | PymodbusTransport | ModbusRtuTransport | None
+        ) = None
+        # Learned unreadable addresses: (table, address) -> time learned
+        self._holes: dict[tuple[str, int], float] = {}
+        # Optional frame log of every register read, see framelog.py
+        self.recorder: FrameLogWriter | None = None
+        # Overrides `transport`, e.g. with a framelog.ReplayTransport
+        self.transport_factory: Callable[[], object] | None = None
+        # Request budgets; None disables limiting (e.g. for replay)
+        self.limiter: RateLimiter | None = RateLimiter(
+            host, port, RATE_LIMIT_DEVICE, RATE_LIMIT_GATEWAY
+        )
+        # I/O owner: one task serves all requests from a priority queue
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._seq = 0
+        self._worker: asyncio.Task | None = None
+        # Queued or in-flight reads by (function, address, count)
+        self._reads: dict[tuple[int, int, int], asyncio.Future] = {}
+        # Poll requests not yet started, for cancel_polls()
+        self._queued_polls: set[asyncio.Future] = set()
+        # Cleared when the device answers FC23 with "illegal function"
+        self.fc23_supported = True
+        # Requests sent, failed, and time on the wire, per "read"/"write"
+        self.request_stats = {
+            kind: {"requests": 0, "exceptions": 0, "errors": 0, "seconds": 0.0}
+            for kind in ("read", "write")
+        }
+        # Round-trip times of answered reads, which set the read timeout
+        self.rtt = RttTracker()
 
     async def connect(self) -> bool:
         """Connect to the Modbus device."""
-        self._client = AsyncModbusTcpClient(
-            host=self.host,
-            port=self.port,
-            timeout=5,
-        )
+        if self._client is not None:
+            self._client.close()
+        if self.transport_factory is not None:
+            self._client = self.transport_factory()
+        elif self.transport == TRANSPORT_BUILTIN:
+            self._client = ModbusTcpTransport(self.host, self.port, timeout=RTT_TIMEOUT_MAX)
+        elif self.transport == TRANSPORT_RTU:
+            bus = RtuBus.serial(self.host, self.baudrate, self.parity)
+            self._client = ModbusRtuTransport(bus, timeout=RTT_TIMEOUT_MAX)
+        elif self.transport == TRANSPORT_RTU_TCP:
+            bus = RtuBus.tcp(self.host, self.port, self.baudrate)
+            self._client = ModbusRtuTransport(bus, timeout=RTT_TIMEOUT_MAX)
+        else:
+            self._client = PymodbusTransport(self.host, self.port, timeout=RTT_TIMEOUT_MAX)
+        # (Re)start the I/O task, sized for this transport
+        if self._worker is not None:
+            self._worker.cancel()
+        self._worker = asyncio.get_running_loop().create_task(self._serve())
         return await self._client.connect()
 
     async def disconnect(self) -> None:
         """Disconnect from the Modbus device."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        while not self._queue.empty():
+            *_, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(ModbusError("Disconnected"))
+        self._queued_polls.clear()
         if self._client:
             self._client.close()
             self._client = None
+        if self.limiter is not None:
+            self.limiter.release()
 
     @property
     def connected(self) -> bool:
         """Return True if connected."""
         return self._client is not None and self._client.connected
 
-    async def read_input_registers(
-        self, address: int, count: int
-    ) -> list[int] | None:
-        """Read input registers (FC 0x04). Returns raw unsigned values."""
+    @property
+    def device_key(self) -> str:
+        """Return a stable id for the unit.
+
+        TCP units are keyed by host. Units on an RTU bus share it, so their
+        unit id is added.
+        """
+        if self.transport in RTU_TRANSPORTS:
+            return f"{self.host}_{self.unit_id}"
+        return self.host
+
+    @property
+    def max_registers(self) -> int:
+        """Return the most registers one read may request on this transport."""
+        return getattr(self._client, "max_registers", MAX_REGISTERS_PER_REQUEST)
+
+    # --- I/O owner ---
+
+    async def _serve(self) -> None:
+        """Run queued requests in priority order.
+
+        Up to `max_in_flight` requests run at once (1 unless the transport
+        pipelines), so a new write waits for at most one round-trip.
+        """
+        slots = asyncio.Semaphore(getattr(self._client, "max_in_flight", 1))
+        while True:
+            await slots.acquire()
+            _priority, _seq, call, future = await self._queue.get()
+            self._queued_polls.discard(future)
+            if future.done():  # cancelled while queued
+                slots.release()
+                continue
+            task = asyncio.get_running_loop().create_task(self._run(call, future))
+            task.add_done_callback(lambda _task: slots.release())
+
+    @staticmethod
+    async def _run(call: Callable[[], Awaitable], future: asyncio.Future) -> None:
+        """Run one request and resolve its future."""
+        try:
+            result = await call()
+        except Exception as err:  # noqa: BLE001 - handed to the caller
+            if not future.done():
+                future.set_exception(err)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    async def _submit(
+        self,
+        priority: int,
+        call: Callable[[], Awaitable],
+        key: tuple[int, int, int] | None = None,
+    ):
+        """Queue a request and wait for its result.
+
+        Reads with the same key as one already queued or in flight share
+        its result instead of going out again (single-flight); a poll read
+        joined by a higher-priority caller is no longer cancellable. Requests
+        with a key count as reads in `request_stats`, others as writes.
+        Rate limits are waited out here, before queueing, so a throttled
+        poll never holds an I/O slot that a write could use.
+        """
+        future = self._reads.get(key) if key is not None else None
+        if future is None:
+            kind = "read" if key is not None else "write"
+            call = self._counted(call, kind)
+            future = asyncio.get_running_loop().create_future()
+            if key is not None:
+                self._reads[key] = future
+                future.add_done_callback(
+                    lambda done: self._reads.pop(key, None)
+                    if self._reads.get(key) is done else None
+                )
+            if priority == PRIORITY_POLL:
+                self._queued_polls.add(future)
+            try:
+                await self._throttle(kind)
+            except BaseException:
+                # Cancelled while throttled: fail callers that joined
+                if not future.done():
+                    future.set_exception(ModbusError("Request abandoned"))
+                    future.exception()  # retrieved; joiners re-raise it
+                raise
+            self._seq += 1
+            self._queue.put_nowait((priority, self._seq, call, future))
+        elif priority < PRIORITY_POLL:
+            # A readback or watch joined a queued poll: keep it from cancel_polls()
+            self._queued_polls.discard(future)
+        return await asyncio.shield(future)
+
+    def _counted(
+        self, call: Callable[[], Awaitable], kind: str
+    ) -> Callable[[], Awaitable]:
+        """Wrap a request so it is counted in `request_stats`.
+
+        Reads time out after `rtt.timeout` and are retried (up to
+        RTT_READ_RETRIES times) while that is below the ceiling, so a
+        lost frame costs a few round-trips rather than the full timeout.
+        Retries are not throttled again; the timeout already spaced them.
+        Writes keep the transport's timeout and are never repeated, as do
+        all requests on transports without `adaptive_timeout` (replay, or
+        an RTU bus shared with other units).
+        """
+        stats = self.request_stats[kind]
+        adaptive = kind == "read" and getattr(self._client, "adaptive_timeout", True)
+        retries = RTT_READ_RETRIES if adaptive else 0
+
+        async def counted():
+            attempt = 0
+            while True:
+                timeout = self.rtt.timeout if adaptive else None
+                start = time.monotonic()
+                try:
+                    result = await asyncio.wait_for(call(), timeout)
+                except asyncio.TimeoutError as err:
+                    stats["errors"] += 1
+                    self.rtt.timed_out()
+                    if attempt < retries and timeout < RTT_TIMEOUT_MAX:
+                        attempt += 1
+                        self.rtt.retries += 1
+                        continue
+                    raise ModbusError(f"Timed out after {timeout:.2f} s") from err
+                except ModbusExceptionResponse:
+                    stats["exceptions"] += 1
+                    if kind == "read":
+                        self.rtt.add(time.monotonic() - start)
+                    raise
+                except Exception:
+                    stats["errors"] += 1
+                    raise
+                else:
+                    if kind == "read":
+                        self.rtt.add(time.monotonic() - start)
+                    return result
+                finally:
+                    stats["requests"] += 1
+                    stats["seconds"] += time.monotonic() - start
+
+        return counted
+
+    def cancel_polls(self) -> int:
+        """Drop poll reads that have not been sent yet. Returns how many.
+
+        Reads that a readback or watch has joined are kept.
+        """
+        cancelled = 0
+        for future in self._queued_polls:
+            if not future.done():
+                future.set_exception(ModbusError("Poll request cancelled"))
+                future.exception()  # retrieved; the poll may be gone
+                cancelled += 1
+        self._queued_polls.clear()
+        return cancelled
+
+    async def _throttle(self, kind: str) -> None:
+        """Wait for the rate limiter to allow a "read" or "write"."""
+        if self.limiter is None:
+            return
+        waited = await self.limiter.acquire(kind)
+        if waited:
+            _LOGGER.debug(
+                "Throttled %s on %s by %.2f s", kind, self.host, waited
+            )
+
+    async def _read_registers(
+        self, table: str, address: int, count: int, priority: int = PRIORITY_POLL
+    ) -> tuple[Sequence[int] | None, bool]:
+        """Read IR ("ir") or HR ("hr") registers.
+
+        Returns (registers, rejected). `rejected` is True when the device
+        answered "illegal data address" (exception code 2), i.e. the range
+        holds a register it does not have. Other exceptions (busy, device
+        failure) count as a failed read, like no answer at all.
+        """
         if not self.connected:
-            return None
-        if count > MAX_REGISTERS_PER_REQUEST:
+            return None, False
+        if count > self.max_registers:
             raise ValueError(
-                f"Cannot read {count} registers (max {MAX_REGISTERS_PER_REQUEST})"
+                f"Cannot read {count} registers (max {self.max_registers})"
+            )
+        function = 0x04 if table == "ir" else 0x03
+
+        async def call():
+            return await self._client.read_registers(
+                self.unit_id, function, address, count
             )
+
         try:
-            result = await self._client.read_input_registers(
-                address=address, count=count, **self._ukw()
+            registers = await self._submit(
+                priority, call, (function, address, count)
             )
-            if result.isError():
-                _LOGGER.debug(
-                    "Modbus error reading IR %d-%d: %s",
-                    address, address + count - 1, result,
-                )
-                return None
-            return list(result.registers)
-        except ModbusException as err:
-            _LOGGER.debug("Modbus exception reading IR %d: %s", address, err)
-            return None
+        except ModbusExceptionResponse as err:
+            _LOGGER.debug(
+                "Modbus error reading %s %d-%d: %s",
+                table.upper(), address, address + count - 1, err,
+            )
+            if self.recorder is not None:
+                self.recorder.record(function, address, count)
+            return None, err.exception_code == 2
+        except ModbusError as err:
+            _LOGGER.debug(
+                "Modbus exception reading %s %d: %s", table.upper(), address, err
+            )
+            return None, False
+        if self.recorder is not None:
+            self.recorder.record(function, address, count, registers)
+        return registers, False
+
+    async def read_input_registers(
+        self, address: int, count: int, priority: int = PRIORITY_POLL
+    ) -> Sequence[int] | None:
+        """Read input registers (FC 0x04). Returns raw unsigned values."""
+        regs, _ = await self._read_registers("ir", address, count, priority)
+        return regs
 
     async def read_holding_registers(
-        self, address: int, count: int
-    ) -> list[int] | None:
+        self, address: int, count: int, priority: int = PRIORITY_POLL
+    ) -> Sequence[int] | None:
         """Read holding registers (FC 0x03). Returns raw unsigned values."""
-        if not self.connected:
+        regs, _ = await self._read_registers("hr", address, count, priority)
+        return regs
+
+    async def read_bits(
+        self, table: str, address: int, count: int, priority: int = PRIORITY_POLL
+    ) -> int | None:
+        """Read coils ("coil", FC01) or discrete inputs ("di", FC02).
+
+        Returns a bitset where bit n is the state of `address + n`, or None
+        if the read failed. A range the device rejects as "illegal data
+        address" is learned as a hole at `address` and not requested again
+        until holes are re-tested.
+        """
+        self._expire_holes()
+        if not self.connected or (table, address) in self._holes:
             return None
-        if count > MAX_REGISTERS_PER_REQUEST:
+        if count > MAX_BITS_PER_REQUEST:
             raise ValueError(
-                f"Cannot read {count} registers (max {MAX_REGISTERS_PER_REQUEST})"
+                f"Cannot read {count} bits (max {MAX_BITS_PER_REQUEST})"
             )
-        try:
-            result = await self._client.read_holding_registers(
-                address=address, count=count, **self._ukw()
+        function = 0x01 if table == "coil" else 0x02
+
+        async def call():
+            return await self._client.read_bits(
+                self.unit_id, function, address, count
             )
-            if result.isError():
+
+        try:
+            return await self._submit(priority, call, (function, address, count))
+        except ModbusError as err:
+            if isinstance(err, ModbusExceptionResponse) and err.exception_code == 2:
+                _LOGGER.info(
+                    "%s %d-%d is unreadable on %s, skipping it for now",
+                    table, address, address + count - 1, self.host,
+                )
+                self._holes[(table, address)] = time.monotonic()
+            else:
                 _LOGGER.debug(
-                    "Modbus error reading HR %d-%d: %s",
-                    address, address + count - 1, result,
+                    "Modbus error reading %s %d-%d: %s",
+                    table, address, address + count - 1, err,
                 )
-                return None
-            return list(result.registers)
-        except ModbusException as err:
-            _LOGGER.debug("Modbus exception reading HR %d: %s", address, err)
             return None
 
+    # --- Hole-aware block reads ---
+
+    @property
+    def holes(self) -> dict[str, list[int]]:
+        """Return learned unreadable addresses per table."""
+        result: dict[str, list[int]] = {"ir": [], "hr": []}
+        for table, address in sorted(self._holes):
+            result.setdefault(table, []).append(address)
+        return result
+
+    def _expire_holes(self) -> None:
+        """Forget holes old enough to be re-tested."""
+        cutoff = time.monotonic() - HOLE_RETEST_INTERVAL
+        for key in [k for k, learned in self._holes.items() if learned < cutoff]:
+            del self._holes[key]
+
+    def plan_reads(
+        self, table: str, address: int, count: int
+    ) -> list[tuple[int, int]]:
+        """Split a range into requests that avoid known holes."""
+        plan: list[tuple[int, int]] = []
+        limit = self.max_registers
+        start = None
+        for addr in range(address, address + count + 1):
+            usable = addr < address + count and (table, addr) not in self._holes
+            if usable and start is None:
+                start = addr
+            if start is not None and (
+                not usable or addr - start == limit
+            ):
+                plan.append((start, addr - start))
+                start = addr if usable else None
+        return plan
+
+    async def _read_bisect(
+        self,
+        table: str,
+        address: int,
+        count: int,
+        out: list,
+        base: int,
+        priority: int = PRIORITY_POLL,
+    ) -> bool:
+        """Read into `out`, bisecting rejected batches down to single holes.
+
+        Returns False if the device stopped answering.
+        """
+        regs, rejected = await self._read_registers(table, address, count, priority)
+        if regs is not None:
+            out[address - base:address - base + count] = regs
+            return True
+        if not rejected:
+            return False
+        if count == 1:
+            _LOGGER.info(
+                "%s %d is unreadable on %s, skipping it in future batches",
+                table.upper(), address, self.host,
+            )
+            self._holes[(table, address)] = time.monotonic()
+            return True
+        half = count // 2
+        return (
+            await self._read_bisect(table, address, half, out, base, priority)
+            and await self._read_bisect(
+                table, address + half, count - half, out, base, priority
+            )
+        )
+
+    async def read_block(
+        self, table: str, address: int, count: int, priority: int = PRIORITY_POLL
+    ) -> list[int | None] | None:
+        """Read any register range ("ir" or "hr"), planning around holes.
+
+        Unreadable addresses come back as None. Returns None if the device
+        could not be reached.
+        """
+        self._expire_holes()
+        out: list[int | None] = [None] * count
+        for start, length in self.plan_reads(table, address, count):
+            if not await self._read_bisect(
+                table, start, length, out, address, priority
+            ):
+                return None
+        return out
+
     async def write_register(self, address: int, value: int) -> bool:
         """Write a single holding register (FC 0x06)."""
         if not self.connected:
             return False
         if value < 0:
             value += 65536
+
+        async def call():
+            await self._client.write_register(self.unit_id, address, value)
+
         try:
-            result = await self._client.write_register(
-                address=address, value=value, **self._ukw()
-            )
-            if result.isError():
-                _LOGGER.error(
-                    "Modbus error writing HR %d = %d: %s", address, value, result
-                )
-                return False
+            await self._submit(PRIORITY_WRITE, call)
             return True
-        except ModbusException as err:
-            _LOGGER.error("Modbus exception writing HR %d: %s", address, err)
+        except ModbusError as err:
+            _LOGGER.error("Modbus error writing HR %d = %d: %s", address, value, err)
             return False
 
-    async def write_coil(self, address: int, value: bool) -> bool:
-        """Write a single coil (FC 0x05)."""
+    async def write_registers(self, address: int, values: list[int]) -> bool:
+        """Write consecutive holding registers (FC 0x10)."""
         if not self.connected:
             return False
+        values = [v + 65536 if v < 0 else v for v in values]
+
+        async def call():
+            await self._client.write_registers(self.unit_id, address, values)
+
         try:
-            result = await self._client.write_coil(
-                address=address, value=value, **self._ukw()
+            await self._submit(PRIORITY_WRITE, call)
+            return True
+        except ModbusError as err:
+            _LOGGER.error(
+                "Modbus error writing HR %d-%d: %s",
+                address, address + len(values) - 1, err,
             )
-            if result.isError():
-                _LOGGER.error(
-                    "Modbus error writing coil %d: %s", address, result
+            return False
+
+    async def write_and_verify(
+        self, address: int, values: list[int], read_address: int, read_count: int
+    ) -> list[int | None] | None:
+        """Write consecutive holding registers and read back an HR range.
+
+        Uses FC23 to do both in one round-trip. Devices that answer FC23
+        with "illegal function", and ranges with known holes, get an
+        FC06/FC16 write and a targeted read instead. Returns the read-back
+        registers, or None on failure (including any other exception).
+        """
+        if not self.connected:
+            return None
+        values = [v + 65536 if v < 0 else v for v in values]
+        plan = self.plan_reads("hr", read_address, read_count)
+        if self.fc23_supported and plan == [(read_address, read_count)]:
+
+            async def call():
+                return await self._client.read_write_registers(
+                    self.unit_id, read_address, read_count, address, values
+                )
+
+            try:
+                return list(await self._submit(PRIORITY_WRITE, call))
+            except ModbusExceptionResponse as err:
+                if err.exception_code != 1:
+                    # The device refused the write itself; FC06/FC16 would too
+                    _LOGGER.error("Modbus error writing HR %d: %s", address, err)
+                    return None
+                _LOGGER.info(
+                    "%s does not support FC23, verifying writes with a read",
+                    self.host,
                 )
-                return False
+                self.fc23_supported = False
+            except ModbusError as err:
+                _LOGGER.error("Modbus error writing HR %d: %s", address, err)
+                return None
+        if len(values) == 1:
+            written = await self.write_register(address, values[0])
+        else:
+            written = await self.write_registers(address, values)
+        if not written:
+            return None
+        return await self.read_block(
+            "hr", read_address, read_count, PRIORITY_READBACK
+        )
+
+    async def write_coil(self, address: int, value: bool) -> bool:
+        """Write a single coil (FC 0x05)."""
+        if not self.connected:
+            return False
+
+        async def call():
+            await self._client.write_coil(self.unit_id, address, value)
+
+        try:
+            await self._submit(PRIORITY_WRITE, call)
             return True
-        except ModbusException as err:
-            _LOGGER.error("Modbus exception writing coil %d: %s", address, err)
+        except ModbusError as err:
+            _LOGGER.error("Modbus error writing coil %d: %s", address, err)
             return False
 
     async def read_input_register_single(self, address: int) -> int | None:
@@ -38,6 +38,7 @@ class TopvexSupplySetpoint(TopvexEntity, NumberEntity):
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_mode = NumberMode.SLIDER
     _attr_icon = "mdi:thermometer"
+    _data_fields = ("supply_setpoint",)
 
     def __init__(self, coordinator: TopvexCoordinator) -> None:
         super().__init__(coordinator, "supply_setpoint", "Tilluft settpunkt")
@@ -68,6 +69,7 @@ class TopvexLevelFlowNumber(TopvexEntity, NumberEntity):
         super().__init__(coordinator, f"{fan_id}_flow_{level}", name)
         self._fan_id = fan_id
         self._level = level
+        self._data_fields = (f"{fan_id}_flow_{level}",)
 
     @property
     def native_value(self) -> float | None:
@@ -89,6 +91,7 @@ class TopvexBypassOutput(TopvexEntity, NumberEntity):
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_mode = NumberMode.SLIDER
     _attr_icon = "mdi:valve"
+    _data_fields = ("bypass_manual_output",)
 
     def __init__(self, coordinator: TopvexCoordinator) -> None:
         super().__init__(coordinator, "bypass_output", "Bypass manuell utgang")
@@ -0,0 +1,257 @@
+"""Named ventilation profiles for Systemair Topvex.
+
+A profile is a set of holding register values. Applying one writes the
+registers that differ from the unit's current values as one batch through
+the coordinator. A timed apply snapshots the same registers first and writes
+the snapshot back when the time is up. Profiles and any running timed
+profile are persisted, so a restart neither loses nor strands them.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .blocks import BLOCKS
+from .const import (
+    BOOST_EAF_FLOW,
+    BOOST_SAF_FLOW,
+    DOMAIN,
+    HR,
+    PRIORITY_READBACK,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import TopvexCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+RESTORE_RETRY_DELAY = 60
+
+PROFILE_KITCHEN = "kitchen"
+
+# Profiles that always exist; stored profiles with the same name override them
+BUILTIN_PROFILES: dict[str, dict[int, int]] = {
+    # Høy mode with high supply and low extract flow. Uses level setpoints
+    # instead of manual mode so the controller keeps regulating temperature,
+    # frost protection etc.
+    PROFILE_KITCHEN: {
+        HR.AHU_MODE: 5,
+        HR.SAF_MODE: 2,
+        HR.EAF_MODE: 2,
+        HR.SAF_FLOW_HIGH: round(BOOST_SAF_FLOW * 10),
+        HR.EAF_FLOW_HIGH: round(BOOST_EAF_FLOW * 10),
+    },
+}
+
+
+def _str_keys(registers: dict[int, int]) -> dict[str, int]:
+    """Use string keys so register maps round-trip through JSON."""
+    return {str(address): value for address, value in registers.items()}
+
+
+def _int_keys(registers: dict) -> dict[int, int]:
+    """Convert JSON object keys back to register addresses."""
+    return {int(address): value for address, value in registers.items()}
+
+
+class ProfileManager:
+    """Stores, applies and times named profiles for one Topvex."""
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: TopvexCoordinator, entry_id: str
+    ) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.profiles"
+        )
+        self._stored: dict[str, dict[int, int]] = {}
+        # Running timed profile: name, ends_at (time.time()), restore snapshot
+        self.active: dict | None = None
+        self._cancel: callback | None = None
+
+    @property
+    def profiles(self) -> dict[str, dict[int, int]]:
+        """Return all profiles, built-in ones first."""
+        return {**BUILTIN_PROFILES, **self._stored}
+
+    async def async_load(self) -> None:
+        """Load stored profiles and resume a timed profile, if any."""
+        stored = await self._store.async_load() or {}
+        self._stored = {
+            name: _int_keys(registers)
+            for name, registers in stored.get("profiles", {}).items()
+        }
+        active = stored.get("active")
+        if active:
+            active["restore"] = _int_keys(active["restore"])
+            self.active = active
+            self._schedule_restore()
+
+    @callback
+    def async_unload(self) -> None:
+        """Stop the restore timer. A running profile resumes on next load."""
+        if self._cancel:
+            self._cancel()
+            self._cancel = None
+
+    @callback
+    def _async_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, 1)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        active = None
+        if self.active is not None:
+            active = {**self.active, "restore": _str_keys(self.active["restore"])}
+        return {
+            "profiles": {
+                name: _str_keys(registers) for name, registers in self._stored.items()
+            },
+            "active": active,
+        }
+
+    # --- Profiles ---
+
+    async def async_snapshot(self, addresses) -> dict[int, int] | None:
+        """Read the current raw values of holding registers from the unit."""
+        snapshot: dict[int, int] = {}
+        wanted = set(addresses)
+        for block in BLOCKS:
+            if block.table != "hr":
+                continue
+            inside = {
+                a for a in wanted if block.start <= a < block.start + block.count
+            }
+            if not inside:
+                continue
+            regs = await self.coordinator.client.read_block(
+                "hr", block.start, block.count, PRIORITY_READBACK
+            )
+            if regs is None:
+                return None
+            for address in inside:
+                snapshot[address] = regs[address - block.start]
+            wanted -= inside
+        for address in wanted:
+            regs = await self.coordinator.client.read_holding_registers(
+                address, 1, PRIORITY_READBACK
+            )
+            if regs is None:
+                return None
+            snapshot[address] = regs[0]
+        if None in snapshot.values():
+            return None
+        return snapshot
+
+    @callback
+    def async_save_profile(self, name: str, registers: dict[int, int]) -> None:
+        """Store a profile, replacing any with the same name."""
+        self._stored[name] = dict(registers)
+        self._async_save()
+
+    @callback
+    def async_delete_profile(self, name: str) -> bool:
+        """Delete a stored profile. Built-in profiles cannot be deleted."""
+        if self._stored.pop(name, None) is None:
+            return False
+        self._async_save()
+        return True
+
+    async def async_apply(
+        self, name: str, minutes: int | None = None, force: bool = False
+    ) -> int:
+        """Apply a profile, optionally for a limited time.
+
+        Only registers that differ from the unit's current values are
+        written unless `force` is set. Returns the number of write
+        transactions, or -1 on failure.
+        """
+        registers = self.profiles[name]
+        if minutes:
+            restore = dict(self.active["restore"]) if self.active else {}
+            missing = [a for a in registers if a not in restore]
+            snapshot = await self.async_snapshot(missing)
+            if snapshot is None:
+                _LOGGER.error("Cannot snapshot registers for profile %s", name)
+                return -1
+            restore.update(snapshot)
+            self.async_unload()
+            self.active = {
+                "name": name,
+                "ends_at": time.time() + minutes * 60,
+                "restore": restore,
+            }
+            # Persist before writing so a restart mid-apply still restores
+            self._async_save()
+            self._schedule_restore()
+            _LOGGER.info("Profile %s applied for %d minutes", name, minutes)
+        return await self.coordinator.async_write_verified(registers, force)
+
+    @callback
+    def defer(self, writes: dict[int, int]) -> dict[int, int]:
+        """Hold back writes to the registers of the running timed profile.
+
+        Those values replace the profile's restore snapshot, so they take
+        effect when it ends instead of cutting it short and then being
+        undone by the restore. Returns the writes to make now.
+        """
+        if self.active is None:
+            return writes
+        restore = self.active["restore"]
+        held = {a: v for a, v in writes.items() if a in restore}
+        if held:
+            restore.update(held)
+            self._async_save()
+            _LOGGER.info(
+                "Profile %s is running, %d registers are set when it ends",
+                self.active["name"], len(held),
+            )
+        return {a: v for a, v in writes.items() if a not in restore}
+
+    async def async_cancel(self) -> None:
+        """End the running timed profile and restore the snapshot."""
+        self.async_unload()
+        await self._async_restore()
+
+    # --- Timed profiles ---
+
+    @callback
+    def _schedule_restore(self) -> None:
+        delay = max(0, self.active["ends_at"] - time.time())
+        self._cancel = async_call_later(self.hass, delay, self._async_expired)
+
+    async def _async_expired(self, _now=None) -> None:
+        self._cancel = None
+        await self._async_restore()
+
+    async def _async_restore(self) -> None:
+        """Write back the registers saved when the timed profile started."""
+        if self.active is None:
+            return
+        active = self.active
+        if await self.coordinator.async_write_verified(active["restore"]) < 0:
+            _LOGGER.error(
+                "Could not restore settings after profile %s, retrying in %d s",
+                active["name"], RESTORE_RETRY_DELAY,
+            )
+            self._cancel = async_call_later(
+                self.hass, RESTORE_RETRY_DELAY, self._async_expired
+            )
+            return
+        self.active = None
+        self._async_save()
+        _LOGGER.info("Profile %s ended, previous settings restored", active["name"])
+        await self.coordinator.async_request_refresh()
+
+    def remaining(self) -> int:
+        """Return seconds left of the running timed profile."""
+        if self.active is None:
+            return 0
+        return max(0, int(self.active["ends_at"] - time.time()))
@@ -0,0 +1,272 @@
+"""Caching Modbus TCP proxy for Systemair Topvex.
+
+Other Modbus clients (a BMS, a commissioning laptop) connect here instead of
+to the controller. FC03/FC04 reads inside the polled register blocks are
+answered from the coordinator's last good block reads; other ranges are read
+through the integration's client once per scan interval. The proxy is
+read-only unless writes are enabled; then FC05 coil writes and FC06/FC16/FC23
+writes to the set_setpoints registers go through the coordinator, queued and
+rate limited with its own writes, so the controller only ever sees the
+integration's connection. Other registers answer "illegal data address".
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+import time
+from typing import TYPE_CHECKING
+
+from .blocks import BLOCKS
+from .const import DEFAULT_PROXY_BIND, PRIORITY_BACKGROUND, PROXY_CACHE_SIZE
+from .setpoints import SETPOINTS
+from .transport import ModbusError
+
+if TYPE_CHECKING:
+    from .coordinator import TopvexCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+_MBAP = struct.Struct(">HHHB")  # transaction id, protocol id, length, unit id
+_REQUEST = struct.Struct(">BHH")  # function code, address, count/value
+_READ_WRITE = struct.Struct(">BHHHHB")
+
+# Modbus exception codes
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_ADDRESS = 0x02
+ILLEGAL_VALUE = 0x03
+DEVICE_FAILURE = 0x04
+TARGET_NO_RESPONSE = 0x0B
+
+# Holding registers proxy clients may write, when writes are enabled
+WRITABLE_REGISTERS = frozenset(setpoint.address for setpoint in SETPOINTS.values())
+
+
+class _ProxyException(Exception):
+    """Answer the request with a Modbus exception code."""
+
+    def __init__(self, code: int) -> None:
+        super().__init__(f"exception code {code}")
+        self.code = code
+
+
+def _registers_pdu(function: int, registers: list[int]) -> bytes:
+    return struct.pack(
+        f">BB{len(registers)}H", function, 2 * len(registers), *registers
+    )
+
+
+class ModbusProxyServer:
+    """Serve one Topvex to other Modbus TCP clients from the coordinator."""
+
+    def __init__(
+        self,
+        coordinator: TopvexCoordinator,
+        port: int,
+        host: str = DEFAULT_PROXY_BIND,
+        writable: bool = False,
+    ) -> None:
+        self.coordinator = coordinator
+        self.port = port
+        self.host = host
+        self.writable = writable
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        # Client writes are applied one at a time, in arrival order
+        self._write_lock = asyncio.Lock()
+        # Reads outside the polled blocks, oldest first, at most
+        # PROXY_CACHE_SIZE: (table, address, count) -> (time.monotonic(), registers)
+        self._cache: dict[tuple[str, int, int], tuple[float, list]] = {}
+        self.stats = {
+            "connections": 0,
+            "cached_reads": 0,
+            "forwarded_reads": 0,
+            "writes": 0,
+            "exceptions": 0,
+        }
+
+    async def async_start(self) -> bool:
+        """Start listening. Returns False if the port cannot be bound."""
+        try:
+            self._server = await asyncio.start_server(
+                self._handle_connection, host=self.host, port=self.port
+            )
+        except OSError as err:
+            _LOGGER.error(
+                "Cannot start Modbus proxy on %s:%d: %s", self.host, self.port, err
+            )
+            return False
+        _LOGGER.info(
+            "Modbus proxy listening on %s:%d (%s)",
+            self.host, self.port, "read-write" if self.writable else "read-only",
+        )
+        return True
+
+    def close(self) -> None:
+        """Stop listening, close client connections and drop the cache."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for writer in self._writers:
+            writer.close()
+        self._writers.clear()
+        self._cache.clear()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer requests on one client connection in order."""
+        self.stats["connections"] += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                header = await reader.readexactly(_MBAP.size)
+                tid, protocol, length, unit_id = _MBAP.unpack(header)
+                if protocol != 0 or length < 2:
+                    break
+                pdu = await reader.readexactly(length - 1)
+                try:
+                    response = await self._handle_request(pdu)
+                except _ProxyException as err:
+                    self.stats["exceptions"] += 1
+                    response = bytes((pdu[0] | 0x80, err.code))
+                except struct.error:
+                    self.stats["exceptions"] += 1
+                    response = bytes((pdu[0] | 0x80, ILLEGAL_VALUE))
+                except ModbusError as err:
+                    _LOGGER.debug("Proxy request failed: %s", err)
+                    self.stats["exceptions"] += 1
+                    response = bytes((pdu[0] | 0x80, DEVICE_FAILURE))
+                writer.write(
+                    _MBAP.pack(tid, 0, len(response) + 1, unit_id) + response
+                )
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _handle_request(self, pdu: bytes) -> bytes:
+        """Return the response PDU for a request PDU."""
+        function = pdu[0]
+        if function in (0x03, 0x04):
+            _, address, count = _REQUEST.unpack_from(pdu)
+            table = "hr" if function == 0x03 else "ir"
+            return _registers_pdu(function, await self._read(table, address, count))
+        if not self.writable:
+            raise _ProxyException(ILLEGAL_FUNCTION)
+        if function == 0x06:
+            _, address, value = _REQUEST.unpack_from(pdu)
+            await self._write({address: value})
+            return pdu[:5]
+        if function == 0x10:
+            _, address, count = _REQUEST.unpack_from(pdu)
+            if not 1 <= count <= 123:
+                raise _ProxyException(ILLEGAL_VALUE)
+            values = struct.unpack_from(f">{count}H", pdu, 6)
+            await self._write(dict(zip(range(address, address + count), values)))
+            return pdu[:5]
+        if function == 0x05:
+            _, address, value = _REQUEST.unpack_from(pdu)
+            if value not in (0, 0xFF00):
+                raise _ProxyException(ILLEGAL_VALUE)
+            self.stats["writes"] += 1
+            async with self._write_lock:
+                written = await self.coordinator.client.write_coil(
+                    address, bool(value)
+                )
+            if not written:
+                raise _ProxyException(DEVICE_FAILURE)
+            return pdu[:5]
+        if function == 0x17:
+            (_, read_address, read_count, write_address, write_count,
+             _) = _READ_WRITE.unpack_from(pdu)
+            if not 1 <= write_count <= 121:
+                raise _ProxyException(ILLEGAL_VALUE)
+            values = struct.unpack_from(f">{write_count}H", pdu, _READ_WRITE.size)
+            await self._write(
+                dict(zip(range(write_address, write_address + write_count), values))
+            )
+            return _registers_pdu(
+                function, await self._read("hr", read_address, read_count)
+            )
+        raise _ProxyException(ILLEGAL_FUNCTION)
+
+    async def _read(self, table: str, address: int, count: int) -> list[int]:
+        """Return registers from the block cache, or read them once per poll."""
+        if not 1 <= count <= 125:
+            raise _ProxyException(ILLEGAL_VALUE)
+        registers = self._from_blocks(table, address, count)
+        if registers is not None:
+            self.stats["cached_reads"] += 1
+        else:
+            registers = await self._forward_read(table, address, count)
+        if None in registers:
+            raise _ProxyException(ILLEGAL_ADDRESS)
+        return registers
+
+    def _from_blocks(self, table: str, address: int, count: int) -> list | None:
+        """Return the range from the last good block reads, if all covered."""
+        registers = []
+        for offset in range(count):
+            for block in BLOCKS:
+                index = address + offset - block.start
+                state = self.coordinator.blocks[block.key]
+                if (
+                    block.table == table
+                    and 0 <= index < block.count
+                    and state.registers is not None
+                ):
+                    registers.append(state.registers[index])
+                    break
+            else:
+                return None
+        return registers
+
+    async def _forward_read(self, table: str, address: int, count: int) -> list:
+        """Read a range outside the blocks, reusing it for one scan interval.
+
+        Read as requested, in max_registers batches behind the poll, without
+        bisection: an unmapped address fails the read rather than costing
+        a request per register, as in the diagnostics snapshot.
+        """
+        key = (table, address, count)
+        max_age = self.coordinator.update_interval.total_seconds()
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            self.stats["cached_reads"] += 1
+            return cached[1]
+        self.stats["forwarded_reads"] += 1
+        client = self.coordinator.client
+        read = (
+            client.read_input_registers if table == "ir"
+            else client.read_holding_registers
+        )
+        registers = []
+        for start in range(address, address + count, client.max_registers):
+            batch = await read(
+                start,
+                min(client.max_registers, address + count - start),
+                PRIORITY_BACKGROUND,
+            )
+            if batch is None:
+                raise _ProxyException(TARGET_NO_RESPONSE)
+            registers.extend(batch)
+        # Re-inserted at the end, so the first key is always the oldest
+        self._cache.pop(key, None)
+        self._cache[key] = (time.monotonic(), registers)
+        while len(self._cache) > PROXY_CACHE_SIZE:
+            del self._cache[next(iter(self._cache))]
+        return registers
+
+    async def _write(self, writes: dict[int, int]) -> None:
+        """Write holding registers through the coordinator."""
+        if not WRITABLE_REGISTERS.issuperset(writes):
+            raise _ProxyException(ILLEGAL_ADDRESS)
+        self.stats["writes"] += 1
+        async with self._write_lock:
+            # Forwarded holding register reads may now be out of date
+            for key in [k for k in self._cache if k[0] == "hr"]:
+                del self._cache[key]
+            if await self.coordinator.async_write_verified(writes) < 0:
+                raise _ProxyException(DEVICE_FAILURE)
@@ -0,0 +1,93 @@
+"""Token-bucket request rate limiting for Systemair Topvex."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Allow `rate` requests per second with bursts of up to `burst`.
+
+    A request that finds the bucket empty still takes its token, leaving the
+    bucket in debt, and is told how long to wait. Concurrent callers are
+    therefore spaced out in arrival order without a lock.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._stamp = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token. Returns the seconds to wait before using it."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._stamp) * self.rate
+        )
+        self._stamp = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Read and write budgets for one device, plus its gateway's budgets.
+
+    Gateway buckets are shared by every device behind the same host:port.
+    They leave the cache when the last limiter using them is released, and
+    a released limiter rejoins on its next request.
+    """
+
+    _gateways: dict[tuple[str, int], dict[str, TokenBucket]] = {}
+    _users: dict[tuple[str, int], int] = {}
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        device: dict[str, tuple[float, float]],
+        gateway: dict[str, tuple[float, float]],
+    ) -> None:
+        self._device = {kind: TokenBucket(*limit) for kind, limit in device.items()}
+        self._key = (host, port)
+        self._gateway_limits = gateway
+        self._gateway: dict[str, TokenBucket] | None = None
+        self._join()
+        self.stats: dict[str, float] = {
+            "reads": 0,
+            "writes": 0,
+            "throttled_reads": 0,
+            "throttled_writes": 0,
+            "throttle_wait_s": 0.0,
+        }
+
+    def _join(self) -> None:
+        self._gateway = self._gateways.setdefault(
+            self._key,
+            {kind: TokenBucket(*limit) for kind, limit in self._gateway_limits.items()},
+        )
+        self._users[self._key] = self._users.get(self._key, 0) + 1
+
+    def release(self) -> None:
+        """Stop using the gateway buckets, dropping them if no one else does."""
+        if self._gateway is None:
+            return
+        self._gateway = None
+        self._users[self._key] -= 1
+        if not self._users[self._key]:
+            del self._users[self._key]
+            del self._gateways[self._key]
+
+    async def acquire(self, kind: str) -> float:
+        """Wait for a "read" or "write" slot. Returns the seconds waited."""
+        if self._gateway is None:
+            self._join()
+        delay = max(self._device[kind].reserve(), self._gateway[kind].reserve())
+        self.stats[f"{kind}s"] += 1
+        if delay > 0:
+            self.stats[f"throttled_{kind}s"] += 1
+            self.stats["throttle_wait_s"] = round(
+                self.stats["throttle_wait_s"] + delay, 3
+            )
+            await asyncio.sleep(delay)
+        return delay
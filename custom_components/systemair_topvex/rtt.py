@@ -0,0 +1,75 @@
+"""Round-trip time tracking and adaptive read timeouts for Systemair Topvex.
+
+Every answered read adds its duration to a window of recent samples. The
+read timeout is the window's 99th percentile times RTT_TIMEOUT_FACTOR,
+clamped to RTT_TIMEOUT_MIN..RTT_TIMEOUT_MAX, so an unresponsive block costs
+a few round-trips instead of the full ceiling. Each consecutive timeout
+doubles it (up to the ceiling), so a gateway that has become slower is not
+cut off for good.
+"""
+from __future__ import annotations
+
+from collections import deque
+
+from .const import (
+    RTT_MIN_SAMPLES,
+    RTT_SAMPLES,
+    RTT_TIMEOUT_FACTOR,
+    RTT_TIMEOUT_MAX,
+    RTT_TIMEOUT_MIN,
+)
+
+
+class RttTracker:
+    """Recent round-trip times of one device and the timeout they imply."""
+
+    def __init__(self, size: int = RTT_SAMPLES) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self._sorted: list[float] | None = None
+        self._backoff = 1
+        self.timeouts = 0
+        self.retries = 0
+
+    def add(self, seconds: float) -> None:
+        """Record an answered request."""
+        self._samples.append(seconds)
+        self._sorted = None
+        self._backoff = 1
+
+    def timed_out(self) -> None:
+        """Record a request that got no answer within `timeout`."""
+        self.timeouts += 1
+        self._backoff = min(2 * self._backoff, 64)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return a percentile of the window, or None while it is too small."""
+        if len(self._samples) < RTT_MIN_SAMPLES:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        index = min(len(self._sorted) - 1, int(fraction * len(self._sorted)))
+        return self._sorted[index]
+
+    @property
+    def timeout(self) -> float:
+        """Return the timeout for the next read."""
+        p99 = self.percentile(0.99)
+        if p99 is None:
+            return RTT_TIMEOUT_MAX
+        return min(
+            RTT_TIMEOUT_MAX,
+            max(RTT_TIMEOUT_MIN, p99 * RTT_TIMEOUT_FACTOR) * self._backoff,
+        )
+
+    def as_dict(self) -> dict:
+        """Return the current estimate for diagnostics."""
+        p50 = self.percentile(0.5)
+        p99 = self.percentile(0.99)
+        return {
+            "samples": len(self._samples),
+            "p50_ms": None if p50 is None else round(p50 * 1000, 1),
+            "p99_ms": None if p99 is None else round(p99 * 1000, 1),
+            "timeout_s": round(self.timeout, 3),
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+        }
@@ -0,0 +1,267 @@
+"""Modbus RTU transports for Systemair Topvex.
+
+RTU frames (unit id, PDU, CRC16) go either over an RS-485 serial port or
+through an RTU-over-TCP converter. Both are a bus shared by every unit id
+on it, so a `RtuBus` per port serialises requests across all clients on
+that bus and keeps the 3.5 character silent interval between frames.
+Clients queue at most one request each (`max_in_flight = 1`), so units on
+one bus take turns and a write waits for at most one request per unit.
+
+Serial ports need pyserial-asyncio-fast, imported only when one is opened.
+"""
+from __future__ import annotations
+
+from array import array
+import asyncio
+import logging
+
+from .const import MAX_REGISTERS_PER_REQUEST, RTU_MAX_READ_TIME
+from .transport import ModbusError, ModbusRequests
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bits per character: start, 8 data, parity or second stop, stop. The RTU
+# spec requires 2 stop bits without parity so a character is always 11 bits.
+_CHAR_BITS = 11
+
+
+def _crc_table() -> array:
+    table = array("H")
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def crc16(frame: bytes) -> int:
+    """Return the Modbus RTU CRC of a frame."""
+    crc = 0xFFFF
+    for byte in frame:
+        crc = (crc >> 8) ^ _CRC_TABLE[(crc ^ byte) & 0xFF]
+    return crc
+
+
+class RtuBus:
+    """One RS-485 bus, reached by serial port or RTU-over-TCP converter.
+
+    Buses are shared by key: every transport for the same port (or
+    converter host:port) uses one connection and one lock. A bus leaves
+    the cache when its last user leaves, so the next connect (e.g. after
+    the baud rate or parity is changed) opens it with current settings.
+    """
+
+    _buses: dict[str, RtuBus] = {}
+
+    def __init__(
+        self,
+        key: str,
+        baudrate: int,
+        parity: str = "N",
+        host: str | None = None,
+        port: int | None = None,
+    ) -> None:
+        self.key = key
+        self.baudrate = baudrate
+        self.parity = parity
+        self.host = host  # RTU-over-TCP converter; serial port otherwise
+        self.port = port
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+        self._users = 0
+        self._idle_since = 0.0
+        self._dirty = False  # a partial or late frame may be in the buffer
+        char_time = _CHAR_BITS / baudrate
+        # Above 19200 baud the spec fixes the silent interval at 1.75 ms
+        self.silent_interval = 0.00175 if baudrate > 19200 else 3.5 * char_time
+        # Largest read whose response fits in RTU_MAX_READ_TIME on the wire
+        self.max_registers = max(
+            1,
+            min(
+                MAX_REGISTERS_PER_REQUEST,
+                (int(RTU_MAX_READ_TIME / char_time) - 5) // 2,
+            ),
+        )
+
+    @classmethod
+    def serial(cls, device: str, baudrate: int, parity: str = "N") -> RtuBus:
+        """Return the shared bus on a serial port."""
+        bus = cls._buses.get(device)
+        if bus is None:
+            bus = cls._buses[device] = cls(device, baudrate, parity)
+        return bus
+
+    @classmethod
+    def tcp(cls, host: str, port: int, baudrate: int) -> RtuBus:
+        """Return the shared bus behind an RTU-over-TCP converter."""
+        key = f"{host}:{port}"
+        bus = cls._buses.get(key)
+        if bus is None:
+            bus = cls._buses[key] = cls(key, baudrate, host=host, port=port)
+        return bus
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the port or converter connection is open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    @property
+    def users(self) -> int:
+        """Return the number of transports on the bus."""
+        return self._users
+
+    async def acquire(self, timeout: float) -> bool:
+        """Register a user, opening the connection if needed."""
+        async with self._lock:
+            # Rejoining after the last user left: share this bus again
+            self._buses.setdefault(self.key, self)
+            if not self.connected:
+                try:
+                    self._reader, self._writer = await asyncio.wait_for(
+                        self._open(), timeout
+                    )
+                except (OSError, asyncio.TimeoutError) as err:
+                    _LOGGER.debug("Cannot open RTU bus %s: %s", self.key, err)
+                    return False
+                self._dirty = False
+            self._users += 1
+            return True
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self.host is not None:
+            return await asyncio.open_connection(self.host, self.port)
+        from serial_asyncio_fast import open_serial_connection
+
+        return await open_serial_connection(
+            url=self.key,
+            baudrate=self.baudrate,
+            bytesize=8,
+            parity=self.parity,
+            stopbits=2 if self.parity == "N" else 1,
+        )
+
+    def release(self) -> None:
+        """Drop a user, closing the connection when none are left."""
+        self._users = max(0, self._users - 1)
+        if self._users:
+            return
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = self._reader = None
+        if self._buses.get(self.key) is self:
+            del self._buses[self.key]
+
+    async def request(self, unit_id: int, pdu: bytes, timeout: float) -> bytes:
+        """Send one RTU frame and return the response PDU."""
+        async with self._lock:
+            if not self.connected:
+                raise ModbusError(f"RTU bus {self.key} is not open")
+            loop = asyncio.get_running_loop()
+            if self._dirty:
+                await self._drain()
+            wait = self._idle_since + self.silent_interval - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            frame = bytes((unit_id,)) + pdu
+            self._writer.write(frame + crc16(frame).to_bytes(2, "little"))
+            try:
+                response = await asyncio.wait_for(self._read_frame(), timeout)
+            except asyncio.TimeoutError as err:
+                self._dirty = True
+                raise ModbusError(f"FC{pdu[0]:02d} timed out") from err
+            except asyncio.CancelledError:
+                # The client's own (adaptive) timeout; the answer may follow
+                self._dirty = True
+                raise
+            except (asyncio.IncompleteReadError, OSError) as err:
+                self._writer.close()
+                raise ModbusError(f"RTU bus {self.key} closed: {err}") from err
+            finally:
+                self._idle_since = loop.time()
+            if crc16(response[:-2]) != int.from_bytes(response[-2:], "little"):
+                self._dirty = True
+                raise ModbusError(f"FC{pdu[0]:02d} response failed CRC check")
+            if response[0] != unit_id:
+                self._dirty = True
+                raise ModbusError(f"Response from unit {response[0]}, not {unit_id}")
+            return response[1:-2]
+
+    async def _read_frame(self) -> bytes:
+        """Read one response frame, sized from its function code."""
+        head = await self._reader.readexactly(2)
+        if head[1] & 0x80:
+            return head + await self._reader.readexactly(3)
+        if head[1] in (0x01, 0x02, 0x03, 0x04, 0x17):
+            size = await self._reader.readexactly(1)
+            return head + size + await self._reader.readexactly(size[0] + 2)
+        # FC05/06/16 echo address and value or count
+        return head + await self._reader.readexactly(6)
+
+    async def _drain(self) -> None:
+        """Discard bytes left over from a failed exchange."""
+        while True:
+            try:
+                if not await asyncio.wait_for(
+                    self._reader.read(256), 4 * self.silent_interval + 0.05
+                ):
+                    break  # end of stream
+            except asyncio.TimeoutError:
+                break
+        self._dirty = False
+
+
+class ModbusRtuTransport(ModbusRequests):
+    """Modbus RTU client for one unit id on a shared `RtuBus`."""
+
+    # The bus carries one frame at a time
+    max_in_flight = 1
+
+    def __init__(self, bus: RtuBus, timeout: float = 5) -> None:
+        self.bus = bus
+        self.timeout = timeout
+        self.max_registers = bus.max_registers
+        self._open = False
+
+    async def connect(self) -> bool:
+        """Join the bus, opening it if this is its first user."""
+        if self._open and not self.bus.connected:
+            self.close()  # the bus was closed after an error; rejoin
+        if not self._open:
+            self._open = await self.bus.acquire(self.timeout)
+        return self._open
+
+    def close(self) -> None:
+        """Leave the bus."""
+        if self._open:
+            self._open = False
+            self.bus.release()
+
+    @property
+    def connected(self) -> bool:
+        """Return True if joined to an open bus."""
+        return self._open and self.bus.connected
+
+    @property
+    def adaptive_timeout(self) -> bool:
+        """Return False while other units share the bus.
+
+        The client times a whole request, including the wait for the bus
+        lock while other units' frames are on the wire, so its RTT-based
+        timeout would cut reads short. Those keep the bus's own timeout,
+        which only covers the exchange.
+        """
+        return self.bus.users <= 1
+
+    async def request(
+        self, unit_id: int, pdu: bytes, timeout: float | None = None
+    ) -> bytes:
+        """Send a PDU on the bus and return the response PDU."""
+        if not self.connected:
+            raise ModbusError("Not connected")
+        response = await self.bus.request(unit_id, pdu, timeout or self.timeout)
+        return self.check_response(pdu, response)
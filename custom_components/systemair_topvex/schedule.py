@@ -0,0 +1,181 @@
+"""Weekly ventilation schedule for Systemair Topvex.
+
+The timetable is a list of transitions, each on some weekdays at a local
+time, applying either a profile or a set of setpoints. One timer runs per
+unit, set for the next transition. A transition missed while Home Assistant
+was down is applied on the next load, and one that cannot be written is
+retried until it is written or the next transition is due. During a timed
+profile (such as kitchen boost), registers the profile holds are left to
+its restore.
+"""
+from __future__ import annotations
+
+from datetime import datetime, time as dt_time, timedelta
+from functools import partial
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .setpoints import encode_setpoints
+
+if TYPE_CHECKING:
+    from .coordinator import TopvexCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+RETRY_DELAY = 60
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+class ScheduleEngine:
+    """Applies a weekly timetable of profiles and setpoints to one Topvex.
+
+    Entries are stored as {"days": [0-6], "time": "HH:MM", "profile": name}
+    or {"days": ..., "time": ..., "values": {setpoint: value}}; Monday is 0.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: TopvexCoordinator, entry_id: str
+    ) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.schedule"
+        )
+        self.entries: list[dict] = []
+        self.enabled = True
+        # time.time() of the last transition applied, to catch up on restart
+        self._last_applied: float = 0
+        self._unsub: callback | None = None
+        self._unsub_retry: callback | None = None
+        self.next_transition: tuple[datetime, dict] | None = None
+
+    async def async_load(self) -> None:
+        """Load the timetable, apply a missed transition and start the timer."""
+        stored = await self._store.async_load() or {}
+        self.entries = stored.get("entries", [])
+        self.enabled = stored.get("enabled", True)
+        self._last_applied = stored.get("last_applied", 0)
+        if not self.enabled or not self.entries:
+            return
+        previous = self._transition(dt_util.now(), -1)
+        if previous and previous[0].timestamp() > self._last_applied:
+            _LOGGER.info(
+                "Applying schedule transition missed at %s", previous[0].isoformat()
+            )
+            self.hass.async_create_task(self._async_apply(*previous))
+        self._schedule_next()
+
+    @callback
+    def async_unload(self) -> None:
+        """Stop the timer."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        self._cancel_retry()
+
+    @callback
+    def _cancel_retry(self) -> None:
+        if self._unsub_retry:
+            self._unsub_retry()
+            self._unsub_retry = None
+
+    @callback
+    def async_set_schedule(self, entries: list[dict], enabled: bool = True) -> None:
+        """Replace the timetable. Transitions already past are not applied."""
+        self.entries = entries
+        self.enabled = enabled
+        self._last_applied = dt_util.now().timestamp()
+        self._async_save()
+        self.async_unload()
+        self._schedule_next()
+
+    @callback
+    def _async_save(self) -> None:
+        self._store.async_delay_save(
+            lambda: {
+                "entries": self.entries,
+                "enabled": self.enabled,
+                "last_applied": self._last_applied,
+            },
+            1,
+        )
+
+    def _transition(
+        self, now: datetime, direction: int
+    ) -> tuple[datetime, dict] | None:
+        """Return the next (direction=1) or last (-1) transition around now."""
+        best: tuple[datetime, dict] | None = None
+        for offset in range(8):
+            day = now.date() + timedelta(days=offset * direction)
+            for entry in self.entries:
+                if day.weekday() not in entry["days"]:
+                    continue
+                at = datetime.combine(
+                    day, dt_time.fromisoformat(entry["time"]), tzinfo=now.tzinfo
+                )
+                if direction > 0 and at > now and (best is None or at < best[0]):
+                    best = (at, entry)
+                if direction < 0 and at <= now and (best is None or at > best[0]):
+                    best = (at, entry)
+            if best is not None:
+                return best
+        return None
+
+    @callback
+    def _schedule_next(self) -> None:
+        self.next_transition = None
+        if not self.enabled or not self.entries:
+            return
+        self.next_transition = self._transition(dt_util.now(), 1)
+        if self.next_transition is None:
+            return
+        self._unsub = async_track_point_in_time(
+            self.hass, self._async_fire, self.next_transition[0]
+        )
+
+    async def _async_fire(self, _now=None) -> None:
+        self._unsub = None
+        self._cancel_retry()  # superseded by this transition
+        at, entry = self.next_transition
+        self._schedule_next()
+        await self._async_apply(at, entry)
+
+    async def _async_apply(self, at: datetime, entry: dict) -> None:
+        """Apply one transition, writing only registers that differ."""
+        profiles = self.coordinator.profiles
+        if "profile" in entry:
+            name = entry["profile"]
+            if name not in profiles.profiles:
+                _LOGGER.warning("Scheduled profile %s does not exist", name)
+                return
+            writes = profiles.profiles[name]
+        else:
+            writes, errors = encode_setpoints(entry["values"], self.coordinator.data)
+            if errors:
+                _LOGGER.warning("Skipping schedule entry: %s", "; ".join(errors))
+                return
+        result = await self.coordinator.async_write_verified(profiles.defer(writes))
+        if result < 0:
+            _LOGGER.warning(
+                "Could not apply schedule transition at %s, retrying in %d s",
+                at.isoformat(), RETRY_DELAY,
+            )
+            self._unsub_retry = async_call_later(
+                self.hass, RETRY_DELAY, partial(self._async_retry, at, entry)
+            )
+            return
+        self._last_applied = at.timestamp()
+        self._async_save()
+        _LOGGER.debug("Schedule transition at %s applied: %s", at.isoformat(), entry)
+
+    async def _async_retry(self, at: datetime, entry: dict, _now=None) -> None:
+        self._unsub_retry = None
+        await self._async_apply(at, entry)
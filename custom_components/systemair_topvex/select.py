@@ -28,6 +28,7 @@ class TopvexAhuModeSelect(TopvexEntity, SelectEntity):
 
     _attr_options = list(AHU_MODES.values())
     _attr_icon = "mdi:hvac"
+    _data_fields = ("ahu_mode",)
 
     def __init__(self, coordinator: TopvexCoordinator) -> None:
         super().__init__(coordinator, "ahu_mode", "AHU-modus")
@@ -57,6 +58,7 @@ class TopvexFanModeSelect(TopvexEntity, SelectEntity):
     ) -> None:
         super().__init__(coordinator, f"{fan_id}_mode", name)
         self._fan_id = fan_id
+        self._data_fields = (f"{fan_id}_mode",)
 
     @property
     def current_option(self) -> str | None:
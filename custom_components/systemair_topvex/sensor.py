@@ -29,6 +29,7 @@ from .entity import TopvexEntity
 class TopvexSensorDescription(SensorEntityDescription):
     """Describe a Topvex sensor."""
     value_fn: Callable[[TopvexData], float | str | None] = lambda d: None
+    data_field: str | None = None  # TopvexData field, defaults to key
 
 
 SENSORS: tuple[TopvexSensorDescription, ...] = (
@@ -147,6 +148,7 @@ SENSORS: tuple[TopvexSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=PERCENTAGE,
         suggested_display_precision=0,
+        data_field="seq_b",
         value_fn=lambda d: d.seq_b,
     ),
     TopvexSensorDescription(
@@ -230,6 +232,7 @@ class TopvexSensor(TopvexEntity, SensorEntity):
     ) -> None:
         super().__init__(coordinator, description.key, description.name)
         self.entity_description = description
+        self._data_fields = (description.data_field or description.key,)
 
     @property
     def native_value(self):
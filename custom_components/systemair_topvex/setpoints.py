@@ -0,0 +1,101 @@
+"""Writable setpoints for the set_setpoints service."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .blocks import TopvexData
+from .const import AHU_MODE_TO_VALUE, FAN_MODES, HR
+
+FAN_MODE_TO_VALUE = {v: k for k, v in FAN_MODES.items()}
+BYPASS_MODE_TO_VALUE = {"auto": 0, "manual": 1}
+
+
+@dataclass(frozen=True)
+class Setpoint:
+    """A writable holding register and how service values map onto it."""
+    address: int
+    scale: int = 1  # register = round(value * scale)
+    minimum: float | None = None
+    maximum: float | None = None
+    options: dict[str, int] | None = None  # option name -> register value
+    # TopvexData fields holding the controller's own limits
+    limit_fields: tuple[str, str] | None = None
+
+
+SETPOINTS: dict[str, Setpoint] = {
+    "ahu_mode": Setpoint(HR.AHU_MODE, options=AHU_MODE_TO_VALUE),
+    "manual_submode": Setpoint(HR.MANUAL_SUBMODE, minimum=0, maximum=5),
+    "saf_mode": Setpoint(HR.SAF_MODE, options=FAN_MODE_TO_VALUE),
+    "eaf_mode": Setpoint(HR.EAF_MODE, options=FAN_MODE_TO_VALUE),
+    "saf_manual_setpoint": Setpoint(HR.SAF_MANUAL_SETPOINT, 10, 0, 100),
+    "saf_manual_output": Setpoint(HR.SAF_MANUAL_OUTPUT, 10, 0, 100),
+    "eaf_manual_setpoint": Setpoint(HR.EAF_MANUAL_SETPOINT, 10, 0, 100),
+    "eaf_manual_output": Setpoint(HR.EAF_MANUAL_OUTPUT, 10, 0, 100),
+    "supply_setpoint": Setpoint(
+        HR.SUPPLY_SETPOINT, 10, 10, 30,
+        limit_fields=("supply_setpoint_min", "supply_setpoint_max"),
+    ),
+    "extract_setpoint": Setpoint(HR.EXTRACT_SETPOINT, 10, 10, 30),
+    "saf_flow_low": Setpoint(HR.SAF_FLOW_LOW, 10, 50, 2000),
+    "saf_flow_normal": Setpoint(HR.SAF_FLOW_NORMAL, 10, 50, 2000),
+    "saf_flow_high": Setpoint(HR.SAF_FLOW_HIGH, 10, 50, 2000),
+    "eaf_flow_low": Setpoint(HR.EAF_FLOW_LOW, 10, 50, 2000),
+    "eaf_flow_normal": Setpoint(HR.EAF_FLOW_NORMAL, 10, 50, 2000),
+    "eaf_flow_high": Setpoint(HR.EAF_FLOW_HIGH, 10, 50, 2000),
+    "saf_output_low": Setpoint(HR.SAF_OUTPUT_LOW, 10, 0, 100),
+    "saf_output_normal": Setpoint(HR.SAF_OUTPUT_NORMAL, 10, 0, 100),
+    "saf_output_high": Setpoint(HR.SAF_OUTPUT_HIGH, 10, 0, 100),
+    "eaf_output_low": Setpoint(HR.EAF_OUTPUT_LOW, 10, 0, 100),
+    "eaf_output_normal": Setpoint(HR.EAF_OUTPUT_NORMAL, 10, 0, 100),
+    "eaf_output_high": Setpoint(HR.EAF_OUTPUT_HIGH, 10, 0, 100),
+    "bypass_mode": Setpoint(HR.BYPASS_MODE, options=BYPASS_MODE_TO_VALUE),
+    "bypass_output": Setpoint(HR.BYPASS_OUTPUT, 10, 0, 100),
+}
+
+# TopvexData field read back for each setpoint, where it differs
+DATA_FIELDS = {
+    "ahu_mode": "ahu_mode_name",
+    "saf_mode": "saf_mode_name",
+    "eaf_mode": "eaf_mode_name",
+    "bypass_output": "bypass_manual_output",
+}
+
+
+def encode_setpoints(
+    values: dict, data: TopvexData | None
+) -> tuple[dict[int, int], list[str]]:
+    """Map service values to {register: raw value}.
+
+    Returns the writes and a list of validation errors. Limits come from the
+    controller (e.g. HR 590/591 for the supply setpoint) when known. An
+    `ahu_mode` of 2-5 also sets both fans to Auto unless their modes are
+    given, as `TopvexCoordinator.async_set_ahu_mode` does.
+    """
+    writes: dict[int, int] = {}
+    errors: list[str] = []
+    for name, value in values.items():
+        setpoint = SETPOINTS[name]
+        if setpoint.options is not None:
+            if value not in setpoint.options:
+                errors.append(f"{name}: unknown option {value!r}")
+                continue
+            writes[setpoint.address] = setpoint.options[value]
+            continue
+        minimum, maximum = setpoint.minimum, setpoint.maximum
+        if setpoint.limit_fields and data is not None:
+            low, high = (getattr(data, f) for f in setpoint.limit_fields)
+            minimum = low if low is not None else minimum
+            maximum = high if high is not None else maximum
+        if not minimum <= value <= maximum:
+            errors.append(f"{name}: {value} is outside {minimum}-{maximum}")
+            continue
+        writes[setpoint.address] = round(value * setpoint.scale)
+    if writes.get(HR.AHU_MODE, 0) >= 2:
+        writes.setdefault(HR.SAF_MODE, 2)
+        writes.setdefault(HR.EAF_MODE, 2)
+    return writes, errors
+
+
+def read_back(names, data: TopvexData) -> dict:
+    """Return the verified TopvexData values for the given setpoints."""
+    return {name: getattr(data, DATA_FIELDS.get(name, name)) for name in names}
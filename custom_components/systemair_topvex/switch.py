@@ -23,6 +23,9 @@ class TopvexBypassSwitch(TopvexEntity, SwitchEntity):
     """Bypass manual mode switch."""
 
     _attr_icon = "mdi:valve"
+    _data_fields = ("bypass_mode",)
+    # Live bypass output has its own sensor
+    _unrecorded_attributes = frozenset({"bypass_value"})
 
     def __init__(self, coordinator: TopvexCoordinator) -> None:
         super().__init__(coordinator, "bypass_manual", "Bypass manuell modus")
@@ -42,6 +45,7 @@ class TopvexBypassSwitch(TopvexEntity, SwitchEntity):
         return {
             "bypass_value": self.coordinator.data.seq_b,
             "bypass_manual_output": self.coordinator.data.bypass_manual_output,
+            **self._stale_attributes(),
         }
 
     async def async_turn_on(self, **kwargs) -> None:
@@ -0,0 +1,224 @@
+"""Built-in asyncio Modbus TCP transport for Systemair Topvex.
+
+A slim alternative to pymodbus covering the function codes the integration
+uses. Requests are pipelined: each gets its own MBAP transaction id, so
+several can be in flight on one connection. The function codes are encoded
+in `ModbusRequests`, which the RTU transports in rtu.py share.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from array import array
+import asyncio
+import logging
+import struct
+import sys
+
+_LOGGER = logging.getLogger(__name__)
+
+_MBAP = struct.Struct(">HHHB")  # transaction id, protocol id, length, unit id
+_REQUEST = struct.Struct(">BHH")  # function code, address, count/value
+# FC23: function code, read address, read count, write address, write count,
+# byte count, then the values
+_READ_WRITE = struct.Struct(">BHHHHB")
+_SWAP = sys.byteorder == "little"
+
+
+class ModbusError(Exception):
+    """Request failed without a Modbus answer (timeout, connection lost)."""
+
+
+class ModbusExceptionResponse(ModbusError):
+    """Device answered with a Modbus exception code."""
+
+    def __init__(self, function: int, exception_code: int) -> None:
+        super().__init__(f"FC{function:02d} exception code {exception_code}")
+        self.function = function
+        self.exception_code = exception_code
+
+
+def _payload(pdu: bytes, size: int) -> memoryview:
+    """Return the `size` data bytes after a response's byte count.
+
+    Raises ModbusError when the byte count or the payload does not match,
+    so a short or corrupt answer never passes as fewer values.
+    """
+    if len(pdu) < 2 or pdu[1] != size or len(pdu) < 2 + size:
+        raise ModbusError(
+            f"FC{pdu[0]:02d} response has {len(pdu) - 2} data bytes, expected {size}"
+        )
+    return memoryview(pdu)[2:2 + size]
+
+
+def unpack_registers(pdu: bytes, count: int) -> array:
+    """Decode the `count` registers of an FC03/FC04/FC23 response into array('H')."""
+    registers = array("H")
+    registers.frombytes(_payload(pdu, 2 * count))
+    if _SWAP:
+        registers.byteswap()
+    return registers
+
+
+class ModbusRequests(ABC):
+    """Modbus function codes on top of a `request(unit_id, pdu)` method."""
+
+    @abstractmethod
+    async def request(
+        self, unit_id: int, pdu: bytes, timeout: float | None = None
+    ) -> bytes:
+        """Send a PDU and return the response PDU."""
+
+    @staticmethod
+    def check_response(pdu: bytes, response: bytes) -> bytes:
+        """Raise for exception or mismatched responses, else return response."""
+        if response[0] == pdu[0] | 0x80:
+            raise ModbusExceptionResponse(pdu[0], response[1])
+        if response[0] != pdu[0]:
+            raise ModbusError(f"Unexpected function code {response[0]}")
+        return response
+
+    async def read_registers(
+        self, unit_id: int, function: int, address: int, count: int
+    ) -> array:
+        """Read holding (FC03) or input (FC04) registers."""
+        response = await self.request(
+            unit_id, _REQUEST.pack(function, address, count)
+        )
+        return unpack_registers(response, count)
+
+    async def read_bits(
+        self, unit_id: int, function: int, address: int, count: int
+    ) -> int:
+        """Read coils (FC01) or discrete inputs (FC02) as a bitset.
+
+        Bit n of the result is the state of `address + n`.
+        """
+        response = await self.request(
+            unit_id, _REQUEST.pack(function, address, count)
+        )
+        bits = int.from_bytes(_payload(response, (count + 7) // 8), "little")
+        return bits & ((1 << count) - 1)
+
+    async def write_register(self, unit_id: int, address: int, value: int) -> None:
+        """Write a single holding register (FC06)."""
+        await self.request(unit_id, _REQUEST.pack(0x06, address, value))
+
+    async def write_coil(self, unit_id: int, address: int, value: bool) -> None:
+        """Write a single coil (FC05)."""
+        await self.request(
+            unit_id, _REQUEST.pack(0x05, address, 0xFF00 if value else 0)
+        )
+
+    async def write_registers(
+        self, unit_id: int, address: int, values: list[int]
+    ) -> None:
+        """Write consecutive holding registers (FC16)."""
+        pdu = struct.pack(
+            f">BHHB{len(values)}H", 0x10, address, len(values), 2 * len(values),
+            *values,
+        )
+        await self.request(unit_id, pdu)
+
+    async def read_write_registers(
+        self,
+        unit_id: int,
+        read_address: int,
+        read_count: int,
+        write_address: int,
+        values: list[int],
+    ) -> array:
+        """Write holding registers, then read holding registers (FC23)."""
+        pdu = _READ_WRITE.pack(
+            0x17, read_address, read_count, write_address, len(values),
+            2 * len(values),
+        ) + struct.pack(f">{len(values)}H", *values)
+        return unpack_registers(await self.request(unit_id, pdu), read_count)
+
+
+class ModbusTcpTransport(ModbusRequests, asyncio.Protocol):
+    """Modbus TCP client speaking MBAP directly over an asyncio transport."""
+
+    # Requests the client may pipeline on one connection
+    max_in_flight = 4
+
+    def __init__(self, host: str, port: int, timeout: float = 5) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._transport: asyncio.Transport | None = None
+        self._buffer = bytearray()
+        self._pending: dict[int, asyncio.Future[bytes]] = {}
+        self._tid = 0
+
+    # --- asyncio.Protocol ---
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport  # type: ignore[assignment]
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._transport = None
+        self._buffer.clear()
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ModbusError(f"Connection lost: {exc}"))
+        self._pending.clear()
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self._buffer
+        buffer += data
+        while len(buffer) >= _MBAP.size:
+            tid, _protocol, length, _unit = _MBAP.unpack_from(buffer)
+            end = 6 + length
+            if len(buffer) < end:
+                break
+            pdu = bytes(buffer[_MBAP.size:end])
+            del buffer[:end]
+            future = self._pending.pop(tid, None)
+            if future is not None and not future.done():
+                future.set_result(pdu)
+
+    # --- Connection ---
+
+    async def connect(self) -> bool:
+        """Open the TCP connection."""
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(
+                loop.create_connection(lambda: self, self.host, self.port),
+                self.timeout,
+            )
+        except (OSError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Cannot connect to %s:%d: %s", self.host, self.port, err)
+            return False
+        return True
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    @property
+    def connected(self) -> bool:
+        """Return True if connected."""
+        return self._transport is not None and not self._transport.is_closing()
+
+    # --- Requests ---
+
+    async def request(
+        self, unit_id: int, pdu: bytes, timeout: float | None = None
+    ) -> bytes:
+        """Send a PDU and return the response PDU."""
+        if not self.connected:
+            raise ModbusError("Not connected")
+        self._tid = tid = (self._tid + 1) & 0xFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._pending[tid] = future
+        self._transport.write(_MBAP.pack(tid, 0, len(pdu) + 1, unit_id) + pdu)
+        try:
+            response = await asyncio.wait_for(future, timeout or self.timeout)
+        except asyncio.TimeoutError as err:
+            raise ModbusError(f"FC{pdu[0]:02d} timed out") from err
+        finally:
+            self._pending.pop(tid, None)
+        return self.check_response(pdu, response)
@@ -0,0 +1,101 @@
+"""Rolling in-memory trends for Systemair Topvex.
+
+Key TopvexData fields are kept for the last day at one-minute resolution in
+fixed-size `array` ring buffers, so the card can draw sparklines without
+querying the recorder. Each slot holds the mean of the polls in its minute
+as int16 tenths. The websocket API sends a range of slots packed as base64
+little-endian int16, a few kB per field for a full day. This module has no
+Home Assistant dependency.
+"""
+from __future__ import annotations
+
+from array import array
+import base64
+import sys
+import time
+
+from .blocks import TopvexData
+from .const import TREND_FIELDS, TREND_SCALE, TREND_SIZE, TREND_STEP
+
+# Slot value for minutes without a reading
+MISSING = -32768
+
+
+def _encode(value: float) -> int:
+    return max(-32767, min(32767, round(value * TREND_SCALE)))
+
+
+class TrendBuffer:
+    """Per-minute ring buffers of TREND_FIELDS for one Topvex."""
+
+    def __init__(
+        self,
+        fields: tuple[str, ...] = TREND_FIELDS,
+        size: int = TREND_SIZE,
+        step: int = TREND_STEP,
+    ) -> None:
+        self.fields = fields
+        self.size = size
+        self.step = step
+        self._series = {name: array("h", [MISSING]) * size for name in fields}
+        # Slot number (time // step) of the newest slot; None until a sample
+        self._end: int | None = None
+        # Running sums and counts for the newest slot
+        self._sums = dict.fromkeys(fields, 0.0)
+        self._counts = dict.fromkeys(fields, 0)
+
+    def add(self, data: TopvexData, now: float | None = None) -> None:
+        """Add one poll's values to the slot for its minute."""
+        slot = int((time.time() if now is None else now) // self.step)
+        if self._end is None:
+            self._end = slot
+        elif slot > self._end:
+            # Clear the slots skipped since the last sample (at most all)
+            for skipped in range(self._end + 1, min(slot, self._end + self.size) + 1):
+                for series in self._series.values():
+                    series[skipped % self.size] = MISSING
+            self._end = slot
+            self._sums = dict.fromkeys(self.fields, 0.0)
+            self._counts = dict.fromkeys(self.fields, 0)
+        # A clock stepped back keeps adding to the newest slot
+        index = self._end % self.size
+        for name, series in self._series.items():
+            value = getattr(data, name)
+            if value is None or name in data.stale_fields:
+                continue
+            self._sums[name] += value
+            self._counts[name] += 1
+            series[index] = _encode(self._sums[name] / self._counts[name])
+
+    def packed(self, since: float | None = None) -> dict:
+        """Return the slots from `since` (or the whole day) to now.
+
+        `start` is the time of the first slot returned; every series has
+        the same number of slots, `step` seconds apart, oldest first, and
+        the buffers hold `size` slots.
+        """
+        result = {
+            "start": None,
+            "step": self.step,
+            "size": self.size,
+            "scale": TREND_SCALE,
+            "missing": MISSING,
+            "series": {},
+        }
+        if self._end is None:
+            return result
+        first = self._end - self.size + 1
+        if since is not None:
+            first = max(first, int(since // self.step))
+        count = max(0, self._end - first + 1)
+        head = first % self.size
+        result["start"] = first * self.step
+        for name, series in self._series.items():
+            if head + count <= self.size:
+                values = series[head:head + count]
+            else:
+                values = series[head:] + series[:head + count - self.size]
+            if sys.byteorder == "big":
+                values.byteswap()
+            result["series"][name] = base64.b64encode(values.tobytes()).decode()
+        return result
@@ -0,0 +1,116 @@
+"""Websocket API for Systemair Topvex."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import TopvexCoordinator
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+    websocket_api.async_register_command(hass, websocket_trends)
+
+
+def _get_coordinator(
+    hass: HomeAssistant, entry_id: str | None
+) -> tuple[str, TopvexCoordinator] | tuple[None, None]:
+    """Return the coordinator for an entry, or the first one if not given."""
+    for key, coord in hass.data.get(DOMAIN, {}).items():
+        if isinstance(coord, TopvexCoordinator) and entry_id in (None, key):
+            return key, coord
+    return None, None
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): f"{DOMAIN}/subscribe",
+    vol.Optional("entry_id"): str,
+})
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send the full TopvexData snapshot, then only changed fields per poll.
+
+    When the entry is unloaded (or reloaded) the subscription ends with an
+    {"unloaded": true} event, so the card knows to subscribe again.
+    """
+    entry_id, coordinator = _get_coordinator(hass, msg.get("entry_id"))
+    if coordinator is None or coordinator.data is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Topvex unit not found"
+        )
+        return
+
+    previous = coordinator.data.as_dict()
+    remove_listener: CALLBACK_TYPE | None = None
+
+    @callback
+    def _unsubscribe() -> None:
+        nonlocal remove_listener
+        if remove_listener is not None:
+            remove_listener()
+            remove_listener = None
+
+    @callback
+    def _forward_delta() -> None:
+        nonlocal previous
+        if hass.data.get(DOMAIN, {}).get(entry_id) is not coordinator:
+            _unsubscribe()
+            connection.send_message(
+                websocket_api.event_message(msg["id"], {"unloaded": True})
+            )
+            return
+        if coordinator.data is None:
+            return
+        current = coordinator.data.as_dict()
+        delta = {
+            key: value for key, value in current.items()
+            if previous.get(key) != value
+        }
+        previous = current
+        if delta:
+            connection.send_message(
+                websocket_api.event_message(msg["id"], {"delta": delta})
+            )
+
+    remove_listener = coordinator.async_add_listener(_forward_delta)
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {
+        "entry_id": entry_id,
+        "data": previous,
+    }))
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): f"{DOMAIN}/trends",
+    vol.Optional("entry_id"): str,
+    vol.Optional("since"): vol.Coerce(float),
+})
+@callback
+def websocket_trends(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send the per-minute trends, packed, from `since` or for the last day."""
+    entry_id, coordinator = _get_coordinator(hass, msg.get("entry_id"))
+    if coordinator is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Topvex unit not found"
+        )
+        return
+    connection.send_result(msg["id"], {
+        "entry_id": entry_id,
+        **coordinator.trends.packed(msg.get("since")),
+    })
@@ -0,0 +1,26 @@
+"""Test setup for Systemair Topvex.
+
+Most of the integration (transport, framelog, rtu, ratelimit, rtt, trends,
+setpoints) has no Home Assistant dependency. When Home Assistant is not
+installed, the package is registered without running its __init__, as
+cli.py does, so those modules can be tested on their own.
+"""
+from __future__ import annotations
+
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "custom_components.systemair_topvex"
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+if importlib.util.find_spec("homeassistant") is None and PACKAGE not in sys.modules:
+    _package = importlib.util.module_from_spec(
+        importlib.machinery.ModuleSpec(PACKAGE, None, is_package=True)
+    )
+    _package.__path__ = [os.path.join(ROOT, "custom_components", "systemair_topvex")]
+    sys.modules[PACKAGE] = _package
@@ -0,0 +1,100 @@
+"""Tests for TopvexCoordinator register writes. Needs Home Assistant."""
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from custom_components.systemair_topvex.blocks import BLOCKS, TopvexData  # noqa: E402
+from custom_components.systemair_topvex.const import HR  # noqa: E402
+from custom_components.systemair_topvex.coordinator import (  # noqa: E402
+    TopvexCoordinator,
+)
+
+pytestmark = pytest.mark.asyncio
+
+KITCHEN = {
+    HR.AHU_MODE: 5,
+    HR.SAF_MODE: 2,
+    HR.EAF_MODE: 2,
+    HR.SAF_FLOW_HIGH: 3000,
+    HR.EAF_FLOW_HIGH: 1500,
+}
+
+
+class FakeClient:
+    """Record writes against a holding register map of zeros."""
+
+    max_registers = 47
+
+    def __init__(self) -> None:
+        self.registers: dict[int, int] = {}
+        self.calls: list[tuple] = []
+
+    async def write_register(self, address, value):
+        self.calls.append(("write", address, [value]))
+        self.registers[address] = value
+        return True
+
+    async def write_registers(self, address, values):
+        self.calls.append(("write", address, list(values)))
+        self.registers.update(zip(range(address, address + len(values)), values))
+        return True
+
+    async def write_and_verify(self, address, values, read_address, read_count):
+        self.calls.append(("verify", address, list(values)))
+        self.registers.update(zip(range(address, address + len(values)), values))
+        return [
+            self.registers.get(a, 0)
+            for a in range(read_address, read_address + read_count)
+        ]
+
+
+@pytest.fixture
+def coordinator(hass):
+    coordinator = TopvexCoordinator(hass, FakeClient(), 10)
+    coordinator.data = TopvexData()
+    for block in BLOCKS:
+        state = coordinator.blocks[block.key]
+        state.ok = True
+        state.registers = [0] * block.count
+    return coordinator
+
+
+async def test_runs_are_grouped_per_block(coordinator):
+    assert await coordinator.async_write_verified(KITCHEN) == 5
+    # Each block's last run is written with its read-back
+    assert coordinator.client.calls == [
+        ("write", HR.AHU_MODE, [5]),
+        ("write", HR.SAF_MODE, [2]),
+        ("verify", HR.EAF_MODE, [2]),
+        ("write", HR.SAF_FLOW_HIGH, [3000]),
+        ("verify", HR.EAF_FLOW_HIGH, [1500]),
+    ]
+    assert coordinator.data.ahu_mode == 5
+
+
+async def test_consecutive_registers_share_a_write(coordinator):
+    writes = {HR.SAF_FLOW_LOW: 500, HR.SAF_FLOW_LOW + 1: 600}
+    assert await coordinator.async_write_verified(writes) == 1
+    assert coordinator.client.calls == [("verify", HR.SAF_FLOW_LOW, [500, 600])]
+
+
+async def test_unchanged_registers_are_elided(coordinator):
+    await coordinator.async_write_verified(KITCHEN)
+    coordinator.client.calls.clear()
+
+    assert await coordinator.async_write_verified(KITCHEN) == 0
+    assert coordinator.client.calls == []
+    assert coordinator.write_stats["elided"] == len(KITCHEN)
+
+    assert await coordinator.async_write_verified({HR.AHU_MODE: 5}, force=True) == 1
+
+
+async def test_no_elision_after_a_failed_read(coordinator):
+    await coordinator.async_write_verified({HR.AHU_MODE: 5})
+    coordinator.blocks["modes"].ok = False
+    coordinator.client.calls.clear()
+
+    assert await coordinator.async_write_verified({HR.AHU_MODE: 5}) == 1
+    assert coordinator.client.calls == [("verify", HR.AHU_MODE, [5])]
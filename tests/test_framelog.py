@@ -0,0 +1,108 @@
+"""Tests for the frame log and its replay transport."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.systemair_topvex.framelog import (
+    FrameLogReader,
+    FrameLogWriter,
+    ReplayTransport,
+)
+from custom_components.systemair_topvex.transport import (
+    ModbusError,
+    ModbusExceptionResponse,
+)
+
+
+def _write(path, frames) -> None:
+    writer = FrameLogWriter(str(path))
+    for frame in frames:
+        writer.record(*frame)
+    writer.flush()
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "log.frames"
+    _write(path, [
+        (0x04, 290, 3, [1, 2, 65535], 100.0),
+        (0x03, 565, 2, None, 101.0),
+    ])
+    reader = FrameLogReader(str(path))
+    frames = list(reader)
+    reader.close()
+
+    assert len(frames) == 2
+    assert (frames[0].function, frames[0].address, frames[0].count) == (4, 290, 3)
+    assert list(frames[0].registers) == [1, 2, 65535]
+    assert frames[0].timestamp == 100.0
+    assert not frames[0].rejected
+    assert frames[1].rejected
+    assert list(frames[1].registers) == []
+
+
+def test_flush_appends(tmp_path):
+    path = tmp_path / "log.frames"
+    _write(path, [(0x04, 290, 1, [7], 1.0)])
+    _write(path, [(0x04, 290, 1, [8], 2.0)])
+    reader = FrameLogReader(str(path))
+    assert [list(frame.registers) for frame in reader] == [[7], [8]]
+    reader.close()
+
+
+def test_full_log_is_rotated(tmp_path):
+    path = tmp_path / "log.frames"
+    writer = FrameLogWriter(str(path), max_bytes=64)
+    writer.record(0x04, 290, 10, list(range(10)), 1.0)
+    writer.flush()
+    writer.record(0x04, 290, 10, list(range(10, 20)), 2.0)
+    writer.close()
+
+    rotated = FrameLogReader(f"{path}.1")
+    current = FrameLogReader(str(path))
+    assert [list(frame.registers)[0] for frame in rotated] == [0]
+    assert [list(frame.registers)[0] for frame in current] == [10]
+    rotated.close()
+    current.close()
+
+
+def test_truncated_last_frame_is_skipped(tmp_path):
+    path = tmp_path / "log.frames"
+    _write(path, [(0x04, 290, 2, [1, 2], 1.0), (0x04, 290, 2, [3, 4], 2.0)])
+    with open(path, "r+b") as file:
+        file.truncate(path.stat().st_size - 1)
+    reader = FrameLogReader(str(path))
+    assert len(reader) == 1
+    reader.close()
+
+
+def test_not_a_frame_log(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"something else")
+    with pytest.raises(ValueError):
+        FrameLogReader(str(path))
+
+
+def test_replay_serves_frames_per_read(tmp_path):
+    path = tmp_path / "log.frames"
+    _write(path, [
+        (0x04, 290, 2, [1, 2], 1.0),
+        (0x03, 565, 1, None, 1.0),
+        (0x04, 290, 2, [3, 4], 2.0),
+    ])
+    transport = ReplayTransport(FrameLogReader(str(path)))
+
+    async def replay():
+        await transport.connect()
+        first = await transport.read_registers(1, 0x04, 290, 2)
+        with pytest.raises(ModbusExceptionResponse):
+            await transport.read_registers(1, 0x03, 565, 1)
+        second = await transport.read_registers(1, 0x04, 290, 2)
+        assert transport.exhausted
+        with pytest.raises(ModbusError):
+            await transport.read_registers(1, 0x04, 290, 2)
+        return list(first), list(second)
+
+    assert asyncio.run(replay()) == ([1, 2], [3, 4])
+    transport.reader.close()
@@ -0,0 +1,107 @@
+"""Tests for TopvexModbusClient hole learning, on a fake transport."""
+from __future__ import annotations
+
+import asyncio
+import struct
+
+from custom_components.systemair_topvex import modbus_client
+from custom_components.systemair_topvex.const import TRANSPORT_BUILTIN
+from custom_components.systemair_topvex.modbus_client import TopvexModbusClient
+from custom_components.systemair_topvex.transport import ModbusError, ModbusRequests
+
+
+class FakeTransport(ModbusRequests):
+    """Answer FC03/FC04 with register value = address, rejecting holes."""
+
+    def __init__(self, holes=(), answer: bool = True) -> None:
+        self.holes = set(holes)
+        self.answer = answer
+        self.requests: list[tuple[int, int, int]] = []
+        self._connected = False
+
+    async def connect(self) -> bool:
+        self._connected = True
+        return True
+
+    def close(self) -> None:
+        self._connected = False
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    async def request(self, unit_id, pdu, timeout=None):
+        function, address, count = struct.unpack_from(">BHH", pdu)
+        self.requests.append((function, address, count))
+        if not self.answer:
+            raise ModbusError("No answer")
+        if self.holes.intersection(range(address, address + count)):
+            response = bytes((function | 0x80, 2))
+        else:
+            response = struct.pack(
+                f">BB{count}H", function, 2 * count, *range(address, address + count)
+            )
+        return self.check_response(pdu, response)
+
+
+def _run(transport: FakeTransport, reads):
+    """Connect a client to the transport and run `reads(client)`."""
+
+    async def run():
+        client = TopvexModbusClient("fake", 0, 1, TRANSPORT_BUILTIN)
+        client.limiter.release()
+        client.limiter = None
+        client.transport_factory = lambda: transport
+        await client.connect()
+        try:
+            return await reads(client)
+        finally:
+            await client.disconnect()
+
+    return asyncio.run(run())
+
+
+def test_read_block_bisects_to_holes():
+    transport = FakeTransport(holes={103, 107})
+
+    async def reads(client):
+        first = await client.read_block("hr", 100, 10)
+        sent = len(transport.requests)
+        second = await client.read_block("hr", 100, 10)
+        return first, second, sent, client.holes
+
+    first, second, sent, holes = _run(transport, reads)
+    expected = [100, 101, 102, None, 104, 105, 106, None, 108, 109]
+    assert first == expected
+    assert second == expected
+    assert holes["hr"] == [103, 107]
+    # Known holes are planned around: three requests, none rejected
+    assert transport.requests[sent:] == [(3, 100, 3), (3, 104, 3), (3, 108, 2)]
+
+
+def test_holes_are_retested(monkeypatch):
+    transport = FakeTransport(holes={103})
+
+    async def reads(client):
+        await client.read_block("hr", 100, 10)
+        transport.holes.clear()
+        monkeypatch.setattr(modbus_client, "HOLE_RETEST_INTERVAL", -1)
+        sent = len(transport.requests)
+        block = await client.read_block("hr", 100, 10)
+        return block, sent, client.holes
+
+    block, sent, holes = _run(transport, reads)
+    assert block == list(range(100, 110))
+    assert holes["hr"] == []
+    assert transport.requests[sent:] == [(3, 100, 10)]
+
+
+def test_no_answer_is_not_a_hole():
+    transport = FakeTransport(answer=False)
+
+    async def reads(client):
+        return await client.read_block("ir", 290, 5), client.holes
+
+    block, holes = _run(transport, reads)
+    assert block is None
+    assert holes["ir"] == []
@@ -0,0 +1,49 @@
+"""Tests for the token-bucket rate limiter."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.systemair_topvex import ratelimit
+from custom_components.systemair_topvex.ratelimit import RateLimiter, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A monotonic clock the test advances by hand."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(
+        ratelimit, "time", SimpleNamespace(monotonic=lambda: now.value)
+    )
+    return now
+
+
+def test_burst_then_rate(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    # Empty: each further request waits one more interval
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+    clock.value += 1.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_refill_is_capped_at_burst(clock):
+    bucket = TokenBucket(rate=10, burst=2)
+    clock.value += 60
+    assert [bucket.reserve() for _ in range(2)] == [0, 0]
+    assert bucket.reserve() > 0
+
+
+def test_gateway_buckets_are_shared_and_released():
+    limits = {"read": (10, 20)}
+    first = RateLimiter("gateway.test", 502, limits, limits)
+    second = RateLimiter("gateway.test", 502, limits, limits)
+    assert first._gateway is second._gateway
+
+    first.release()
+    first.release()  # idempotent
+    assert ("gateway.test", 502) in RateLimiter._gateways
+    second.release()
+    assert ("gateway.test", 502) not in RateLimiter._gateways
@@ -0,0 +1,69 @@
+"""Replay a frame log through TopvexCoordinator. Needs Home Assistant."""
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from custom_components.systemair_topvex.blocks import BLOCKS  # noqa: E402
+from custom_components.systemair_topvex.const import (  # noqa: E402
+    IR,
+    MAX_REGISTERS_PER_REQUEST,
+    TRANSPORT_BUILTIN,
+)
+from custom_components.systemair_topvex.coordinator import (  # noqa: E402
+    TopvexCoordinator,
+)
+from custom_components.systemair_topvex.framelog import (  # noqa: E402
+    FrameLogReader,
+    FrameLogWriter,
+    async_replay,
+)
+from custom_components.systemair_topvex.modbus_client import (  # noqa: E402
+    TopvexModbusClient,
+)
+
+pytestmark = pytest.mark.asyncio
+
+SCAN_INTERVAL = 1
+
+
+def _record_polls(path, polls: int) -> None:
+    """Record `polls` full polls, SCAN_INTERVAL apart, outdoor temp = poll."""
+    writer = FrameLogWriter(str(path))
+    for poll in range(polls):
+        for block in BLOCKS:
+            function = 0x04 if block.table == "ir" else 0x03
+            end = block.start + block.count
+            for start in range(block.start, end, MAX_REGISTERS_PER_REQUEST):
+                count = min(MAX_REGISTERS_PER_REQUEST, end - start)
+                registers = [
+                    poll * 10 if address == IR.OUTDOOR_TEMP and function == 0x04
+                    else 0
+                    for address in range(start, start + count)
+                ]
+                writer.record(
+                    function, start, count, registers, 1000.0 + poll * SCAN_INTERVAL
+                )
+    writer.flush()
+
+
+@pytest.mark.parametrize("realtime", [False, True])
+async def test_replay_through_coordinator(hass, tmp_path, realtime):
+    path = tmp_path / "log.frames"
+    _record_polls(path, 3)
+    client = TopvexModbusClient("replay", 0, 1, TRANSPORT_BUILTIN)
+    recorder = FrameLogWriter(str(tmp_path / "live.frames"))
+    client.recorder = recorder
+    coordinator = TopvexCoordinator(hass, client, SCAN_INTERVAL)
+
+    result = await async_replay(coordinator, FrameLogReader(str(path)), realtime)
+
+    assert result["polls"] >= 3
+    assert coordinator.data.outdoor_temp == 2.0
+    # Realtime gaps must not push polls past the budget
+    assert coordinator.poll_stats["abandoned"] == 0
+    # The replay is not recorded again, and the client is put back
+    assert recorder.frames == 0
+    assert client.recorder is recorder
+    assert client.transport_factory is None
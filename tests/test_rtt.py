@@ -0,0 +1,54 @@
+"""Tests for round-trip tracking and the adaptive read timeout."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.systemair_topvex.const import (
+    RTT_MIN_SAMPLES,
+    RTT_TIMEOUT_FACTOR,
+    RTT_TIMEOUT_MAX,
+    RTT_TIMEOUT_MIN,
+)
+from custom_components.systemair_topvex.rtt import RttTracker
+
+
+def test_ceiling_until_enough_samples():
+    rtt = RttTracker()
+    for _ in range(RTT_MIN_SAMPLES - 1):
+        rtt.add(0.2)
+    assert rtt.timeout == RTT_TIMEOUT_MAX
+    rtt.add(0.2)
+    assert rtt.timeout == pytest.approx(0.2 * RTT_TIMEOUT_FACTOR)
+
+
+def test_timeout_is_clamped():
+    rtt = RttTracker()
+    for _ in range(RTT_MIN_SAMPLES):
+        rtt.add(0.001)
+    assert rtt.timeout == RTT_TIMEOUT_MIN
+    for _ in range(RTT_MIN_SAMPLES):
+        rtt.add(10)
+    assert rtt.timeout == RTT_TIMEOUT_MAX
+
+
+def test_timeouts_back_off_until_answered():
+    rtt = RttTracker()
+    for _ in range(RTT_MIN_SAMPLES):
+        rtt.add(0.2)
+    base = rtt.timeout
+    rtt.timed_out()
+    assert rtt.timeout == pytest.approx(2 * base)
+    rtt.timed_out()
+    assert rtt.timeout == pytest.approx(4 * base)
+    assert rtt.timeouts == 2
+    rtt.add(0.2)
+    assert rtt.timeout == pytest.approx(base)
+
+
+def test_percentile_window():
+    rtt = RttTracker(size=100)
+    assert rtt.percentile(0.5) is None
+    for ms in range(1, 101):
+        rtt.add(ms / 1000)
+    assert rtt.percentile(0.5) == pytest.approx(0.051)
+    assert rtt.percentile(0.99) == pytest.approx(0.1)
@@ -0,0 +1,96 @@
+"""Tests for Modbus RTU framing, over a local RTU-over-TCP server."""
+from __future__ import annotations
+
+import asyncio
+import struct
+
+import pytest
+
+from custom_components.systemair_topvex.rtu import (
+    ModbusRtuTransport,
+    RtuBus,
+    crc16,
+)
+from custom_components.systemair_topvex.transport import (
+    ModbusError,
+    ModbusExceptionResponse,
+)
+
+
+def _frame(payload: bytes) -> bytes:
+    return payload + crc16(payload).to_bytes(2, "little")
+
+
+def test_crc16():
+    # Read 10 holding registers from unit 1, the usual reference frame
+    assert _frame(bytes.fromhex("01030000000a")).hex() == "01030000000ac5cd"
+
+
+async def _serve(reader, writer, corrupt: bool) -> None:
+    """Answer FC03 with register value = address; 9999 is illegal."""
+    try:
+        while True:
+            request = await reader.readexactly(8)
+            assert crc16(request[:-2]) == int.from_bytes(request[-2:], "little")
+            unit_id, function, address, count = struct.unpack(">BBHH", request[:6])
+            if address == 9999:
+                response = _frame(bytes((unit_id, function | 0x80, 2)))
+            else:
+                response = _frame(struct.pack(
+                    f">BBB{count}H", unit_id, function, 2 * count,
+                    *range(address, address + count),
+                ))
+            if corrupt:
+                response = response[:-1] + bytes((response[-1] ^ 0xFF,))
+            writer.write(response)
+    except asyncio.IncompleteReadError:
+        writer.close()
+
+
+def _run(reads, corrupt: bool = False):
+    async def run():
+        server = await asyncio.start_server(
+            lambda r, w: _serve(r, w, corrupt), "127.0.0.1", 0
+        )
+        port = server.sockets[0].getsockname()[1]
+        bus = RtuBus.tcp("127.0.0.1", port, 19200)
+        transport = ModbusRtuTransport(bus, timeout=1)
+        assert await transport.connect()
+        try:
+            return await reads(transport)
+        finally:
+            transport.close()
+            assert f"127.0.0.1:{port}" not in RtuBus._buses
+            server.close()
+            await server.wait_closed()
+
+    return asyncio.run(run())
+
+
+def test_read_registers():
+    async def reads(transport):
+        return list(await transport.read_registers(1, 0x03, 565, 3))
+
+    assert _run(reads) == [565, 566, 567]
+
+
+def test_exception_response():
+    async def reads(transport):
+        with pytest.raises(ModbusExceptionResponse) as err:
+            await transport.read_registers(1, 0x03, 9999, 1)
+        return err.value.exception_code
+
+    assert _run(reads) == 2
+
+
+def test_bad_crc_is_rejected():
+    async def reads(transport):
+        with pytest.raises(ModbusError, match="CRC"):
+            await transport.read_registers(1, 0x03, 565, 1)
+
+    _run(reads, corrupt=True)
+
+
+def test_read_size_follows_baud_rate():
+    assert RtuBus("slow", 9600).max_registers == 41
+    assert RtuBus("fast", 19200).max_registers == 47
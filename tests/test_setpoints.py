@@ -0,0 +1,44 @@
+"""Tests for set_setpoints encoding and read-back."""
+from __future__ import annotations
+
+from custom_components.systemair_topvex.blocks import TopvexData
+from custom_components.systemair_topvex.const import HR
+from custom_components.systemair_topvex.setpoints import encode_setpoints, read_back
+
+
+def test_scaled_and_options():
+    writes, errors = encode_setpoints(
+        {"supply_setpoint": 21.5, "bypass_mode": "manual"}, None
+    )
+    assert errors == []
+    assert writes == {HR.SUPPLY_SETPOINT: 215, HR.BYPASS_MODE: 1}
+
+
+def test_errors_are_collected():
+    writes, errors = encode_setpoints(
+        {"supply_setpoint": 40, "saf_mode": "Turbo", "extract_setpoint": 22},
+        None,
+    )
+    assert writes == {HR.EXTRACT_SETPOINT: 220}
+    assert len(errors) == 2
+
+
+def test_controller_limits_apply():
+    data = TopvexData(supply_setpoint_min=15.0, supply_setpoint_max=20.0)
+    _, errors = encode_setpoints({"supply_setpoint": 22}, data)
+    assert errors == ["supply_setpoint: 22 is outside 15.0-20.0"]
+
+
+def test_ahu_mode_sets_fans_to_auto():
+    writes, _ = encode_setpoints({"ahu_mode": "Høy", "eaf_mode": "Lav"}, None)
+    assert writes == {HR.AHU_MODE: 5, HR.SAF_MODE: 2, HR.EAF_MODE: 4}
+    writes, _ = encode_setpoints({"ahu_mode": "Manuell"}, None)
+    assert writes == {HR.AHU_MODE: 1}
+
+
+def test_read_back():
+    data = TopvexData(ahu_mode_name="Auto", supply_setpoint=21.0)
+    assert read_back(["ahu_mode", "supply_setpoint"], data) == {
+        "ahu_mode": "Auto",
+        "supply_setpoint": 21.0,
+    }
@@ -0,0 +1,46 @@
+"""Tests for the in-memory trend buffers."""
+from __future__ import annotations
+
+from array import array
+import base64
+import sys
+
+from custom_components.systemair_topvex.blocks import TopvexData
+from custom_components.systemair_topvex.trends import MISSING, TrendBuffer
+
+
+def _series(packed: dict, name: str) -> list[int]:
+    values = array("h")
+    values.frombytes(base64.b64decode(packed["series"][name]))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return list(values)
+
+
+def test_slots_average_and_gaps():
+    trends = TrendBuffer(fields=("outdoor_temp",), size=5, step=60)
+    trends.add(TopvexData(outdoor_temp=1.0), now=600)
+    trends.add(TopvexData(outdoor_temp=2.0), now=630)  # same minute
+    trends.add(TopvexData(outdoor_temp=-3.5), now=720)  # one minute skipped
+
+    packed = trends.packed(since=600)
+    assert packed["start"] == 600
+    assert _series(packed, "outdoor_temp") == [15, MISSING, -35]
+
+
+def test_wraps_and_skips_stale_values():
+    trends = TrendBuffer(fields=("outdoor_temp",), size=3, step=60)
+    for minute in range(5):
+        trends.add(TopvexData(outdoor_temp=float(minute)), now=minute * 60)
+    stale = TopvexData(outdoor_temp=99.0, stale_fields={"outdoor_temp"})
+    trends.add(stale, now=5 * 60)
+
+    packed = trends.packed()
+    assert packed["start"] == 3 * 60
+    assert _series(packed, "outdoor_temp") == [30, 40, MISSING]
+
+
+def test_empty():
+    packed = TrendBuffer(fields=("outdoor_temp",)).packed()
+    assert packed["start"] is None
+    assert packed["series"] == {}
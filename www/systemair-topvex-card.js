@@ -3,11 +3,28 @@
  * SVG schematic of the ventilation unit with live data overlay and controls.
  */
 
+// Sparklines: field, label, unit, decimals
+const TRENDS = [
+  ['outdoor_temp', 'Ute', ' \u00b0C', 1],
+  ['supply_temp', 'Tilluft', ' \u00b0C', 1],
+  ['extract_temp', 'Avtrekk', ' \u00b0C', 1],
+  ['saf_flow', 'Tilluft', ' m\u00b3/h', 0],
+  ['eaf_flow', 'Avtrekk', ' m\u00b3/h', 0],
+  ['recovery_efficiency', 'Gjenvinning', ' %', 0],
+  ['filter_pressure_saf', 'Filter tilluft', ' Pa', 0],
+  ['filter_pressure_eaf', 'Filter avtrekk', ' Pa', 0],
+];
+
+// Fetch new trend slots at most this often (ms)
+const TREND_REFRESH = 60000;
+// Wait this long before subscribing again after a reload or failure (ms)
+const RESUBSCRIBE_DELAY = 5000;
+
 class SystemairTopvexCard extends HTMLElement {
   setConfig(config) {
     this.config = config;
-    this._prefix = config.entity_prefix || 'sensor.topvex_tc_c03_el_cav';
-    this._dev = this._prefix.replace('sensor.', '');
+    this._built = false;
+    this._unsubscribe();
   }
 
   set hass(hass) {
@@ -15,85 +32,202 @@ class SystemairTopvexCard extends HTMLElement {
     if (!this.shadowRoot) {
       this.attachShadow({ mode: 'open' });
     }
-    this._render();
+    if (!this._built) {
+      this._build();
+    }
+    if (!this._unsub && !this._retry) {
+      this._subscribe();
+    }
   }
 
-  _getState(entity_id, fallback) {
-    const s = this._hass.states[entity_id];
-    return s ? s.state : (fallback || '--');
+  connectedCallback() {
+    if (this._hass && !this._unsub && !this._retry) {
+      this._subscribe();
+    }
   }
 
-  _getNumState(entity_id, decimals, unit) {
-    const s = this._hass.states[entity_id];
-    if (!s || s.state === 'unknown' || s.state === 'unavailable') return '--';
-    const v = parseFloat(s.state);
-    if (isNaN(v)) return '--';
-    return v.toFixed(decimals) + (unit || '');
+  disconnectedCallback() {
+    this._unsubscribe();
+    clearTimeout(this._retry);
+    this._retry = null;
   }
 
-  _getNum(entity_id) {
-    const s = this._hass.states[entity_id];
-    if (!s || s.state === 'unknown' || s.state === 'unavailable') return null;
-    const v = parseFloat(s.state);
-    return isNaN(v) ? null : v;
+  // Data comes from the integration's websocket subscription: a full
+  // TopvexData snapshot first, then only the fields changed by each poll.
+  _subscribe() {
+    const msg = { type: 'systemair_topvex/subscribe' };
+    if (this.config.entry_id) msg.entry_id = this.config.entry_id;
+    this._data = {};
+    this._trends = null;
+    this._fetchTrends();
+    const unsub = this._hass.connection.subscribeMessage(
+      (event) => this._onMessage(event), msg,
+    );
+    this._unsub = unsub;
+    unsub.catch((err) => {
+      console.error('systemair-topvex-card: subscribe failed', err);
+      if (this._unsub === unsub) {
+        this._unsub = null;
+        this._resubscribe();
+      }
+    });
   }
 
-  _callService(domain, service, data) {
-    this._hass.callService(domain, service, data);
+  // The entry is reloading or not loaded yet: try again shortly
+  _resubscribe() {
+    clearTimeout(this._retry);
+    this._retry = setTimeout(() => {
+      this._retry = null;
+      if (this.isConnected && this._hass && !this._unsub) this._subscribe();
+    }, RESUBSCRIBE_DELAY);
+  }
+
+  _unsubscribe() {
+    if (this._unsub) {
+      this._unsub.then((unsub) => unsub()).catch(() => {});
+      this._unsub = null;
+    }
+  }
+
+  _onMessage(event) {
+    if (event.unloaded) {
+      this._unsubscribe();
+      this._resubscribe();
+      return;
+    }
+    if (event.data) {
+      this._data = event.data;
+    } else if (event.delta) {
+      Object.assign(this._data, event.delta);
+      if (Date.now() - this._trendsAt >= TREND_REFRESH) this._fetchTrends();
+    }
+    if (this._built) this._update();
   }
 
-  _setAhuMode(option) {
-    this._callService('select', 'select_option', {
-      entity_id: `select.${this._dev}_ahu_modus`,
-      option: option,
+  // Sparklines come from the integration's per-minute trend buffers, not
+  // the recorder: the whole day once, then only the slots since the last
+  // fetch.
+  _fetchTrends() {
+    if (this.config.trends === false || this._trendsPending) return;
+    const msg = { type: 'systemair_topvex/trends' };
+    if (this.config.entry_id) msg.entry_id = this.config.entry_id;
+    const trends = this._trends;
+    if (trends) msg.since = trends.start + (trends.length - 1) * trends.step;
+    this._trendsPending = true;
+    this._trendsAt = Date.now();
+    this._hass.connection.sendMessagePromise(msg).then((result) => {
+      this._mergeTrends(result);
+      if (this._built) this._drawTrends();
+    }).catch((err) => {
+      console.error('systemair-topvex-card: trends failed', err);
+    }).finally(() => {
+      this._trendsPending = false;
     });
   }
 
-  _setNumber(entityId, value) {
-    this._callService('number', 'set_value', {
-      entity_id: entityId,
-      value: value,
+  // Unpack base64 little-endian int16 slots
+  _unpack(packed) {
+    const bytes = atob(packed);
+    const view = new DataView(Uint8Array.from(bytes, (c) => c.charCodeAt(0)).buffer);
+    const values = new Int16Array(bytes.length / 2);
+    for (let i = 0; i < values.length; i++) values[i] = view.getInt16(2 * i, true);
+    return values;
+  }
+
+  // Replace the slots from result.start on, keeping at most result.size
+  _mergeTrends(result) {
+    if (result.start === null) return;
+    const fresh = {};
+    let length = 0;
+    for (const [field, packed] of Object.entries(result.series)) {
+      fresh[field] = this._unpack(packed);
+      length = fresh[field].length;
+    }
+    const old = this._trends;
+    const offset = old ? Math.round((result.start - old.start) / old.step) : -1;
+    if (!old || offset < 0 || offset >= result.size) {
+      this._trends = Object.assign({}, result, { length, series: fresh });
+      return;
+    }
+    const total = offset + length;
+    const drop = Math.max(0, total - result.size);
+    const series = {};
+    for (const field of Object.keys(fresh)) {
+      const merged = new Int16Array(total - drop).fill(result.missing);
+      merged.set(old.series[field].subarray(drop, Math.min(offset, old.length)));
+      merged.set(fresh[field], offset - drop);
+      series[field] = merged;
+    }
+    this._trends = Object.assign({}, result, {
+      start: old.start + drop * old.step, length: total - drop, series,
     });
   }
 
-  _render() {
-    const p = this._prefix;
-    const dev = this._dev;
+  _drawTrends() {
+    const trends = this._trends;
+    if (!trends) return;
+    for (const [field, , unit, decimals] of TRENDS) {
+      const values = trends.series[field];
+      const path = this._sparks[field];
+      if (!values || !path) continue;
+      let min = Infinity;
+      let max = -Infinity;
+      for (const v of values) {
+        if (v === trends.missing) continue;
+        min = Math.min(min, v);
+        max = Math.max(max, v);
+      }
+      if (min > max) {
+        path.setAttribute('d', '');
+        this._setText(`trend-${field}`, '--');
+        continue;
+      }
+      // Right-aligned on a fixed day-wide axis; gaps break the line
+      const span = max - min || 1;
+      const first = trends.size - trends.length;
+      let d = '';
+      let pen = 'M';
+      values.forEach((v, i) => {
+        if (v === trends.missing) {
+          pen = 'M';
+          return;
+        }
+        const x = ((first + i) / (trends.size - 1)) * 200;
+        const y = 22 - ((v - min) / span) * 20;
+        d += `${pen}${x.toFixed(1)} ${y.toFixed(1)}`;
+        pen = 'L';
+      });
+      path.setAttribute('d', d);
+      this._setText(
+        `trend-${field}`,
+        `${this._fmt(min / trends.scale, decimals)}\u2013${this._fmt(max / trends.scale, decimals, unit)}`,
+      );
+    }
+  }
 
-    // Sensor data
-    const outdoor = this._getNumState(`${p}_utetemperatur`, 1, ' \u00b0C');
-    const supply = this._getNumState(`${p}_tillufttemperatur`, 1, ' \u00b0C');
-    const exhaust = this._getNumState(`${p}_avkasttemperatur`, 1, ' \u00b0C');
-    const extract = this._getNumState(`${p}_avtrekkstemperatur`, 1, ' \u00b0C');
-    const afterRecovery = this._getNumState(`${p}_temperatur_etter_veksler`, 1, ' \u00b0C');
-    const safFlow = this._getNumState(`${p}_tilluft_luftmengde`, 0, ' m\u00b3/h');
-    const eafFlow = this._getNumState(`${p}_avtrekk_luftmengde`, 0, ' m\u00b3/h');
-    const safPct = this._getNumState(`${p}_tilluftvifte_utgang`, 1, ' %');
-    const eafPct = this._getNumState(`${p}_avtrekksvifte_utgang`, 1, ' %');
-    const recovery = this._getNumState(`${p}_gjenvinningsgrad`, 0, ' % \u03b7');
-    const frost = this._getNumState(`${p}_frostsikring`, 0, ' %');
-    const bypass = this._getNumState(`${p}_bypass`, 0, ' %');
-    const exchPressure = this._getNumState(`${p}_vekslertrykk`, 0, ' Pa');
-    const unitMode = this._getState(`${p}_driftsmodus`, '--');
+  _fmt(value, decimals, unit) {
+    if (value === null || value === undefined) return '--';
+    return value.toFixed(decimals) + (unit || '');
+  }
 
-    // Control states
-    const ahuMode = this._getState(`select.${dev}_ahu_modus`, '--');
-    const supplySetpoint = this._getNum(`number.${dev}_tilluft_settpunkt`);
-    const safFlowLow = this._getNum(`number.${dev}_saf_flow_lav`);
-    const safFlowNormal = this._getNum(`number.${dev}_saf_flow_normal`);
-    const safFlowHigh = this._getNum(`number.${dev}_saf_flow_hoy`);
-    const eafFlowLow = this._getNum(`number.${dev}_eaf_flow_lav`);
-    const eafFlowNormal = this._getNum(`number.${dev}_eaf_flow_normal`);
-    const eafFlowHigh = this._getNum(`number.${dev}_eaf_flow_hoy`);
-
-    const boostRemaining = this._getNum(`${p}_komfyravtrekk_gjenstaaende`) || 0;
-    const spDisplay = supplySetpoint !== null ? supplySetpoint.toFixed(1) : '--';
+  _callService(domain, service, data) {
+    this._hass.callService(domain, service, data);
+  }
+
+  // Writes go through the set_setpoints service, which verifies them
+  _setSetpoints(values) {
+    const data = Object.assign({}, values);
+    if (this.config.entry_id) data.entry_id = this.config.entry_id;
+    this._callService('systemair_topvex', 'set_setpoints', data);
+  }
 
+  _build() {
     const modes = ['Av', 'Auto', 'Lav', 'Normal', 'H\u00f8y'];
 
     this.shadowRoot.innerHTML = `
       <style>
         :host { display: block; }
+        [hidden] { display: none !important; }
         .card { background: #0d2137; border-radius: 12px; padding: 16px; }
         .title { color: #7ec8e3; font-size: 14px; font-weight: 600; margin-bottom: 8px; font-family: sans-serif; }
         .mode { color: #5a9ab5; font-size: 12px; font-family: sans-serif; }
@@ -159,11 +293,17 @@ class SystemairTopvexCard extends HTMLElement {
         .boost-btn.cancel { border-color: rgba(255,100,100,0.3); background: rgba(255,100,100,0.08); color: rgba(255,100,100,0.8); }
         .boost-btn.cancel:hover { background: rgba(255,100,100,0.2); }
         .boost-active { color: #ffb432; font-size: 12px; font-family: sans-serif; padding: 6px 0; }
+
+        .trend-row { display: flex; align-items: center; gap: 8px; height: 24px; }
+        .trend-lbl { color: rgba(255,255,255,0.6); font-size: 12px; font-family: sans-serif; min-width: 90px; }
+        .trend-svg { flex: 1; height: 24px; }
+        .trend-svg path { fill: none; stroke: #7ec8e3; stroke-width: 1.2; vector-effect: non-scaling-stroke; }
+        .trend-range { color: rgba(255,255,255,0.5); font-size: 11px; font-family: sans-serif; min-width: 110px; text-align: right; }
       </style>
       <ha-card>
         <div class="card">
           <div class="title">Topvex TC/C03 EL CAV</div>
-          <div class="mode">Driftsmodus: ${unitMode}</div>
+          <div class="mode">Driftsmodus: <span data-k="unitMode"></span></div>
           <svg viewBox="0 0 1000 420" xmlns="http://www.w3.org/2000/svg">
             <rect width="1000" height="420" fill="#0d2137" rx="8"/>
             <rect x="20" y="300" width="280" height="24" rx="2" class="duct-outdoor" opacity="0.8"/>
@@ -196,28 +336,28 @@ class SystemairTopvexCard extends HTMLElement {
             <polygon points="250,96 250,120 225,108" style="fill:none;stroke:rgba(255,255,255,0.7);stroke-width:1.5"/>
             <rect x="650" y="290" width="45" height="44" rx="4" class="heater-box"/>
             <text x="50" y="280" style="fill:#5abf5f;font-size:12px;font-weight:600;font-family:sans-serif">Friskulft inn</text>
-            <text x="50" y="295" class="label-temp">${outdoor}</text>
+            <text x="50" y="295" class="label-temp" data-k="outdoor"></text>
             <text x="950" y="280" style="fill:#3ac4e8;font-size:12px;font-weight:600;font-family:sans-serif" text-anchor="end">Tilluft til hus</text>
-            <text x="950" y="295" class="label-temp" text-anchor="end">${supply}</text>
+            <text x="950" y="295" class="label-temp" text-anchor="end" data-k="supply"></text>
             <text x="50" y="75" style="fill:#c49a2a;font-size:12px;font-weight:600;font-family:sans-serif">Avkast ut</text>
-            <text x="50" y="88" class="label-temp">${exhaust}</text>
+            <text x="50" y="88" class="label-temp" data-k="exhaust"></text>
             <text x="950" y="75" style="fill:#e8c830;font-size:12px;font-weight:600;font-family:sans-serif" text-anchor="end">Avtrekk fra hus</text>
-            <text x="950" y="88" class="label-temp" text-anchor="end">${extract}</text>
+            <text x="950" y="88" class="label-temp" text-anchor="end" data-k="extract"></text>
             <text x="480" y="280" class="label-dim" text-anchor="middle">Etter veksler</text>
-            <text x="480" y="295" class="label-temp" text-anchor="middle">${afterRecovery}</text>
-            <text x="385" y="172" style="fill:#ffffff;font-size:22px;font-weight:700;font-family:sans-serif" text-anchor="middle">${recovery}</text>
+            <text x="480" y="295" class="label-temp" text-anchor="middle" data-k="afterRecovery"></text>
+            <text x="385" y="172" style="fill:#ffffff;font-size:22px;font-weight:700;font-family:sans-serif" text-anchor="middle" data-k="recovery"></text>
             <text x="385" y="190" style="fill:rgba(255,255,255,0.7);font-size:12px;font-family:sans-serif" text-anchor="middle">Gjenvinning</text>
-            <text x="385" y="218" style="fill:#7ec8e3;font-size:16px;font-weight:600;font-family:sans-serif" text-anchor="middle">${frost}</text>
+            <text x="385" y="218" style="fill:#7ec8e3;font-size:16px;font-weight:600;font-family:sans-serif" text-anchor="middle" data-k="frost"></text>
             <text x="385" y="234" style="fill:rgba(255,255,255,0.7);font-size:11px;font-family:sans-serif" text-anchor="middle">Frostsikring</text>
-            <text x="385" y="252" style="fill:rgba(255,255,255,0.5);font-size:11px;font-family:sans-serif" text-anchor="middle">${exchPressure}</text>
+            <text x="385" y="252" style="fill:rgba(255,255,255,0.5);font-size:11px;font-family:sans-serif" text-anchor="middle" data-k="exchPressure"></text>
             <rect x="330" y="268" width="110" height="28" rx="4" fill="rgba(0,0,0,0.4)"/>
             <text x="385" y="265" style="fill:rgba(255,255,255,0.5);font-size:10px;font-family:sans-serif" text-anchor="middle">Bypass</text>
-            <text x="385" y="287" style="fill:#fde68a;font-size:13px;font-weight:600;font-family:sans-serif" text-anchor="middle">${bypass}</text>
-            <text x="540" y="290" class="label-value" text-anchor="middle">${safFlow}</text>
-            <text x="540" y="360" class="label-pct" text-anchor="middle">${safPct}</text>
-            <text x="240" y="155" class="label-pct" text-anchor="middle">${eafPct}</text>
-            <text x="160" y="88" class="label-value">${eafFlow}</text>
-            <text x="790" y="327" class="label-value" text-anchor="middle">${spDisplay}\u00b0C</text>
+            <text x="385" y="287" style="fill:#fde68a;font-size:13px;font-weight:600;font-family:sans-serif" text-anchor="middle" data-k="bypass"></text>
+            <text x="540" y="290" class="label-value" text-anchor="middle" data-k="safFlow"></text>
+            <text x="540" y="360" class="label-pct" text-anchor="middle" data-k="safPct"></text>
+            <text x="240" y="155" class="label-pct" text-anchor="middle" data-k="eafPct"></text>
+            <text x="160" y="88" class="label-value" data-k="eafFlow"></text>
+            <text x="790" y="327" class="label-value" text-anchor="middle" data-k="spDisplay" data-suffix="\u00b0C"></text>
             <text x="790" y="340" class="label-dim" text-anchor="middle">Settpunkt</text>
             <text x="180" y="350" class="label-dim" text-anchor="middle">Filter</text>
             <text x="705" y="145" class="label-dim" text-anchor="middle">Filter</text>
@@ -233,7 +373,7 @@ class SystemairTopvexCard extends HTMLElement {
             <div class="ctrl-section">
               <div class="ctrl-label">Modus</div>
               <div class="mode-btns">
-                ${modes.map(m => `<button class="mode-btn${m === 'Av' ? ' off' : ''}${ahuMode === m ? ' active' : ''}" data-mode="${m}">${m}</button>`).join('')}
+                ${modes.map(m => `<button class="mode-btn${m === 'Av' ? ' off' : ''}" data-mode="${m}">${m}</button>`).join('')}
               </div>
             </div>
 
@@ -241,7 +381,7 @@ class SystemairTopvexCard extends HTMLElement {
               <div class="ctrl-label">Tilluft settpunkt</div>
               <div class="temp-row">
                 <button class="temp-btn" data-delta="-0.5">\u2212</button>
-                <div class="temp-val">${spDisplay}\u00b0C</div>
+                <div class="temp-val" data-k="spDisplay" data-suffix="\u00b0C"></div>
                 <button class="temp-btn" data-delta="0.5">+</button>
               </div>
             </div>
@@ -250,51 +390,126 @@ class SystemairTopvexCard extends HTMLElement {
               <div class="ctrl-label">Normal luftmengder (m\u00b3/h)</div>
               <div class="flow-row">
                 <span class="flow-lbl">Tilluft</span>
-                <input type="number" class="flow-input" data-entity="number.${dev}_saf_flow_normal" value="${safFlowNormal ?? ''}" step="10">
+                <input type="number" class="flow-input" data-field="saf_flow_normal" step="10">
                 <span class="flow-lbl">Avtrekk</span>
-                <input type="number" class="flow-input" data-entity="number.${dev}_eaf_flow_normal" value="${eafFlowNormal ?? ''}" step="10">
+                <input type="number" class="flow-input" data-field="eaf_flow_normal" step="10">
               </div>
             </div>
 
             <div class="ctrl-section">
               <div class="ctrl-label">Komfyravtrekk</div>
-              ${boostRemaining > 0
-                ? `<div class="boost-active">Aktiv \u2014 ${Math.ceil(boostRemaining / 60)} min igjen</div>`
-                : ''}
+              <div class="boost-active" data-k="boost" hidden></div>
               <div class="boost-row">
                 <button class="boost-btn" data-minutes="10">10 min</button>
                 <button class="boost-btn" data-minutes="20">20 min</button>
                 <button class="boost-btn" data-minutes="30">30 min</button>
-                ${boostRemaining > 0
-                  ? `<button class="boost-btn cancel" data-action="cancel">Avbryt</button>`
-                  : ''}
+                <button class="boost-btn cancel" data-action="cancel" hidden>Avbryt</button>
               </div>
             </div>
+
+            <div class="ctrl-section" ${this.config.trends === false ? 'hidden' : ''}>
+              <div class="ctrl-label">Siste 24 timer</div>
+              ${TRENDS.map(([field, label]) => `
+                <div class="trend-row">
+                  <span class="trend-lbl">${label}</span>
+                  <svg class="trend-svg" viewBox="0 0 200 24" preserveAspectRatio="none">
+                    <path data-trend="${field}"/>
+                  </svg>
+                  <span class="trend-range" data-k="trend-${field}">--</span>
+                </div>`).join('')}
+            </div>
           </div>
         </div>
       </ha-card>
     `;
 
+    // Cache the nodes patched on updates
+    const root = this.shadowRoot;
+    this._nodes = {};
+    root.querySelectorAll('[data-k]').forEach(node => {
+      (this._nodes[node.dataset.k] = this._nodes[node.dataset.k] || []).push(node);
+    });
+    this._modeBtns = root.querySelectorAll('.mode-btn');
+    this._flowInputs = root.querySelectorAll('.flow-input');
+    this._cancelBtn = root.querySelector('.boost-btn.cancel');
+    this._sparks = {};
+    root.querySelectorAll('[data-trend]').forEach(path => {
+      this._sparks[path.dataset.trend] = path;
+    });
+    this._built = true;
+
     this._attachListeners();
+    this._update();
+    this._drawTrends();
+  }
+
+  _setText(key, text) {
+    for (const node of this._nodes[key] || []) {
+      const value = text + (node.dataset.suffix || '');
+      if (node.textContent !== value) node.textContent = value;
+    }
+  }
+
+  _update() {
+    const d = this._data || {};
+
+    // Sensor data
+    this._setText('outdoor', this._fmt(d.outdoor_temp, 1, ' \u00b0C'));
+    this._setText('supply', this._fmt(d.supply_temp, 1, ' \u00b0C'));
+    this._setText('exhaust', this._fmt(d.exhaust_temp, 1, ' \u00b0C'));
+    this._setText('extract', this._fmt(d.extract_temp, 1, ' \u00b0C'));
+    this._setText('afterRecovery', this._fmt(d.after_recovery_temp, 1, ' \u00b0C'));
+    this._setText('safFlow', this._fmt(d.saf_flow, 0, ' m\u00b3/h'));
+    this._setText('eafFlow', this._fmt(d.eaf_flow, 0, ' m\u00b3/h'));
+    this._setText('safPct', this._fmt(d.saf_output, 1, ' %'));
+    this._setText('eafPct', this._fmt(d.eaf_output, 1, ' %'));
+    this._setText('recovery', this._fmt(d.recovery_efficiency, 0, ' % \u03b7'));
+    this._setText('frost', this._fmt(d.frost_protection, 0, ' %'));
+    this._setText('bypass', this._fmt(d.seq_b, 0, ' %'));
+    this._setText('exchPressure', this._fmt(d.exch_pressure, 0, ' Pa'));
+    this._setText('unitMode', d.unit_mode_name ?? '--');
+
+    // Control states
+    const ahuMode = d.ahu_mode_name ?? '--';
+    this._modeBtns.forEach(btn => {
+      btn.classList.toggle('active', btn.dataset.mode === ahuMode);
+    });
+
+    this._setText('spDisplay', this._fmt(d.supply_setpoint, 1));
+
+    // Leave a flow field alone while the user is typing in it
+    this._flowInputs.forEach(input => {
+      if (this.shadowRoot.activeElement === input) return;
+      const value = d[input.dataset.field];
+      const text = value === null || value === undefined ? '' : String(value);
+      if (input.value !== text) input.value = text;
+    });
+
+    const boostRemaining = d.boost_active ? d.boost_remaining : 0;
+    const boostNode = this._nodes.boost[0];
+    boostNode.hidden = boostRemaining <= 0;
+    this._cancelBtn.hidden = boostRemaining <= 0;
+    if (boostRemaining > 0) {
+      this._setText('boost', `Aktiv \u2014 ${Math.ceil(boostRemaining / 60)} min igjen`);
+    }
   }
 
   _attachListeners() {
     const root = this.shadowRoot;
-    const dev = this._dev;
 
     // AHU mode buttons
     root.querySelectorAll('.mode-btn').forEach(btn => {
-      btn.addEventListener('click', () => this._setAhuMode(btn.dataset.mode));
+      btn.addEventListener('click', () => this._setSetpoints({ ahu_mode: btn.dataset.mode }));
     });
 
     // Temperature +/- buttons
     root.querySelectorAll('.temp-btn').forEach(btn => {
       btn.addEventListener('click', () => {
-        const current = this._getNum(`number.${dev}_tilluft_settpunkt`);
-        if (current === null) return;
+        const current = this._data && this._data.supply_setpoint;
+        if (current === null || current === undefined) return;
         const delta = parseFloat(btn.dataset.delta);
         const next = Math.max(10, Math.min(30, current + delta));
-        this._setNumber(`number.${dev}_tilluft_settpunkt`, next);
+        this._setSetpoints({ supply_setpoint: next });
       });
     });
 
@@ -303,7 +518,7 @@ class SystemairTopvexCard extends HTMLElement {
       input.addEventListener('change', () => {
         const val = parseFloat(input.value);
         if (!isNaN(val) && val >= 50 && val <= 2000) {
-          this._setNumber(input.dataset.entity, val);
+          this._setSetpoints({ [input.dataset.field]: val });
         }
       });
     });
@@ -323,11 +538,11 @@ class SystemairTopvexCard extends HTMLElement {
   }
 
   getCardSize() {
-    return 8;
+    return this.config && this.config.trends === false ? 8 : 11;
   }
 
   static getStubConfig() {
-    return { entity_prefix: 'sensor.topvex_tc_c03_el_cav' };
+    return {};
   }
 }
 